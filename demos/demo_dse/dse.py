@@ -1,12 +1,10 @@
 import argparse
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from string import Template
 from tempfile import TemporaryDirectory
 from textwrap import dedent
 
 import matplotlib.pyplot as plt
-from joblib import Parallel, delayed
 
 from libvhls.commands import (
     AddFiles,
@@ -14,11 +12,11 @@ from libvhls.commands import (
     CsynthDesign,
     OpenProject,
     OpenSolution,
-    RunnerStatus,
     SetPart,
     SetTop,
 )
-from libvhls.vitis_hls import VitisHLS
+from libvhls.executor import HLSExecutor, HLSJob
+from libvhls.report_analytics import load_reports, used_percent
 
 header_tempate = Template(
     dedent("""
@@ -90,95 +88,28 @@ def generate_paramaterized_design(dir: Path, block_size=8) -> list[Path]:
     return [header_file, source_file]
 
 
-def parse_report(xml_str):
-    root = ET.fromstring(xml_str)
-
-    # Gather latency data
-    performance_estimates = root.find("PerformanceEstimates")
-    summary_of_overall_latency = performance_estimates.find("SummaryOfOverallLatency")
-    latency_data = {}
-    # fmt: off
-    latency_data["best_case_latency"] = int(summary_of_overall_latency.find("Best-caseLatency").text)
-    latency_data["average_case_latency"] = int(summary_of_overall_latency.find("Average-caseLatency").text)
-    latency_data["worst_case_latency"] = int(summary_of_overall_latency.find("Worst-caseLatency").text)
-    latency_data["best_case_latency_t"] = float(summary_of_overall_latency.find("Best-caseRealTimeLatency").text.split()[0])
-    latency_data["average_case_latency_t"] = float(summary_of_overall_latency.find("Average-caseRealTimeLatency").text.split()[0])
-    latency_data["worst_case_latency_t"] = float(summary_of_overall_latency.find("Worst-caseRealTimeLatency").text.split()[0])
-    # fmt: on
-
-    # Gather resource data
-    area_estimates = root.find("AreaEstimates")
-    resource_data = {}
-    # fmt: off
-    resource_data["used_abs"] = {}
-    resource_data["used_abs"]["BRAM_18K"] = int( area_estimates.find("Resources").find("BRAM_18K").text )
-    resource_data["used_abs"]["DSP"] = int(area_estimates.find("Resources").find("DSP").text)
-    resource_data["used_abs"]["FF"] = int(area_estimates.find("Resources").find("FF").text)
-    resource_data["used_abs"]["LUT"] = int(area_estimates.find("Resources").find("LUT").text)
-    resource_data["used_abs"]["URAM"] = int( area_estimates.find("Resources").find("URAM").text )
-    resource_data["available_abs"] = {}
-    resource_data["available_abs"]["BRAM_18K"] = int( area_estimates.find("AvailableResources").find("BRAM_18K").text )
-    resource_data["available_abs"]["DSP"] = int( area_estimates.find("AvailableResources").find("DSP").text )
-    resource_data["available_abs"]["FF"] = int( area_estimates.find("AvailableResources").find("FF").text )
-    resource_data["available_abs"]["LUT"] = int( area_estimates.find("AvailableResources").find("LUT").text )
-    resource_data["available_abs"]["URAM"] = int( area_estimates.find("AvailableResources").find("URAM").text )
-    resource_data["used_percent"] = {}
-    resource_data["used_percent"]["BRAM_18K"] = float(resource_data["used_abs"]["BRAM_18K"] / resource_data["available_abs"]["BRAM_18K"])
-    resource_data["used_percent"]["DSP"] = float(resource_data["used_abs"]["DSP"] / resource_data["available_abs"]["DSP"])
-    resource_data["used_percent"]["FF"] = float(resource_data["used_abs"]["FF"] / resource_data["available_abs"]["FF"])
-    resource_data["used_percent"]["LUT"] = float(resource_data["used_abs"]["LUT"] / resource_data["available_abs"]["LUT"])
-    resource_data["used_percent"]["URAM"] = float(resource_data["used_abs"]["URAM"] / resource_data["available_abs"]["URAM"])
-    # fmt: on
-
-    data = {
-        "latency": latency_data,
-        "resources": resource_data,
-    }
-    return data
-
-
-# Run a single design run
-def single_design_run(block_size):
-    print(f"Running design run for block_size={block_size}")
-
+def design_job(staging_dir: Path, block_size: int) -> HLSJob:
     design_name = f"block_mm_{block_size}"
 
-    # Create design directory
-    design_dir = working_dir / design_name
-    design_dir.mkdir(parents=True, exist_ok=True)
-
     # Generate source files for parameterized design
+    design_dir = staging_dir / design_name
+    design_dir.mkdir(parents=True, exist_ok=True)
     design_files = generate_paramaterized_design(design_dir, block_size)
 
-    # Use libvhls to build commands and run them using Vitis HLS
-    vhls = VitisHLS(wd=design_dir)
+    # The executor copies the files into the job's own working directory,
+    # so the commands refer to them by name
     project_name = f"{design_name}_prj"
     solution_name = f"{design_name}_sol"
     commands = [
         OpenProject(project_name, reset=True),
-        AddFiles(design_files),
+        AddFiles([Path(f.name) for f in design_files]),
         OpenSolution(solution_name, reset=True),
         SetPart("xcu50-fsvh2104-2-e"),  # Alveo U50
         CreateClock("default", "3.33"),  # 3.33 ns = 300 MHz
         SetTop("blockmatmul"),
         CsynthDesign(),
     ]
-    r = vhls.run(commands)
-    if r.status == RunnerStatus.FAIL:
-        raise RuntimeError(f"Failed to run commands\n{r}")
-
-    # Find the synthesis report file
-    csynth_xml = Path(
-        list(design_dir.rglob(f"{project_name}/{solution_name}/**/csynth.xml"))[0]
-    )
-
-    # Extract data from synthesis report
-    synth_data = parse_report(csynth_xml.read_text())
-
-    return design_name, {
-        "block_size": block_size,
-        "synth_data": synth_data,
-    }
+    return HLSJob(design_name, commands, files=design_files)
 
 
 if __name__ == "__main__":
@@ -202,36 +133,36 @@ if __name__ == "__main__":
     # Define the design space
     BLOCK_SIZE_VALUES = [1, 2, 4, 8, 16, 32, 64, 128]
 
-    # Run design runs in parallel
+    # Run design runs in parallel, handling each one as soon as it finishes
     print("Running design runs...")
     N_JOBS = 8
-    run_data = Parallel(n_jobs=N_JOBS, backend="multiprocessing")(
-        delayed(single_design_run)(block_size) for block_size in BLOCK_SIZE_VALUES
-    )
-    dse_data = {design_name: design_data for design_name, design_data in run_data}
+    executor = HLSExecutor(working_dir / "runs", n_workers=N_JOBS)
+    jobs = [design_job(working_dir / "src", bs) for bs in BLOCK_SIZE_VALUES]
+    report_paths = {}
+    for job_result in executor.run(jobs):
+        if not job_result.ok or job_result.report is None:
+            raise RuntimeError(
+                f"Failed to run design {job_result.job.name}\n{job_result.error}"
+            )
+        print(f"Finished design run {job_result.job.name}")
+        report_paths[job_result.job.name] = sorted(
+            job_result.wd.glob(job_result.job.report_glob)
+        )[0]
+
+    # Gather data neeed for figures, one row per design in design space order
+    print("Gathering data...")
+    reports = load_reports([report_paths[job.name] for job in jobs])
 
     # Cleanup working directory since we are done with it
     working_dir_obj.cleanup()
 
-    # Gather data neeed for figures
-    print("Gathering data...")
-    index = []
-    block_sizes = []
-    avg_latency_ts = []
-    percent_used_bram = []
-    percent_used_dsp = []
-    percent_used_ff = []
-    percent_used_lut = []
-    for i, design in enumerate(dse_data.values()):
-        index.append(i)
-        block_sizes.append(design["block_size"])
-        # fmt: off
-        avg_latency_ts.append(design["synth_data"]["latency"]["average_case_latency_t"])
-        percent_used_bram.append(design["synth_data"]["resources"]["used_percent"]["BRAM_18K"])
-        percent_used_dsp.append(design["synth_data"]["resources"]["used_percent"]["DSP"])
-        percent_used_ff.append(design["synth_data"]["resources"]["used_percent"]["FF"])
-        percent_used_lut.append(design["synth_data"]["resources"]["used_percent"]["LUT"])
-        # fmt: on
+    index = list(range(len(BLOCK_SIZE_VALUES)))
+    block_sizes = BLOCK_SIZE_VALUES
+    avg_latency_ts = reports["average_case_latency_t"]
+    percent_used_bram = used_percent(reports, "BRAM_18K")
+    percent_used_dsp = used_percent(reports, "DSP")
+    percent_used_ff = used_percent(reports, "FF")
+    percent_used_lut = used_percent(reports, "LUT")
 
     # Create figures
     print("Creating figures...")
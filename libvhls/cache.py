@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from libvhls.commands.commands import Command, Runner, RunnerResult
+from libvhls.utils import CacheUsage, atomic_write_bytes, default_cache_dir
+
+log = logging.getLogger(__name__)
+
+
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ResultCache:
+    """Content-addressed cache of ``RunnerResult``s and their key artifacts.
+
+    Entries are keyed on the dist fingerprint, the composed Tcl script and the
+    contents of every file passed to ``add_files``. Entries are published by
+    renaming a fully written directory into place, so several workers can
+    share one cache directory. The least recently used entries are evicted
+    once the cache grows beyond ``max_bytes``, down to 90% of it. The cache
+    size is tracked in a ``CacheUsage`` file, so only inserts that go over the
+    budget scan the cache.
+    """
+
+    VERSION = 1
+    DEFAULT_ARTIFACTS = ("**/syn/report/*.xml", "**/syn/report/*.rpt")
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_bytes: int = 10 * 1024**3,
+        artifacts: Sequence[str] = DEFAULT_ARTIFACTS,
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = default_cache_dir() / "results"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.artifacts = artifacts
+
+        self.entries_dir = self.cache_dir / "entries"
+        self.tmp_dir = self.cache_dir / "tmp"
+        self.usage = CacheUsage(self.cache_dir / "usage")
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def input_files(runner: Runner, commands: Sequence[Command]) -> list[Path]:
+        files: list[Path] = []
+        for cmd in commands:
+            if cmd.command_str != "add_files":
+                continue
+            src_files = getattr(cmd, "src_files")
+            if isinstance(src_files, Path):
+                src_files = [src_files]
+            files += [runner.wd / f for f in src_files]
+        return files
+
+    def key(self, runner: Runner, commands: Sequence[Command]) -> str:
+        wd = str(runner.wd)
+        wd_resolved = str(runner.wd.resolve())
+
+        def normalize(s: str) -> str:
+            # jobs in different working dirs should still share entries
+            return s.replace(wd_resolved, "<wd>").replace(wd, "<wd>")
+
+        h = hashlib.sha256()
+        h.update(f"libvhls-result-cache-v{self.VERSION}\n".encode())
+        h.update(f"dist {runner.dist.fingerprint}\n".encode())
+        h.update(normalize(runner.build_script(commands)).encode())
+        for fp in self.input_files(runner, commands):
+            digest = hash_file(fp) if fp.is_file() else "missing"
+            h.update(f"\nfile {normalize(str(fp))} {digest}".encode())
+        return h.hexdigest()
+
+    def entry_dir(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / key
+
+    def get(
+        self, runner: Runner, commands: Sequence[Command], key: str | None = None
+    ) -> RunnerResult | None:
+        if key is None:
+            key = self.key(runner, commands)
+        entry = self.entry_dir(key)
+        result_fp = entry / "result.json"
+        try:
+            data = json.loads(result_fp.read_text())
+            artifacts_dir = entry / "artifacts"
+            for rel_path in data["artifacts"]:
+                dst = runner.wd / rel_path
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(artifacts_dir / rel_path, dst)
+            os.utime(result_fp)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+        log.info(f"Result cache hit for {key[:16]}")
+        return RunnerResult(
+            commands=commands,
+            script=runner.build_script(commands),
+            returncode=data["returncode"],
+            stdout=data["stdout"],
+            stderr=data["stderr"],
+            log=data["log"],
+            run_id=data["run_id"],
+        )
+
+    def put(
+        self,
+        runner: Runner,
+        commands: Sequence[Command],
+        result: RunnerResult,
+        since: float = 0.0,
+        key: str | None = None,
+    ) -> None:
+        if key is None:
+            key = self.key(runner, commands)
+        entry = self.entry_dir(key)
+        if entry.exists():
+            return
+
+        tmp_entry = self.tmp_dir / f"{key}.{uuid.uuid4().hex}"
+        artifacts_dir = tmp_entry / "artifacts"
+        artifacts: list[str] = []
+        for pattern in self.artifacts:
+            for fp in runner.wd.glob(pattern):
+                if not fp.is_file() or fp.stat().st_mtime < since:
+                    continue
+                rel_path = fp.relative_to(runner.wd)
+                (artifacts_dir / rel_path).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(fp, artifacts_dir / rel_path)
+                artifacts.append(str(rel_path))
+
+        data = {
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "log": result.log,
+            "run_id": result.run_id,
+            "artifacts": artifacts,
+        }
+        atomic_write_bytes(tmp_entry / "result.json", json.dumps(data).encode())
+
+        size = dir_size(tmp_entry)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # another worker published the same entry first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        total = self.usage.add(size)
+        if total is None or total > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Scan the cache and drop the least recently used entries over budget."""
+        with self.usage.locked():
+            entries = []
+            total = 0
+            for entry in self.entries_dir.glob("*/*"):
+                try:
+                    last_used = (entry / "result.json").stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                size = dir_size(entry)
+                total += size
+                entries.append((last_used, size, entry))
+
+            # make some room below the budget, a full cache would otherwise
+            # scan again on the next insert
+            target = self.max_bytes * 0.9 if total > self.max_bytes else total
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= target:
+                    break
+                # move out of the way first so readers never see a partial entry
+                doomed = self.tmp_dir / f"evict.{entry.name}.{uuid.uuid4().hex}"
+                try:
+                    os.rename(entry, doomed)
+                except OSError:
+                    continue
+                shutil.rmtree(doomed, ignore_errors=True)
+                total -= size
+            self.usage.write(total)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(
+        self,
+        runner: Runner,
+        commands: Sequence[Command],
+        run_fn: Callable[[Sequence[Command]], RunnerResult] | None = None,
+    ) -> RunnerResult:
+        key = self.key(runner, commands)
+        cached = self.get(runner, commands, key=key)
+        if cached is not None:
+            return cached
+
+        if run_fn is None:
+            run_fn = runner.run
+        # file systems with coarse timestamps can round mtimes down
+        start = math.floor(time.time())
+        result = run_fn(commands)
+        if result.returncode == 0:
+            self.put(runner, commands, result, since=start, key=key)
+        return result
+
+    async def run_async(
+        self, runner: Runner, commands: Sequence[Command]
+    ) -> RunnerResult:
+        key = self.key(runner, commands)
+        cached = self.get(runner, commands, key=key)
+        if cached is not None:
+            return cached
+
+        start = math.floor(time.time())
+        result = await runner.run_async(commands)
+        if result.returncode == 0:
+            self.put(runner, commands, result, since=start, key=key)
+        return result
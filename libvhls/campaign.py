@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import math
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.cache import hash_file
+from libvhls.commands.commands import Runner
+from libvhls.dist import VitisHLSDist
+from libvhls.executor import HLSExecutor, HLSJob, HLSJobResult
+from libvhls.report_analytics import INVALID_ROW, REPORT_DTYPE, report_row
+from libvhls.utils import atomic_write_bytes, unwrap
+
+log = logging.getLogger(__name__)
+
+REPORT_FIELDS = unwrap(REPORT_DTYPE.names)
+
+
+class JobState(Enum):
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class JobRecord:
+    """The journaled state of one campaign job.
+
+    ``result`` summarizes the ``RunnerResult`` and ``report`` holds the
+    ``REPORT_DTYPE`` fields of the ``SynthesisReport``, both as plain dicts.
+    """
+
+    name: str
+    fingerprint: str
+    state: JobState
+    wd: str | None = None
+    result: dict | None = None
+    report: dict | None = None
+    error: str | None = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["state"] = self.state.value
+        return json.dumps(data, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, line: str) -> "JobRecord":
+        data = json.loads(line)
+        data["state"] = JobState(data["state"])
+        return cls(**data)
+
+
+def job_fingerprint(job: HLSJob) -> str:
+    """Digest of everything that determines the outcome of a job.
+
+    Covers the Tcl composed from the commands, the contents of the job's files
+    and the report pattern, so changed sources invalidate completed records.
+    The commands are composed against a placeholder dist and job dir, which
+    keeps the digest stable across processes and campaign locations.
+    """
+    runner = Runner(VitisHLSDist(Path("<dist>")), Path("<job_dir>"))
+    h = hashlib.sha256()
+    h.update(f"commands {runner.build_script(job.commands)}\n".encode())
+    for fp in job.files:
+        digest = hash_file(fp) if fp.is_file() else "missing"
+        h.update(f"file {fp.name} {digest}\n".encode())
+    h.update(f"report {job.report_glob}\n".encode())
+    return h.hexdigest()
+
+
+def summarize_result(job_result: HLSJobResult) -> dict | None:
+    result = job_result.result
+    if result is None:
+        return None
+    return {
+        "status": result.status.name,
+        "returncode": result.returncode,
+        "reason": result.reason,
+        "run_id": result.run_id,
+        "log_path": str(result.log_path) if result.log_path is not None else None,
+    }
+
+
+def summarize_report(job_result: HLSJobResult) -> dict | None:
+    if job_result.report is None:
+        return None
+    fields = dict(zip(REPORT_FIELDS, report_row(job_result.report)))
+    del fields["valid"]
+    # unknown latencies are NaN, which is not valid JSON
+    return {
+        k: None if isinstance(v, float) and math.isnan(v) else v
+        for k, v in fields.items()
+    }
+
+
+class Campaign:
+    """Runs jobs on an ``HLSExecutor`` and journals them so a campaign can resume.
+
+    Every job is recorded in an append-only JSON lines file when it is handed
+    to the executor and again when it finishes, with summaries of its result
+    and synthesis report. The last record of a job wins. Restarting a
+    campaign with the same journal skips jobs that finished with the same
+    fingerprint and reruns jobs that were in flight, and failed ones if
+    ``retry_failed`` is set. Records are flushed and fsynced one by one; a
+    record torn by a crash is dropped when the journal is opened.
+    """
+
+    def __init__(
+        self,
+        journal_path: Path,
+        executor: HLSExecutor,
+        retry_failed: bool = False,
+    ) -> None:
+        self.journal_path = journal_path
+        self.executor = executor
+        self.retry_failed = retry_failed
+        self.records: dict[str, JobRecord] = {}
+        self.n_journal_lines = 0
+        self.load()
+
+    def load(self) -> None:
+        self.records = {}
+        self.n_journal_lines = 0
+        try:
+            data = self.journal_path.read_bytes()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            log.warning(f"Dropping a torn record at the end of {self.journal_path}")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(end)
+        for line in data[:end].decode().splitlines():
+            if line.strip() == "":
+                continue
+            try:
+                record = JobRecord.from_json(line)
+            except (ValueError, TypeError, KeyError) as e:
+                log.warning(f"Skipping a bad record in {self.journal_path}: {e}")
+                continue
+            self.records[record.name] = record
+            self.n_journal_lines += 1
+        log.info(f"Loaded {len(self.records)} jobs from {self.journal_path}")
+
+    def append(self, record: JobRecord) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        line = (record.to_json() + "\n").encode()
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.records[record.name] = record
+        self.n_journal_lines += 1
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the latest record of each job."""
+        lines = "".join(r.to_json() + "\n" for r in self.records.values())
+        atomic_write_bytes(self.journal_path, lines.encode())
+        self.n_journal_lines = len(self.records)
+
+    def is_complete(self, job: HLSJob, fingerprint: str) -> bool:
+        record = self.records.get(job.name)
+        if record is None or record.fingerprint != fingerprint:
+            return False
+        if record.state == JobState.DONE:
+            return True
+        return record.state == JobState.FAILED and not self.retry_failed
+
+    def record_result(self, fingerprint: str, job_result: HLSJobResult) -> JobRecord:
+        record = JobRecord(
+            name=job_result.job.name,
+            fingerprint=fingerprint,
+            state=JobState.DONE if job_result.ok else JobState.FAILED,
+            wd=str(job_result.wd),
+            result=summarize_result(job_result),
+            report=summarize_report(job_result),
+            error=job_result.error,
+        )
+        self.append(record)
+        return record
+
+    def run(self, jobs: Iterable[HLSJob]) -> Iterator[JobRecord]:
+        """Yield the final record of every job, running only incomplete ones.
+
+        Records of jobs skipped because they are complete are yielded too, in
+        between the results of the jobs that run.
+        """
+        fingerprints: dict[str, str] = {}
+        skipped: list[JobRecord] = []
+
+        def incomplete() -> Iterator[HLSJob]:
+            for job in jobs:
+                if job.name in fingerprints:
+                    raise ValueError(f"Duplicate campaign job name {job.name}")
+                fingerprint = job_fingerprint(job)
+                fingerprints[job.name] = fingerprint
+                if self.is_complete(job, fingerprint):
+                    skipped.append(self.records[job.name])
+                    continue
+                self.append(JobRecord(job.name, fingerprint, JobState.RUNNING))
+                yield job
+
+        for job_result in self.executor.run(incomplete()):
+            yield from skipped
+            skipped.clear()
+            yield self.record_result(fingerprints[job_result.job.name], job_result)
+        yield from skipped
+
+    def run_all(self, jobs: Iterable[HLSJob]) -> list[JobRecord]:
+        return list(self.run(jobs))
+
+    def report_table(self, names: Iterable[str]) -> np.ndarray:
+        """The journaled reports of ``names`` as a ``REPORT_DTYPE`` array.
+
+        Jobs without a report get a row with ``valid`` set to ``False``.
+        """
+        rows = []
+        for name in names:
+            record = self.records.get(name)
+            if record is None or record.report is None:
+                rows.append(INVALID_ROW)
+                continue
+            report = record.report
+            values = (
+                np.nan if report[k] is None else report[k] for k in REPORT_FIELDS[1:]
+            )
+            rows.append((True, *values))
+        return np.array(rows, dtype=REPORT_DTYPE)
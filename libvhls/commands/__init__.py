@@ -1,3 +1,77 @@
-from .commands import *
-from .commands_libvhls import *
-from .commands_vitis_hls_project import *
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .commands import *
+    from .commands_libvhls import *
+    from .commands_vitis_hls_project import *
+
+# Command modules are only imported when one of their names is first used,
+# which keeps `import libvhls.commands` cheap for short-lived worker processes.
+_LAZY_MODULES = {
+    ".commands": [
+        "AsyncRun",
+        "Command",
+        "Runner",
+        "RunnerEvent",
+        "RunnerResult",
+        "RunnerStatus",
+        "SlimRunnerResult",
+        "TextRef",
+    ],
+    ".commands_libvhls": [
+        "COMMANDS_LIBVHLS",
+        "ExexInTCL",
+        "Query",
+        "SolutionBlock",
+        "UserTCL",
+    ],
+    ".commands_vitis_hls_project": [
+        "AddFiles",
+        "COMMANDS_VITIS_HLS_PROJECT",
+        "CloseProject",
+        "CloseSolution",
+        "CosimDesign",
+        "CosimStall",
+        "CreateClock",
+        "CsimDesign",
+        "CsynthDesign",
+        "DeleteProject",
+        "DeleteSolution",
+        "EnableBetaDevice",
+        "ExportDesign",
+        "GetClockPeriod",
+        "GetClockUncertainty",
+        "GetFiles",
+        "GetPart",
+        "GetProject",
+        "GetSolution",
+        "GetTop",
+        "Help",
+        "ListPart",
+        "OpenProject",
+        "OpenSolution",
+        "OpenTCLProject",
+        "SetClockUncertainty",
+        "SetPart",
+        "SetTop",
+    ],
+}
+_LAZY_NAMES = {
+    name: module for module, names in _LAZY_MODULES.items() for name in names
+}
+
+__all__ = sorted(_LAZY_NAMES)
+
+
+def __getattr__(name: str):
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
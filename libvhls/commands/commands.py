@@ -1,13 +1,27 @@
 import logging
+import os
+import re
+import resource
+import signal
 import subprocess
-import tempfile
+import time
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, Sequence
 
 from libvhls.dist import VitisHLSDist
+from libvhls.hls_logs import HLSLog, LogMessage, RuntimeInfo
+from libvhls.project import Project
+from libvhls.utils import process_tree_rss
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from libvhls.monitor import QoRMonitor, QoRWatch
 
 log = logging.getLogger(__name__)
 
@@ -15,6 +29,9 @@ log = logging.getLogger(__name__)
 class RunnerStatus(Enum):
     SUCCESS = auto()
     FAIL = auto()
+    TIMEOUT = auto()
+    OOM = auto()
+    ABORTED = auto()
 
 
 @dataclass(frozen=True, slots=True)
@@ -25,13 +42,173 @@ class RunnerResult:
     stdout: str
     stderr: str
     log: str
+    run_id: str | None = None
+    log_path: Path | None = None
+    # set when the run was stopped or died for a reason other than its own
+    # exit code, e.g. a timeout
+    termination: RunnerStatus | None = None
+    reason: str | None = None
 
     @property
     def status(self) -> RunnerStatus:
-        if self.returncode == 0:
-            return RunnerStatus.SUCCESS
-        else:
-            return RunnerStatus.FAIL
+        return run_status(self.returncode, self.termination)
+
+    def slim(self, path: Path) -> "SlimRunnerResult":
+        """Write the texts of this result to ``path`` and return a slim copy."""
+        refs = {}
+        offset = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            for name in SlimRunnerResult.TEXT_FIELDS:
+                data = getattr(self, name).encode()
+                f.write(data)
+                refs[name] = TextRef(path, offset, len(data))
+                offset += len(data)
+        return SlimRunnerResult(
+            commands=self.commands,
+            returncode=self.returncode,
+            refs=refs,
+            run_id=self.run_id,
+            log_path=self.log_path,
+            termination=self.termination,
+            reason=self.reason,
+        )
+
+
+def run_status(returncode: int, termination: RunnerStatus | None) -> RunnerStatus:
+    if termination is not None:
+        return termination
+    if returncode == 0:
+        return RunnerStatus.SUCCESS
+    else:
+        return RunnerStatus.FAIL
+
+
+@dataclass(frozen=True, slots=True)
+class TextRef:
+    """A span of UTF-8 text in a file, read on demand."""
+
+    path: Path
+    offset: int
+    length: int
+
+    def read(self) -> str:
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.length)
+        if len(data) != self.length:
+            raise RuntimeError(f"Text of a run result was truncated in {self.path}")
+        return data.decode()
+
+
+class SlimRunnerResult:
+    """A ``RunnerResult`` whose script, stdout, stderr and log stay on disk.
+
+    The texts are read from their ``TextRef`` on first access and cached, but
+    never pickled, so sending a result to another process only costs its
+    status fields, commands and file references. Created by
+    ``RunnerResult.slim``; ``load`` turns it back into a full result.
+    """
+
+    TEXT_FIELDS = ("script", "stdout", "stderr", "log")
+
+    __slots__ = (
+        "commands",
+        "returncode",
+        "refs",
+        "run_id",
+        "log_path",
+        "termination",
+        "reason",
+        "_texts",
+    )
+
+    def __init__(
+        self,
+        commands: Sequence["Command"],
+        returncode: int,
+        refs: dict[str, TextRef],
+        run_id: str | None = None,
+        log_path: Path | None = None,
+        termination: RunnerStatus | None = None,
+        reason: str | None = None,
+    ) -> None:
+        self.commands = commands
+        self.returncode = returncode
+        self.refs = refs
+        self.run_id = run_id
+        self.log_path = log_path
+        self.termination = termination
+        self.reason = reason
+        self._texts: dict[str, str] = {}
+
+    def text(self, name: str) -> str:
+        if name not in self._texts:
+            self._texts[name] = self.refs[name].read()
+        return self._texts[name]
+
+    @property
+    def script(self) -> str:
+        return self.text("script")
+
+    @property
+    def stdout(self) -> str:
+        return self.text("stdout")
+
+    @property
+    def stderr(self) -> str:
+        return self.text("stderr")
+
+    @property
+    def log(self) -> str:
+        return self.text("log")
+
+    @property
+    def status(self) -> RunnerStatus:
+        return run_status(self.returncode, self.termination)
+
+    def load(self) -> RunnerResult:
+        return RunnerResult(
+            commands=self.commands,
+            script=self.script,
+            returncode=self.returncode,
+            stdout=self.stdout,
+            stderr=self.stderr,
+            log=self.log,
+            run_id=self.run_id,
+            log_path=self.log_path,
+            termination=self.termination,
+            reason=self.reason,
+        )
+
+    def __getstate__(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__ if k != "_texts"}
+
+    def __setstate__(self, state: dict) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+        self._texts = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(returncode={self.returncode}, "
+            f"status={self.status.name}, run_id={self.run_id!r})"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RunnerEvent:
+    line: str
+    message: LogMessage | None = None
+    runtime: RuntimeInfo | None = None
+
+    @classmethod
+    def from_line(cls, line: str) -> "RunnerEvent":
+        return cls(
+            line=line,
+            message=HLSLog.parse_message(line),
+            runtime=HLSLog.parse_runtime(line),
+        )
 
 
 class Command(ABC):
@@ -43,10 +220,86 @@ class Command(ABC):
         pass
 
 
+RE_OUT_OF_MEMORY = re.compile(
+    r"std::bad_alloc|[Oo]ut of memory|Cannot allocate memory|"
+    r"Couldn't allocate memory|MemoryError"
+)
+
+
+def signal_process_group(pid: int, sig: int) -> bool:
+    # the tool is started in its own session, so its group id is its pid
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def kill_process_group(proc: subprocess.Popen, grace: float = 5.0) -> None:
+    """Terminate a process started in its own session and all of its children.
+
+    The group gets ``SIGTERM`` first and ``SIGKILL`` after ``grace`` seconds.
+    """
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        if not signal_process_group(proc.pid, sig):
+            return
+        try:
+            proc.wait(timeout=grace)
+            break
+        except subprocess.TimeoutExpired:
+            continue
+    # children such as clang or csim can outlive the tool's main process
+    signal_process_group(proc.pid, signal.SIGKILL)
+
+
 class Runner:
-    def __init__(self, dist: VitisHLSDist, wd: Path) -> None:
+    RUNS_DIR_NAME = ".libvhls_runs"
+
+    def __init__(
+        self,
+        dist: VitisHLSDist,
+        wd: Path,
+        isolate: bool = False,
+        shared_project: bool = False,
+        timeout: float | None = None,
+        max_memory_mb: float | None = None,
+        max_rss_mb: float | None = None,
+        poll_interval: float = 1.0,
+        monitors: Sequence["QoRMonitor"] = (),
+    ) -> None:
         self.dist = dist
         self.wd = wd
+        # Run the tool from a private scratch directory with its own log so
+        # concurrent runs can share one working directory.
+        self.isolate = isolate
+        # Re-register solutions that concurrent runs dropped from hls.app.
+        self.shared_project = shared_project
+        # Wall-clock limit in seconds for one run.
+        self.timeout = timeout
+        # Address space limit applied to the tool and its children.
+        self.max_memory_mb = max_memory_mb
+        # Resident memory limit for the whole process tree, checked by polling.
+        self.max_rss_mb = max_rss_mb
+        self.poll_interval = poll_interval
+        # QoR constraints checked while the tool runs.
+        self.monitors = monitors
+
+    @staticmethod
+    def new_run_id() -> str:
+        return f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
+
+    def run_dir(self, run_id: str) -> Path:
+        return self.wd / self.RUNS_DIR_NAME / run_id
+
+    def log_path(self, run_id: str) -> Path:
+        if self.isolate:
+            return self.run_dir(run_id) / "vitis_hls.log"
+        return self.wd / "vitis_hls.log"
+
+    def tool_cwd(self, run_id: str) -> Path:
+        if self.isolate:
+            return self.run_dir(run_id)
+        return self.wd
 
     def build_script(self, commands: Sequence[Command]) -> str:
         script = ""
@@ -55,36 +308,336 @@ class Runner:
             script += "\n"
         return script
 
-    def run(self, commands: Sequence[Command], check: bool = False) -> RunnerResult:
+    def write_script(
+        self, commands: Sequence[Command], run_id: str
+    ) -> tuple[str, Path]:
         script = self.build_script(commands)
-        script_file = tempfile.NamedTemporaryFile(mode="w", suffix=".tcl", delete=False)
-        script_fp = Path(script_file.name)
-        script_fp.write_text(script)
-
-        s = subprocess.run(
-            [str(self.dist.vitis_hls_bin), str(script_fp)],
-            cwd=self.wd,
-            capture_output=True,
-            text=True,
-        )
+        run_dir = self.run_dir(run_id)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        script_fp = run_dir / "run.tcl"
+        if self.isolate:
+            # keep relative paths in the commands relative to the working dir
+            script_fp.write_text(f"cd {{{self.wd.resolve()}}}\n{script}")
+        else:
+            script_fp.write_text(script)
+        return script, script_fp
+
+    def tool_args(self, script_fp: Path, log_path: Path) -> list[str]:
+        return [str(self.dist.vitis_hls_bin), "-l", str(log_path), str(script_fp)]
+
+    def limit_resources(self) -> None:
+        # runs in the child between fork and exec
+        if self.max_memory_mb is not None:
+            limit = int(self.max_memory_mb * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
 
-        script_file.close()
+    def popen_kwargs(self) -> dict:
+        kwargs: dict = {"start_new_session": True}
+        if self.max_memory_mb is not None:
+            kwargs["preexec_fn"] = self.limit_resources
+        return kwargs
 
-        log_path: Path = self.wd / "vitis_hls.log"
+    def start_watches(self, run_id: str) -> list["QoRWatch"]:
+        # snapshot the working dir before the tool starts writing to it
+        return [m.watch(self.log_path(run_id), self.wd) for m in self.monitors]
+
+    def check_running(
+        self, pid: int, started: float, watches: Sequence["QoRWatch"] = ()
+    ) -> tuple[RunnerStatus, str] | None:
+        """Decide whether a running tool process should be stopped.
+
+        Called every ``poll_interval`` seconds while the tool runs. Returns the
+        termination status and reason, or ``None`` to keep it running.
+        """
+        elapsed = time.monotonic() - started
+        if self.timeout is not None and elapsed > self.timeout:
+            return RunnerStatus.TIMEOUT, f"Timed out after {elapsed:.1f} s"
+        if self.max_rss_mb is not None:
+            rss_mb = process_tree_rss(pid) / 1024 / 1024
+            if rss_mb > self.max_rss_mb:
+                return (
+                    RunnerStatus.OOM,
+                    f"Used {rss_mb:.1f} MB, over the limit of {self.max_rss_mb} MB",
+                )
+        for watch in watches:
+            reason = watch.poll()
+            if reason is not None:
+                return RunnerStatus.ABORTED, reason
+        return None
+
+    def detect_oom(self, returncode: int, stderr: str, log_text: str) -> str | None:
+        # a SIGKILL alone can come from anyone, only an allocation failure
+        # the tool reported is evidence of running out of memory
+        if returncode == 0:
+            return None
+        for text in (stderr, log_text[-65536:]):
+            m = RE_OUT_OF_MEMORY.search(text)
+            if m is None:
+                continue
+            if self.max_memory_mb is None:
+                return f"Ran out of memory: {m.group(0)}"
+            return f"Ran out of memory under the {self.max_memory_mb} MB limit"
+        return None
+
+    def cleanup(self, script_fp: Path) -> None:
+        script_fp.unlink(missing_ok=True)
+        if not self.isolate:
+            try:
+                script_fp.parent.rmdir()
+                script_fp.parent.parent.rmdir()
+            except OSError:
+                pass
+
+    def read_log(self, log_path: Path) -> str:
         if not log_path.exists():
             raise RuntimeError(f"Log file {log_path} does not exist")
-        log_text = log_path.read_text()
+        return log_path.read_text()
 
-        result = RunnerResult(
+    def sync_projects(self, commands: Sequence[Command]) -> None:
+        for cmd in commands:
+            if cmd.command_str != "open_project":
+                continue
+            project_dir = self.wd / getattr(cmd, "project_name")
+            if (project_dir / "hls.app").exists():
+                Project.parse_from_disk(project_dir).sync_solutions()
+
+    def finish(
+        self,
+        commands: Sequence[Command],
+        script: str,
+        script_fp: Path,
+        run_id: str,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        termination: RunnerStatus | None = None,
+        reason: str | None = None,
+    ) -> RunnerResult:
+        self.cleanup(script_fp)
+        if self.shared_project:
+            self.sync_projects(commands)
+
+        log_path = self.log_path(run_id)
+        if termination is None:
+            # a killed tool may not have created its log yet
+            log_text = self.read_log(log_path)
+            reason = self.detect_oom(returncode, stderr, log_text)
+            if reason is not None:
+                termination = RunnerStatus.OOM
+        else:
+            log_text = log_path.read_text() if log_path.exists() else ""
+        if termination is not None:
+            log.warning(f"Run {run_id} stopped: {reason}")
+
+        return RunnerResult(
             commands=commands,
             script=script,
-            returncode=s.returncode,
-            stdout=s.stdout,
-            stderr=s.stderr,
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
             log=log_text,
+            run_id=run_id,
+            log_path=log_path,
+            termination=termination,
+            reason=reason,
+        )
+
+    def run(self, commands: Sequence[Command], check: bool = False) -> RunnerResult:
+        run_id = self.new_run_id()
+        script, script_fp = self.write_script(commands, run_id)
+        log.debug(f"Starting run {run_id}")
+
+        termination = None
+        try:
+            watches = self.start_watches(run_id)
+            proc = subprocess.Popen(
+                self.tool_args(script_fp, self.log_path(run_id)),
+                cwd=self.tool_cwd(run_id),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                **self.popen_kwargs(),
+            )
+            started = time.monotonic()
+            try:
+                while True:
+                    try:
+                        stdout, stderr = proc.communicate(timeout=self.poll_interval)
+                        break
+                    except subprocess.TimeoutExpired:
+                        pass
+                    termination = self.check_running(proc.pid, started, watches)
+                    if termination is not None:
+                        kill_process_group(proc)
+                        stdout, stderr = proc.communicate()
+                        break
+            except BaseException:
+                kill_process_group(proc)
+                raise
+        except BaseException:
+            self.cleanup(script_fp)
+            raise
+
+        status, reason = termination if termination is not None else (None, None)
+        result = self.finish(
+            commands,
+            script,
+            script_fp,
+            run_id,
+            proc.returncode,
+            stdout,
+            stderr,
+            termination=status,
+            reason=reason,
         )
-        if check:
-            result.returncode != 0
-            raise RuntimeError(f"Command failed with return code {result.returncode}")
+        if check and result.status != RunnerStatus.SUCCESS:
+            raise RuntimeError(
+                f"Command failed with status {result.status.name} "
+                f"and return code {result.returncode}"
+            )
+
+        return result
 
+    async def start_async(self, commands: Sequence[Command]) -> "AsyncRun":
+        # asyncio is slow to import, only load it once it is actually used
+        import asyncio
+
+        run_id = self.new_run_id()
+        script, script_fp = self.write_script(commands, run_id)
+        try:
+            watches = self.start_watches(run_id)
+            proc = await asyncio.create_subprocess_exec(
+                *self.tool_args(script_fp, self.log_path(run_id)),
+                cwd=self.tool_cwd(run_id),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **self.popen_kwargs(),
+            )
+        except BaseException:
+            self.cleanup(script_fp)
+            raise
+        return AsyncRun(self, commands, script, script_fp, run_id, proc, watches)
+
+    async def run_async(
+        self, commands: Sequence[Command], check: bool = False
+    ) -> RunnerResult:
+        run = await self.start_async(commands)
+        result = await run.wait()
+        if check and result.status != RunnerStatus.SUCCESS:
+            raise RuntimeError(
+                f"Command failed with status {result.status.name} "
+                f"and return code {result.returncode}"
+            )
         return result
+
+
+class AsyncRun:
+    """A Vitis HLS process started by ``Runner.start_async``.
+
+    Output lines are read as soon as the tool writes them. ``events()`` yields
+    them together with any parsed log message or phase runtime record, and
+    ``wait()`` returns the final ``RunnerResult`` once the tool exits.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        commands: Sequence[Command],
+        script: str,
+        script_fp: Path,
+        run_id: str,
+        proc: "asyncio.subprocess.Process",
+        watches: Sequence["QoRWatch"] = (),
+    ) -> None:
+        import asyncio
+
+        self.runner = runner
+        self.commands = commands
+        self.script = script
+        self.script_fp = script_fp
+        self.run_id = run_id
+        self.proc = proc
+        self.watches = watches
+
+        self.started = time.monotonic()
+        self._stdout: list[str] = []
+        self._stderr: list[str] = []
+        self._events: asyncio.Queue[RunnerEvent | None] = asyncio.Queue()
+        self._stdout_task = asyncio.create_task(self._read_stdout())
+        self._stderr_task = asyncio.create_task(self._read_stderr())
+
+    async def _read_stdout(self) -> None:
+        assert self.proc.stdout is not None
+        async for raw in self.proc.stdout:
+            line = raw.decode(errors="replace")
+            self._stdout.append(line)
+            self._events.put_nowait(RunnerEvent.from_line(line.rstrip("\n")))
+        self._events.put_nowait(None)
+
+    async def _read_stderr(self) -> None:
+        assert self.proc.stderr is not None
+        async for raw in self.proc.stderr:
+            self._stderr.append(raw.decode(errors="replace"))
+
+    async def events(self) -> AsyncIterator[RunnerEvent]:
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    async def kill(self, grace: float = 5.0) -> None:
+        import asyncio
+
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            if not signal_process_group(self.proc.pid, sig):
+                return
+            try:
+                await asyncio.wait_for(self.proc.wait(), grace)
+                break
+            except TimeoutError:
+                continue
+        signal_process_group(self.proc.pid, signal.SIGKILL)
+
+    async def wait(self) -> RunnerResult:
+        import asyncio
+
+        readers = asyncio.gather(self._stdout_task, self._stderr_task)
+        termination = None
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(readers), self.runner.poll_interval
+                    )
+                    break
+                except TimeoutError:
+                    pass
+                termination = self.runner.check_running(
+                    self.proc.pid, self.started, self.watches
+                )
+                if termination is not None:
+                    await self.kill()
+                    await readers
+                    break
+            returncode = await self.proc.wait()
+        except asyncio.CancelledError:
+            # a cancelled caller must not leave the tool running or its script
+            await self.kill()
+            await self.proc.wait()
+            readers.cancel()
+            self.runner.cleanup(self.script_fp)
+            raise
+
+        status, reason = termination if termination is not None else (None, None)
+        return self.runner.finish(
+            self.commands,
+            self.script,
+            self.script_fp,
+            self.run_id,
+            returncode,
+            "".join(self._stdout),
+            "".join(self._stderr),
+            termination=status,
+            reason=reason,
+        )
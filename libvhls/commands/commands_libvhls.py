@@ -1,8 +1,14 @@
 import logging
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from libvhls.commands.commands import Command
+from libvhls.commands.commands_vitis_hls_project import (
+    CloseSolution,
+    CsynthDesign,
+    OpenSolution,
+)
 from libvhls.dist import VitisHLSDist
 
 log = logging.getLogger(__name__)
@@ -30,4 +36,71 @@ class ExexInTCL(Command):
         return f"exec {self.exec_command}"
 
 
-COMMANDS_LIBVHLS = [UserTCL, ExexInTCL]
+SOLUTION_MARKER = "@@LIBVHLS_SOLUTION@@"
+
+
+@dataclass
+class SolutionBlock(Command):
+    """Open a solution, run its commands and synthesize it, then close it.
+
+    The block is wrapped in ``catch`` so a failing solution does not stop the
+    ones after it, and is delimited by marker lines carrying the solution name
+    and the Tcl return code so the combined output can be split per solution.
+    """
+
+    name: str
+    commands: Sequence[Command] = field(default_factory=list)
+    flow_target: str | None = None
+    synthesize: bool = True
+
+    def __post_init__(self) -> None:
+        super().__init__("libvhls_solution_block")
+        if self.name == "" or any(c.isspace() for c in self.name):
+            raise ValueError(f"Invalid solution name {self.name!r}")
+
+    def compose(self, dist: VitisHLSDist, wd: Path) -> str:
+        body = [
+            OpenSolution(self.name, flow_target=self.flow_target, reset=True),
+            *self.commands,
+        ]
+        if self.synthesize:
+            body.append(CsynthDesign())
+        c = f'puts "{SOLUTION_MARKER} begin {self.name}"\n'
+        c += "set __libvhls_rc [catch {\n"
+        for cmd in body:
+            c += cmd.compose(dist, wd) + "\n"
+        c += "} __libvhls_err]\n"
+        c += 'if {$__libvhls_rc} {puts "ERROR: $__libvhls_err"}\n'
+        c += f"catch {{{CloseSolution().compose(dist, wd)}}}\n"
+        c += f'puts "{SOLUTION_MARKER} end {self.name} $__libvhls_rc"'
+        return c
+
+
+QUERY_MARKER = "@@LIBVHLS_QUERY@@"
+
+
+@dataclass
+class Query(Command):
+    """Run a command and print its Tcl result on a single marker line.
+
+    The result is hex encoded so that values containing newlines or markers
+    survive the round trip through the tool's output unchanged.
+    """
+
+    key: str
+    command: Command
+
+    def __post_init__(self) -> None:
+        super().__init__("libvhls_query")
+        if self.key == "" or any(c.isspace() for c in self.key):
+            raise ValueError(f"Invalid query key {self.key!r}")
+
+    def compose(self, dist: VitisHLSDist, wd: Path) -> str:
+        c = f"set __libvhls_rc [catch {{{self.command.compose(dist, wd)}}} "
+        c += "__libvhls_val]\n"
+        c += "binary scan [encoding convertto utf-8 $__libvhls_val] H* __libvhls_hex\n"
+        c += f'puts "{QUERY_MARKER} {self.key} $__libvhls_rc $__libvhls_hex"'
+        return c
+
+
+COMMANDS_LIBVHLS = [UserTCL, ExexInTCL, SolutionBlock, Query]
@@ -1,24 +1,200 @@
+import hashlib
+import json
+import logging
+import os
 import shutil
 from pathlib import Path
 
+from libvhls.utils import atomic_write_bytes, default_cache_dir
+
+log = logging.getLogger(__name__)
+
+HEADER_SUFFIXES = (".h", ".hh", ".hpp", ".hxx", ".inc", ".def")
+
+# PATH -> vitis_hls binary found on it and the stamp of the PATH dirs searched,
+# shared by every auto_find in a process
+_auto_find_cache: dict[str, tuple[Path, list[int]]] = {}
+
+
+def _auto_find_cache_path(path_env: str) -> Path:
+    key = hashlib.sha256(path_env.encode()).hexdigest()
+    return default_cache_dir() / "auto_find" / key[:32]
+
+
+def _path_stamp(path_dirs: list[str]) -> list[int]:
+    stamp = []
+    for path_dir in path_dirs:
+        try:
+            stamp.append(os.stat(path_dir or os.curdir).st_mtime_ns)
+        except OSError:
+            stamp.append(-1)
+    return stamp
+
+
+def _searched_path_dirs(path_env: str, bin_path: Path) -> list[str]:
+    """The ``PATH`` entries up to and including the one ``bin_path`` is in."""
+    path_dirs = path_env.split(os.pathsep)
+    for i, path_dir in enumerate(path_dirs):
+        if Path(path_dir, bin_path.name).absolute() == bin_path:
+            return path_dirs[: i + 1]
+    return path_dirs
+
+
+def _cache_valid(path_env: str, bin_path: Path, stamp: list[int]) -> bool:
+    if not os.access(bin_path, os.X_OK):
+        return False
+    # a binary installed ahead of the cached one changes the mtime of its dir
+    return _path_stamp(path_env.split(os.pathsep)[: len(stamp)]) == stamp
+
+
+def find_vitis_hls_bin(use_cache: bool = True) -> Path | None:
+    """Find the ``vitis_hls`` binary on ``PATH``.
+
+    Results are cached per ``PATH`` value in memory and on disk. A cached
+    binary is only reused while it is still executable and no ``PATH`` dir up
+    to its own has been modified, which costs a ``stat`` per dir instead of a
+    lookup of every candidate file.
+    """
+    path_env = os.environ.get("PATH", os.defpath)
+    if use_cache:
+        entry = _auto_find_cache.get(path_env)
+        if entry is not None and _cache_valid(path_env, *entry):
+            return entry[0]
+        cache_fp = _auto_find_cache_path(path_env)
+        try:
+            data = json.loads(cache_fp.read_text())
+            entry = (Path(data["bin"]), data["stamp"])
+        except (OSError, ValueError, KeyError, TypeError):
+            entry = None
+        if entry is not None and _cache_valid(path_env, *entry):
+            _auto_find_cache[path_env] = entry
+            return entry[0]
+
+    result = shutil.which("vitis_hls")
+    if result is None:
+        return None
+    bin_path = Path(result).absolute()
+    if use_cache:
+        stamp = _path_stamp(_searched_path_dirs(path_env, bin_path))
+        _auto_find_cache[path_env] = (bin_path, stamp)
+        data = {"bin": str(bin_path), "stamp": stamp}
+        try:
+            atomic_write_bytes(
+                _auto_find_cache_path(path_env), json.dumps(data).encode()
+            )
+        except OSError as e:
+            log.debug(f"Could not save vitis_hls location: {e}")
+    return bin_path
+
+
+class IncludeIndex:
+    """Index of the directories and headers under a dist's include tree.
+
+    Paths are stored relative to ``include_dir``. Headers are looked up by
+    basename, keeping every path when several headers share a name.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self, include_dir: Path, stamp: str, dirs: list[str], headers: list[str]
+    ) -> None:
+        self.include_dir = include_dir
+        self.stamp = stamp
+        self.dirs = dirs
+        self.headers = headers
+
+        self._header_set = set(headers)
+        self.by_name: dict[str, list[Path]] = {}
+        for rel_path in headers:
+            path = include_dir / rel_path
+            self.by_name.setdefault(path.name, []).append(path)
+
+    @classmethod
+    def build(cls, include_dir: Path, stamp: str) -> "IncludeIndex":
+        dirs: list[str] = []
+        headers: list[str] = []
+        for root, dir_names, file_names in os.walk(include_dir):
+            dir_names.sort()
+            rel_root = os.path.relpath(root, include_dir)
+            dirs.append("" if rel_root == "." else rel_root)
+            for name in sorted(file_names):
+                if name.endswith(HEADER_SUFFIXES):
+                    headers.append(os.path.normpath(os.path.join(rel_root, name)))
+        return cls(include_dir, stamp, dirs, headers)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": self.VERSION,
+                "include_dir": str(self.include_dir),
+                "stamp": self.stamp,
+                "dirs": self.dirs,
+                "headers": self.headers,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "IncludeIndex":
+        data = json.loads(text)
+        if data["version"] != cls.VERSION:
+            raise ValueError(f"Unsupported include index version {data['version']}")
+        return cls(
+            Path(data["include_dir"]), data["stamp"], data["dirs"], data["headers"]
+        )
+
+    def lookup(self, name: str) -> list[Path]:
+        return self.by_name.get(name, [])
+
+    def resolve(self, include: str) -> Path | None:
+        """Resolve an ``#include`` path as written in the source.
+
+        Paths with directories match relative to the include root first, then
+        relative to any indexed directory, then by basename.
+        """
+        if include in self._header_set:
+            return self.include_dir / include
+        candidates = self.lookup(Path(include).name)
+        if "/" in include:
+            suffix = "/" + include
+            candidates = [p for p in candidates if str(p).endswith(suffix)]
+        if len(candidates) == 0:
+            return None
+        return candidates[0]
+
 
 class VitisHLSDist:
-    def __init__(self, dist_dir: Path):
+    def __init__(self, dist_dir: Path, index_cache_dir: Path | None = None):
         self.dist_dir = dist_dir
+        self.index_cache_dir = index_cache_dir
+        self._include_index: IncludeIndex | None = None
 
     @classmethod
     def from_bin_path(cls, bin_path: Path):
         return cls(bin_path.parent.parent)
 
     @classmethod
-    def auto_find(cls):
-        vitis_hls_path = shutil.which("vitis_hls")
+    def auto_find(cls, use_cache: bool = True):
+        vitis_hls_path = find_vitis_hls_bin(use_cache=use_cache)
         if vitis_hls_path is None:
             raise RuntimeError(
                 "Could not find vitis_hls automatically, please specify the path"
                 " manually."
             )
-        return cls.from_bin_path(Path(vitis_hls_path))
+        return cls.from_bin_path(vitis_hls_path)
+
+    @property
+    def version(self) -> str:
+        # installs are laid out as .../Vitis_HLS/<version>/
+        return self.dist_dir.name
+
+    @property
+    def fingerprint(self) -> str:
+        parts = [str(self.dist_dir.resolve()), self.version]
+        if self.vitis_hls_bin.exists():
+            stat = self.vitis_hls_bin.stat()
+            parts += [str(stat.st_size), str(stat.st_mtime_ns)]
+        return ":".join(parts)
 
     @property
     def bin_dir(self) -> Path:
@@ -32,17 +208,63 @@ class VitisHLSDist:
     def include_dir(self) -> Path:
         return self.dist_dir / "include"
 
+    def include_index_stamp(self) -> str:
+        parts = [self.version]
+        for path in [self.dist_dir, self.include_dir]:
+            try:
+                parts.append(str(path.stat().st_mtime_ns))
+            except FileNotFoundError:
+                parts.append("missing")
+        return ":".join(parts)
+
+    def include_index_path(self) -> Path:
+        cache_dir = self.index_cache_dir
+        if cache_dir is None:
+            cache_dir = default_cache_dir() / "include_index"
+        key = hashlib.sha256(str(self.include_dir.resolve()).encode()).hexdigest()
+        return cache_dir / f"{key[:32]}.json"
+
+    @property
+    def include_index(self) -> IncludeIndex:
+        stamp = self.include_index_stamp()
+        if self._include_index is not None and self._include_index.stamp == stamp:
+            return self._include_index
+
+        index_fp = self.include_index_path()
+        index = None
+        try:
+            index = IncludeIndex.from_json(index_fp.read_text())
+        except (OSError, ValueError, KeyError):
+            pass
+        if index is None or index.stamp != stamp:
+            log.info(f"Indexing include tree {self.include_dir}")
+            index = IncludeIndex.build(self.include_dir, stamp)
+            try:
+                atomic_write_bytes(index_fp, index.to_json().encode())
+            except OSError as e:
+                log.warning(f"Could not save include index to {index_fp}: {e}")
+        self._include_index = index
+        return index
+
     @property
     def all_include_dirs(self) -> dict[str, Path]:
         dirs = {}
         dirs["include"] = self.include_dir
-        for path in self.include_dir.glob("**/"):
+        for rel_dir in self.include_index.dirs:
+            path = self.include_dir / rel_dir
             dirs[path.name] = path
         return dirs
 
     @property
     def includes(self) -> dict[str, Path]:
         includes = {}
-        for path in self.include_dir.glob("**/*.h"):
-            includes[path.name] = path
+        for name, paths in self.include_index.by_name.items():
+            if name.endswith(".h"):
+                includes[name] = paths[-1]
         return includes
+
+    def find_includes(self, name: str) -> list[Path]:
+        return self.include_index.lookup(name)
+
+    def resolve_include(self, include: str) -> Path | None:
+        return self.include_index.resolve(include)
@@ -0,0 +1,164 @@
+import logging
+import os
+import shutil
+import traceback
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from libvhls.commands.commands import (
+    Command,
+    Runner,
+    RunnerResult,
+    RunnerStatus,
+    SlimRunnerResult,
+)
+from libvhls.monitor import QoRMonitor
+from libvhls.synth_report import SynthesisReport
+from libvhls.vitis_hls import VitisHLS
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class HLSJob:
+    name: str
+    commands: Sequence[Command]
+    files: Sequence[Path] = field(default_factory=list)
+    report_glob: str | None = "**/syn/report/csynth.xml"
+    timeout: float | None = None
+    max_memory_mb: float | None = None
+    monitors: Sequence[QoRMonitor] = field(default_factory=list)
+
+
+@dataclass
+class HLSJobResult:
+    job: HLSJob
+    wd: Path
+    result: RunnerResult | SlimRunnerResult | None = None
+    report: SynthesisReport | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.error is None
+            and self.result is not None
+            and self.result.status == RunnerStatus.SUCCESS
+        )
+
+
+def prepare_job_dir(job: HLSJob, wd: Path) -> None:
+    wd.mkdir(parents=True, exist_ok=True)
+    for fp in job.files:
+        shutil.copy2(fp, wd / fp.name)
+
+
+def find_report(job: HLSJob, wd: Path) -> SynthesisReport | None:
+    if job.report_glob is None:
+        return None
+    reports = sorted(wd.glob(job.report_glob))
+    if len(reports) == 0:
+        return None
+    return SynthesisReport.parse_from_disk(reports[0])
+
+
+def slim_result_path(wd: Path, result: RunnerResult) -> Path:
+    run_id = result.run_id if result.run_id is not None else Runner.new_run_id()
+    return wd / Runner.RUNS_DIR_NAME / run_id / "result.txt"
+
+
+def run_job(
+    job: HLSJob, wd: Path, tool_path: Path | None = None, slim: bool = False
+) -> HLSJobResult:
+    job_result = HLSJobResult(job=job, wd=wd)
+    try:
+        prepare_job_dir(job, wd)
+        vhls = VitisHLS(
+            tool_path=tool_path,
+            wd=wd,
+            timeout=job.timeout,
+            max_memory_mb=job.max_memory_mb,
+            monitors=job.monitors,
+        )
+        result = vhls.run(job.commands)
+        # leave the texts on disk instead of pickling them back to the caller
+        job_result.result = (
+            result.slim(slim_result_path(wd, result)) if slim else result
+        )
+        if result.status == RunnerStatus.SUCCESS:
+            job_result.report = find_report(job, wd)
+    except Exception:
+        job_result.error = traceback.format_exc()
+        log.warning(f"Job {job.name} failed:\n{job_result.error}")
+    return job_result
+
+
+class HLSExecutor:
+    """Runs HLS jobs in a pool of worker processes.
+
+    Each job runs in its own directory under ``base_dir`` named after it, so
+    job names must be unique, and its files are copied in so commands can
+    refer to them by file name. Results are yielded as soon as each job
+    completes. At most ``max_pending`` jobs are submitted to the pool at a
+    time, so ``jobs`` can be a lazy iterable of any length.
+    With ``slim_results`` the jobs return a ``SlimRunnerResult`` whose texts
+    are only read from the job's directory when accessed.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        n_workers: int | None = None,
+        tool_path: Path | None = None,
+        max_pending: int | None = None,
+        slim_results: bool = False,
+    ) -> None:
+        self.base_dir = base_dir
+        self.n_workers = n_workers if n_workers is not None else os.cpu_count() or 1
+        self.tool_path = tool_path
+        self.max_pending = (
+            max_pending if max_pending is not None else 2 * self.n_workers
+        )
+        self.slim_results = slim_results
+
+    def job_dir(self, job: HLSJob) -> Path:
+        return self.base_dir / job.name
+
+    def run(self, jobs: Iterable[HLSJob]) -> Iterator[HLSJobResult]:
+        job_iter = iter(jobs)
+        names: set[str] = set()
+        pending: set[Future[HLSJobResult]] = set()
+        with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+
+            def fill() -> None:
+                while len(pending) < self.max_pending:
+                    job = next(job_iter, None)
+                    if job is None:
+                        return
+                    # jobs of the same name would share and clobber a directory
+                    if job.name in names:
+                        raise ValueError(f"Job names must be unique, got {job.name}")
+                    names.add(job.name)
+                    log.info(f"Submitting job {job.name}")
+                    pending.add(
+                        pool.submit(
+                            run_job,
+                            job,
+                            self.job_dir(job),
+                            self.tool_path,
+                            self.slim_results,
+                        )
+                    )
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+                fill()
+
+    def run_all(self, jobs: Iterable[HLSJob]) -> list[HLSJobResult]:
+        return list(self.run(jobs))
@@ -0,0 +1,202 @@
+import logging
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.commands.commands import Command
+from libvhls.executor import HLSExecutor, HLSJob, HLSJobResult
+from libvhls.report_analytics import pareto_ranks
+from libvhls.synth_report import RESOURCE_TYPES, SynthesisReport
+
+log = logging.getLogger(__name__)
+
+Objectives = Callable[[SynthesisReport], Sequence[float]]
+
+
+def latency_and_utilization(report: SynthesisReport) -> tuple[float, float]:
+    """Default funnel objectives, both minimized.
+
+    The worst case latency, NaN if unknown, and the highest utilization of
+    any resource type.
+    """
+    latency = report.top_level_latency_data.worst_case_latency_t
+    resources = report.top_level_resource_data
+    used = resources.used_abs
+    available = resources.available_abs
+    utilization = max(
+        (used[r] / available[r] for r in RESOURCE_TYPES if available.get(r)),
+        default=0.0,
+    )
+    return (math.nan if latency is None else latency), utilization
+
+
+@dataclass
+class DesignPoint:
+    """One design of a ``Funnel``, run in the executor's job dir ``name``.
+
+    ``setup`` runs before every stage and should open the project and solution
+    without resetting them. ``config`` only runs in the first stage, typically
+    adding files and setting the part, clock and directives, which the tool
+    keeps in the project for the later stages.
+    """
+
+    name: str
+    setup: Sequence[Command]
+    config: Sequence[Command] = field(default_factory=list)
+    files: Sequence[Path] = field(default_factory=list)
+
+
+@dataclass
+class FunnelStage:
+    """A stage of a ``Funnel`` and how many of its designs move on.
+
+    Of the designs that pass the stage, the best ``promote`` fraction, at most
+    ``max_promoted`` of them, run the next stage. Ignored for the last stage.
+    """
+
+    name: str
+    commands: Sequence[Command]
+    promote: float = 1.0
+    max_promoted: int | None = None
+    timeout: float | None = None
+    max_memory_mb: float | None = None
+
+    def n_promoted(self, n_passed: int) -> int:
+        n = math.ceil(self.promote * n_passed)
+        if self.max_promoted is not None:
+            n = min(n, self.max_promoted)
+        return n
+
+
+@dataclass
+class FunnelResult:
+    # stage name -> job results of the designs that ran it
+    stages: dict[str, list[HLSJobResult]] = field(default_factory=dict)
+    # stage name -> designs promoted to the next stage, best first
+    promoted: dict[str, list[str]] = field(default_factory=dict)
+    # latest synthesis report of each design
+    reports: dict[str, SynthesisReport] = field(default_factory=dict)
+
+    @property
+    def survivors(self) -> list[str]:
+        """Designs that passed the last stage that ran."""
+        if len(self.stages) == 0:
+            return []
+        last = list(self.stages.values())[-1]
+        return [r.job.name for r in last if r.ok]
+
+
+class Funnel:
+    """Runs a campaign in stages of increasing cost, pruning designs in between.
+
+    Every design runs the first stage, usually ``CsynthDesign``. After each
+    stage, the designs that passed it are ranked by the Pareto front of
+    ``objectives`` on their synthesis report, with ties inside a front broken
+    by the objectives in order, and only the top ones run the next stage::
+
+        funnel = Funnel(
+            HLSExecutor(base_dir),
+            [
+                FunnelStage("csynth", [CsynthDesign()], promote=0.25),
+                FunnelStage("cosim", [CosimDesign()], max_promoted=2),
+                FunnelStage("export", [UserTCL("export_design -format ip_catalog")]),
+            ],
+        )
+        result = funnel.run(points)
+
+    All stages of a design run in the same job dir, so later stages reuse the
+    project built by the earlier ones.
+    """
+
+    def __init__(
+        self,
+        executor: HLSExecutor,
+        stages: Sequence[FunnelStage],
+        objectives: Objectives = latency_and_utilization,
+        report_glob: str = "**/syn/report/csynth.xml",
+    ) -> None:
+        if len(stages) == 0:
+            raise ValueError("A funnel needs at least one stage")
+        if len({s.name for s in stages}) != len(stages):
+            raise ValueError("Funnel stage names must be unique")
+        self.executor = executor
+        self.stages = stages
+        self.objectives = objectives
+        self.report_glob = report_glob
+
+    def stage_job(self, point: DesignPoint, i_stage: int) -> HLSJob:
+        stage = self.stages[i_stage]
+        config = point.config if i_stage == 0 else []
+        return HLSJob(
+            point.name,
+            [*point.setup, *config, *stage.commands],
+            files=point.files,
+            report_glob=self.report_glob,
+            timeout=stage.timeout,
+            max_memory_mb=stage.max_memory_mb,
+        )
+
+    def rank(
+        self, names: Sequence[str], reports: dict[str, SynthesisReport]
+    ) -> list[str]:
+        """Order designs best first, designs without a report go last."""
+        n_objectives = None
+        rows = []
+        for name in names:
+            report = reports.get(name)
+            row = None if report is None else list(self.objectives(report))
+            if row is not None:
+                n_objectives = len(row)
+            rows.append(row)
+        if n_objectives is None:
+            return list(names)
+        costs = np.array(
+            [row if row is not None else [math.nan] * n_objectives for row in rows],
+            dtype=np.float64,
+        )
+        ranks = pareto_ranks(costs)
+        # NaN objectives sort after every number within the same front
+        keys = np.where(np.isnan(costs), np.inf, costs)
+        order = sorted(range(len(names)), key=lambda i: (ranks[i], *keys[i]))
+        return [names[i] for i in order]
+
+    def run(self, points: Sequence[DesignPoint]) -> FunnelResult:
+        by_name = {p.name: p for p in points}
+        if len(by_name) != len(points):
+            raise ValueError("Design point names must be unique")
+        result = FunnelResult()
+        active = [p.name for p in points]
+
+        for i_stage, stage in enumerate(self.stages):
+            if len(active) == 0:
+                break
+            log.info(f"Stage {stage.name}: running {len(active)} designs")
+            jobs = [self.stage_job(by_name[name], i_stage) for name in active]
+            stage_results = list(self.executor.run(jobs))
+            result.stages[stage.name] = stage_results
+
+            passed = []
+            for r in stage_results:
+                if r.report is not None:
+                    result.reports[r.job.name] = r.report
+                if r.ok:
+                    passed.append(r.job.name)
+                else:
+                    log.info(f"Design {r.job.name} failed stage {stage.name}")
+            if i_stage == len(self.stages) - 1:
+                break
+
+            # keep the submission order among equally ranked designs
+            order = {name: i for i, name in enumerate(active)}
+            passed.sort(key=order.__getitem__)
+            ranked = self.rank(passed, result.reports)
+            active = ranked[: stage.n_promoted(len(ranked))]
+            result.promoted[stage.name] = active
+            log.info(
+                f"Stage {stage.name}: {len(passed)} of {len(jobs)} designs passed,"
+                f" promoting {len(active)}"
+            )
+        return result
@@ -1,5 +1,12 @@
+import mmap
 import re
-from dataclasses import dataclass
+import string
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
 
 
 @dataclass
@@ -10,16 +17,64 @@ class RuntimeInfo:
     elapsed: float
 
 
+class LogSeverity(Enum):
+    INFO = "INFO"
+    WARNING = "WARNING"
+    CRITICAL_WARNING = "CRITICAL WARNING"
+    ERROR = "ERROR"
+
+
+@dataclass
+class LogMessage:
+    severity: LogSeverity
+    msg_id: str | None
+    text: str
+    line_no: int | None = None
+
+
 class HLSLog:
     RE_RUNTIME = re.compile(
         r"Finished ([^:]+): CPU user time:\s*([0-9.]+) seconds\. "
         r"CPU system time:\s*([0-9.]+) seconds\. "
         r"Elapsed time:\s*([0-9.]+) seconds"
     )
+    RE_MESSAGE = re.compile(
+        r"^(INFO|WARNING|CRITICAL WARNING|ERROR):\s*(?:\[([^\]]+)\]\s*)?(.*)$"
+    )
 
     def __init__(self, txt: str):
         self.txt = txt
 
+    @classmethod
+    def parse_message(cls, line: str) -> LogMessage | None:
+        m = cls.RE_MESSAGE.match(line)
+        if m is None:
+            return None
+        return LogMessage(
+            severity=LogSeverity(m.group(1)),
+            msg_id=m.group(2),
+            text=m.group(3).rstrip(),
+        )
+
+    @classmethod
+    def parse_runtime(cls, line: str) -> RuntimeInfo | None:
+        m = cls.RE_RUNTIME.search(line)
+        if m is None:
+            return None
+        return cls._runtime_from_match(m)
+
+    @staticmethod
+    def _runtime_from_match(m: re.Match) -> RuntimeInfo:
+        return RuntimeInfo(
+            phase=m.group(1).strip(),
+            cpu_user=float(m.group(2)),
+            cpu_sys=float(m.group(3)),
+            elapsed=float(m.group(4)),
+        )
+
+    def index(self) -> "HLSLogIndex":
+        return HLSLogIndex.from_text(self.txt)
+
     def lines(self):
         return self.txt.splitlines()
 
@@ -33,19 +88,260 @@ class HLSLog:
         return [line for line in self.lines() if "INFO:" in line]
 
     def runtimes(self) -> list[RuntimeInfo]:
-        results = []
-        for m in self.RE_RUNTIME.finditer(self.txt):
-            phase = m.group(1).strip()
-            cpu_user = float(m.group(2))
-            cpu_sys = float(m.group(3))
-            elapsed = float(m.group(4))
-
-            results.append(
-                RuntimeInfo(
-                    phase=phase,
-                    cpu_user=cpu_user,
-                    cpu_sys=cpu_sys,
-                    elapsed=elapsed,
-                )
-            )
-        return results
+        return [self._runtime_from_match(m) for m in self.RE_RUNTIME.finditer(self.txt)]
+
+
+@dataclass
+class HLSLogStream:
+    """Incremental parser for a log that is still being written.
+
+    Text can be pushed in arbitrary chunks with ``feed``, or read from a
+    growing log file with ``follow``, which resumes from ``offset`` and only
+    consumes complete lines. Already processed data is never re-read; the
+    tallies and records are updated as new lines arrive.
+    """
+
+    keep_records: bool = True
+    offset: int = 0
+    line_no: int = 0
+    severity_counts: Counter[LogSeverity] = field(default_factory=Counter)
+    msg_id_counts: Counter[str] = field(default_factory=Counter)
+    records: list[LogMessage] = field(default_factory=list)
+    runtimes: list[RuntimeInfo] = field(default_factory=list)
+    _partial: str = field(default="", init=False, repr=False)
+
+    def feed_line(self, line: str) -> LogMessage | None:
+        self.line_no += 1
+        message = HLSLog.parse_message(line)
+        if message is None:
+            return None
+        message.line_no = self.line_no
+        self.severity_counts[message.severity] += 1
+        if message.msg_id is not None:
+            self.msg_id_counts[message.msg_id] += 1
+        if self.keep_records:
+            self.records.append(message)
+        runtime = HLSLog.parse_runtime(message.text)
+        if runtime is not None:
+            self.runtimes.append(runtime)
+        return message
+
+    def feed(self, chunk: str) -> list[LogMessage]:
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        new = [self.feed_line(line.rstrip("\r")) for line in lines]
+        return [m for m in new if m is not None]
+
+    def close(self) -> list[LogMessage]:
+        if self._partial == "":
+            return []
+        line, self._partial = self._partial, ""
+        message = self.feed_line(line)
+        return [] if message is None else [message]
+
+    def follow(self, path: Path) -> list[LogMessage]:
+        if not path.exists():
+            return []
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n")
+        if end == -1:
+            return []
+        # a trailing partial line is left on disk until it is completed
+        self.offset += end + 1
+        return self.feed(data[: end + 1].decode("utf-8", errors="replace"))
+
+    @property
+    def n_infos(self) -> int:
+        return self.severity_counts[LogSeverity.INFO]
+
+    @property
+    def n_warnings(self) -> int:
+        return (
+            self.severity_counts[LogSeverity.WARNING]
+            + self.severity_counts[LogSeverity.CRITICAL_WARNING]
+        )
+
+    @property
+    def n_errors(self) -> int:
+        return self.severity_counts[LogSeverity.ERROR]
+
+
+class HLSLogIndex:
+    """Index over all messages of a log, built in a single pass.
+
+    Every ``INFO``/``WARNING``/``CRITICAL WARNING``/``ERROR`` line is recorded
+    with its severity, message ID, byte span, the phase it belongs to (the next
+    ``Finished <phase>`` record) and any ``file:line`` source references. The
+    catalogs map message IDs, severities and source files to record numbers,
+    so lookups only touch the matching records. Message text is decoded only
+    when a record is accessed, and ``from_file`` memory-maps the log instead of
+    loading it as one ``str``.
+    """
+
+    RE_MESSAGE = re.compile(
+        rb"^(INFO|WARNING|CRITICAL WARNING|ERROR):[ \t]*"
+        rb"(?:\[([^\]\n]+)\][ \t]*)?([^\n]*)$",
+        re.MULTILINE,
+    )
+    # Matching the whole path up front backtracks badly on long lines, so only
+    # the extension is matched and the path is recovered by looking back.
+    RE_SOURCE_REF = re.compile(rb"\.(?:c|cc|cpp|cxx|h|hh|hpp|hxx):(\d+)")
+    PATH_CHARS = (string.ascii_letters + string.digits + "_./+-").encode()
+    SEVERITIES = list(LogSeverity)
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        self.data = data
+
+        self.severity = array("b")
+        self.msg_id = array("i")
+        self.start = array("q")
+        self.end = array("q")
+        self.phase = array("i")
+
+        self.msg_ids: list[str] = []
+        self.phases: list[str] = []
+        self.by_msg_id: dict[str, array] = {}
+        self.by_severity: dict[LogSeverity, array] = {
+            severity: array("i") for severity in self.SEVERITIES
+        }
+        self.by_source: dict[str, list[tuple[int, int]]] = {}
+        self.runtimes: list[RuntimeInfo] = []
+        self.runtime_records = array("i")
+
+        self._build()
+
+    @classmethod
+    def from_text(cls, txt: str) -> "HLSLogIndex":
+        return cls(txt.encode())
+
+    @classmethod
+    def from_file(cls, path: Path) -> "HLSLogIndex":
+        with open(path, "rb") as f:
+            if path.stat().st_size == 0:
+                return cls(b"")
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _build(self) -> None:
+        severity_codes = {s.value.encode(): i for i, s in enumerate(self.SEVERITIES)}
+        by_severity = [self.by_severity[s] for s in self.SEVERITIES]
+        msg_id_codes: dict[bytes, int] = {}
+        msg_id_records: list[array] = []
+        re_runtime = re.compile(HLSLog.RE_RUNTIME.pattern.encode())
+        find_refs = self.RE_SOURCE_REF.finditer
+        data = self.data
+
+        severity_append = self.severity.append
+        msg_id_append = self.msg_id.append
+        start_append = self.start.append
+        end_append = self.end.append
+        phase_append = self.phase.append
+        phase_start = 0
+
+        for i, m in enumerate(self.RE_MESSAGE.finditer(data)):
+            raw_severity, raw_id = m.group(1, 2)
+            severity_code = severity_codes[raw_severity]
+            severity_append(severity_code)
+            by_severity[severity_code].append(i)
+            start, end = m.span()
+            start_append(start)
+            end_append(end)
+            phase_append(-1)
+
+            # source references and runtimes are only looked for in the span
+            # of the message, the log is never scanned again
+            for ref in find_refs(data, start, end):
+                window = data[max(start, ref.start() - 1024) : ref.start()]
+                stem = window[len(window.rstrip(self.PATH_CHARS)) :]
+                if stem == b"":
+                    continue
+                ext = data[ref.start() : ref.start(1) - 1]
+                path = (stem + ext).decode()
+                self.by_source.setdefault(path, []).append((i, int(ref.group(1))))
+
+            if data.find(b"Finished ", start, end) != -1:
+                r = re_runtime.search(data, start, end)
+                if r is not None:
+                    runtime = RuntimeInfo(
+                        phase=r.group(1).decode().strip(),
+                        cpu_user=float(r.group(2)),
+                        cpu_sys=float(r.group(3)),
+                        elapsed=float(r.group(4)),
+                    )
+                    self.runtimes.append(runtime)
+                    self.runtime_records.append(i)
+                    # every message since the last runtime belongs to this phase
+                    phase_code = len(self.phases)
+                    self.phases.append(runtime.phase)
+                    self.phase[phase_start : i + 1] = array("i", [phase_code]) * (
+                        i + 1 - phase_start
+                    )
+                    phase_start = i + 1
+
+            if raw_id is None:
+                msg_id_append(-1)
+                continue
+            code = msg_id_codes.get(raw_id)
+            if code is None:
+                code = msg_id_codes[raw_id] = len(self.msg_ids)
+                self.msg_ids.append(raw_id.decode())
+                msg_id_records.append(array("i"))
+            msg_id_append(code)
+            msg_id_records[code].append(i)
+
+        self.by_msg_id = dict(zip(self.msg_ids, msg_id_records))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def line(self, i: int) -> str:
+        raw = self.data[self.start[i] : self.end[i]]
+        return raw.decode("utf-8", errors="replace").rstrip("\r")
+
+    def message(self, i: int) -> LogMessage:
+        message = HLSLog.parse_message(self.line(i))
+        assert message is not None
+        return message
+
+    def messages(self, records: Iterable[int]) -> list[LogMessage]:
+        return [self.message(i) for i in records]
+
+    def records_with_msg_id(self, msg_id: str) -> array:
+        return self.by_msg_id.get(msg_id, array("i"))
+
+    def records_with_prefix(self, prefix: str) -> list[int]:
+        """Records whose message ID starts with ``prefix``, e.g. ``HLS 214-``."""
+        records: list[int] = []
+        for msg_id, idx in self.by_msg_id.items():
+            if msg_id.startswith(prefix):
+                records.extend(idx)
+        records.sort()
+        return records
+
+    def records_with_severity(self, severity: LogSeverity) -> array:
+        return self.by_severity[severity]
+
+    def records_at_source(self, file: str, line: int | None = None) -> list[int]:
+        refs = self.by_source.get(file, [])
+        return sorted({i for i, ref_line in refs if line is None or ref_line == line})
+
+    def phase_of(self, i: int) -> str | None:
+        code = self.phase[i]
+        return None if code == -1 else self.phases[code]
+
+    def counts_by_msg_id(self) -> dict[str, int]:
+        return {msg_id: len(idx) for msg_id, idx in self.by_msg_id.items()}
+
+    def counts_by_severity(self) -> dict[LogSeverity, int]:
+        return {severity: len(idx) for severity, idx in self.by_severity.items()}
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> "HLSLogIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
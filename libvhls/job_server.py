@@ -0,0 +1,454 @@
+import logging
+import queue
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, replace
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+
+from libvhls.executor import HLSJob, HLSJobResult, run_job
+
+log = logging.getLogger(__name__)
+
+# files under the job dir sent back to the server with each result
+DEFAULT_ARTIFACTS = (
+    "vitis_hls.log",
+    "**/syn/report/*.xml",
+    "**/syn/report/*.rpt",
+)
+
+# Messages are tuples pickled by ``multiprocessing.connection``, which frames
+# them and authenticates both ends with the shared ``authkey``.
+#
+#   worker -> server: ("hello", worker_id), ("ready",), ("heartbeat", job_id),
+#                     ("done", job_id, HLSJobResult, artifacts)
+#   server -> worker: ("job", JobSpec), ("idle",), ("stop",)
+
+
+@dataclass
+class JobSpec:
+    """An ``HLSJob`` bundled with the contents of its files, as sent to workers."""
+
+    job_id: int
+    job: HLSJob
+    bundle: dict[str, bytes]
+    artifacts: Sequence[str] = DEFAULT_ARTIFACTS
+
+    @classmethod
+    def from_job(
+        cls, job_id: int, job: HLSJob, artifacts: Sequence[str] = DEFAULT_ARTIFACTS
+    ) -> "JobSpec":
+        bundle = {fp.name: fp.read_bytes() for fp in job.files}
+        return cls(job_id, replace(job, files=[]), bundle, artifacts)
+
+
+@dataclass
+class Assignment:
+    spec: JobSpec
+    worker_id: str
+    last_seen: float
+
+
+def collect_artifacts(wd: Path, patterns: Sequence[str]) -> dict[str, bytes]:
+    artifacts: dict[str, bytes] = {}
+    for pattern in patterns:
+        for fp in sorted(wd.glob(pattern)):
+            if fp.is_file():
+                artifacts[fp.relative_to(wd).as_posix()] = fp.read_bytes()
+    return artifacts
+
+
+def write_artifacts(wd: Path, artifacts: dict[str, bytes]) -> None:
+    for rel_path, data in artifacts.items():
+        rel = Path(rel_path)
+        if rel.is_absolute() or ".." in rel.parts:
+            log.warning(f"Ignoring artifact outside of the job dir: {rel_path}")
+            continue
+        fp = wd / rel
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.write_bytes(data)
+
+
+class JobServer:
+    """Hands out HLS jobs to remote workers over TCP and collects the results.
+
+    Workers connect with ``JobWorker`` using the same ``authkey``, pull one
+    job at a time and send back the ``HLSJobResult`` together with the files
+    matching ``artifacts``, which are written to ``base_dir / job.name``.
+    While a job runs its worker sends heartbeats; jobs of workers that
+    disconnect or miss heartbeats for ``heartbeat_timeout`` seconds are put
+    back in the queue, at most ``max_attempts`` times per job. Use it as a
+    context manager::
+
+        with JobServer(base_dir, authkey, ("0.0.0.0", 7070)) as server:
+            for result in server.run(jobs):
+                ...
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        authkey: bytes,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        heartbeat_timeout: float = 30.0,
+        max_attempts: int = 3,
+        artifacts: Sequence[str] = DEFAULT_ARTIFACTS,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.base_dir = base_dir
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.artifacts = artifacts
+        self.poll_interval = poll_interval
+        self._listener = Listener(address, authkey=authkey)
+
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._jobs: dict[int, HLSJob] = {}
+        self._attempts: dict[int, int] = {}
+        self._pending: deque[JobSpec] = deque()
+        self._running: dict[int, Assignment] = {}
+        self._workers: set[str] = set()
+        self._next_id = 0
+        self._outstanding = 0
+        self._results: queue.Queue[HLSJobResult] = queue.Queue()
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def address(self) -> tuple[str, int]:
+        # the listener is always on TCP, whose addresses are (host, port)
+        address: tuple[str, int] = self._listener.address
+        return address
+
+    @property
+    def workers(self) -> set[str]:
+        with self._lock:
+            return set(self._workers)
+
+    @property
+    def running(self) -> dict[str, str]:
+        """Names of the running jobs and the ids of the workers running them."""
+        with self._lock:
+            return {a.spec.job.name: a.worker_id for a in self._running.values()}
+
+    def job_dir(self, job: HLSJob) -> Path:
+        return self.base_dir / job.name
+
+    def start(self) -> "JobServer":
+        for target in (self._accept_loop, self._monitor_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        log.info(f"Job server listening on {self.address}")
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._has_work.notify_all()
+        # closing the listener does not interrupt a blocking accept, connect
+        # once so the accept loop wakes up and sees the flag
+        try:
+            socket.create_connection(self.address, timeout=1.0).close()
+        except OSError:
+            pass
+        for thread in self._threads:
+            thread.join()
+        self._listener.close()
+
+    def __enter__(self) -> "JobServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, job: HLSJob) -> int:
+        with self._lock:
+            job_id = self._next_id
+            self._next_id += 1
+        spec = JobSpec.from_job(job_id, job, self.artifacts)
+        with self._lock:
+            self._outstanding += 1
+            self._jobs[job_id] = job
+            self._attempts[job_id] = 0
+            self._pending.append(spec)
+            self._has_work.notify()
+        log.info(f"Queued job {job.name}")
+        return job_id
+
+    def results(self) -> Iterator[HLSJobResult]:
+        """Yield results as they arrive until all submitted jobs are done."""
+        while self._outstanding > 0:
+            result = self._results.get()
+            with self._lock:
+                self._outstanding -= 1
+            yield result
+
+    def run(self, jobs: Iterable[HLSJob]) -> Iterator[HLSJobResult]:
+        for job in jobs:
+            self.submit(job)
+        yield from self.results()
+
+    def run_all(self, jobs: Iterable[HLSJob]) -> list[HLSJobResult]:
+        return list(self.run(jobs))
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._closed:
+                    return
+                log.warning(f"Rejected worker connection: {e!r}")
+                continue
+            if self._closed:
+                conn.close()
+                return
+            thread = threading.Thread(
+                target=self._serve_worker, args=(conn,), daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _monitor_loop(self) -> None:
+        interval = min(self.poll_interval, self.heartbeat_timeout / 4)
+        while not self._closed:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                stale = [
+                    a
+                    for a in self._running.values()
+                    if now - a.last_seen > self.heartbeat_timeout
+                ]
+                for a in stale:
+                    self._requeue(a, "missed its heartbeats")
+
+    def _serve_worker(self, conn: Connection) -> None:
+        worker_id: str | None = None
+        try:
+            kind, worker_id = conn.recv()
+            if kind != "hello":
+                raise ValueError(f"Expected a hello message, got {kind}")
+            with self._lock:
+                self._workers.add(worker_id)
+            log.info(f"Worker {worker_id} connected")
+            while not self._closed:
+                if not conn.poll(self.poll_interval):
+                    continue
+                msg = conn.recv()
+                if msg[0] == "ready":
+                    spec = self._next_job(worker_id)
+                    if spec is not None:
+                        conn.send(("job", spec))
+                    elif self._closed:
+                        conn.send(("stop",))
+                    else:
+                        conn.send(("idle",))
+                elif msg[0] == "heartbeat":
+                    self._heartbeat(worker_id, msg[1])
+                elif msg[0] == "done":
+                    self._complete(worker_id, *msg[1:])
+                else:
+                    log.warning(f"Unknown message from worker {worker_id}: {msg[0]}")
+        except (EOFError, OSError) as e:
+            if worker_id is not None:
+                log.warning(f"Lost connection to worker {worker_id}: {e!r}")
+        except Exception:
+            log.warning(f"Dropping worker {worker_id}:\n{traceback.format_exc()}")
+        finally:
+            conn.close()
+            if worker_id is not None:
+                with self._lock:
+                    self._workers.discard(worker_id)
+                    for a in list(self._running.values()):
+                        if a.worker_id == worker_id:
+                            self._requeue(a, "disconnected")
+
+    def _next_job(self, worker_id: str) -> JobSpec | None:
+        with self._lock:
+            if not self._pending and not self._closed:
+                self._has_work.wait(self.poll_interval)
+            if not self._pending or self._closed:
+                return None
+            spec = self._pending.popleft()
+            self._attempts[spec.job_id] += 1
+            self._running[spec.job_id] = Assignment(spec, worker_id, time.monotonic())
+        log.info(f"Assigned job {spec.job.name} to worker {worker_id}")
+        return spec
+
+    def _heartbeat(self, worker_id: str, job_id: int) -> None:
+        with self._lock:
+            a = self._running.get(job_id)
+            if a is not None and a.worker_id == worker_id:
+                a.last_seen = time.monotonic()
+
+    def _requeue(self, a: Assignment, reason: str) -> None:
+        # called with the lock held
+        del self._running[a.spec.job_id]
+        job = a.spec.job
+        attempts = self._attempts[a.spec.job_id]
+        if attempts >= self.max_attempts:
+            log.warning(
+                f"Giving up on job {job.name} after {attempts} attempts, worker"
+                f" {a.worker_id} {reason}"
+            )
+            self._finish(
+                a.spec.job_id,
+                HLSJobResult(
+                    job=job,
+                    wd=self.job_dir(job),
+                    error=f"Job lost on {attempts} workers, last one {reason}",
+                ),
+            )
+            return
+        log.warning(f"Requeueing job {job.name}, worker {a.worker_id} {reason}")
+        self._pending.appendleft(a.spec)
+        self._has_work.notify()
+
+    def _complete(
+        self,
+        worker_id: str,
+        job_id: int,
+        result: HLSJobResult,
+        artifacts: dict[str, bytes],
+    ) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                log.info(f"Ignoring late result of job {job_id} from {worker_id}")
+                return
+            # a requeued job may come back from the worker that lost it first
+            self._running.pop(job_id, None)
+            self._pending = deque(s for s in self._pending if s.job_id != job_id)
+        wd = self.job_dir(job)
+        wd.mkdir(parents=True, exist_ok=True)
+        write_artifacts(wd, artifacts)
+        result.job = job
+        result.wd = wd
+        log.info(f"Job {job.name} finished on worker {worker_id}")
+        with self._lock:
+            self._finish(job_id, result)
+
+    def _finish(self, job_id: int, result: HLSJobResult) -> None:
+        # called with the lock held
+        if self._jobs.pop(job_id, None) is None:
+            return
+        del self._attempts[job_id]
+        self._results.put(result)
+
+
+class JobWorker:
+    """Pulls jobs from a ``JobServer`` and runs them one at a time.
+
+    Each job runs with ``run_job`` in ``work_dir / job.name`` after its
+    bundled files are written there.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        authkey: bytes,
+        work_dir: Path,
+        tool_path: Path | None = None,
+        worker_id: str | None = None,
+        heartbeat_interval: float = 5.0,
+    ) -> None:
+        self.address = address
+        self.authkey = authkey
+        self.work_dir = work_dir
+        self.tool_path = tool_path
+        self.worker_id = (
+            worker_id
+            if worker_id is not None
+            else f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.heartbeat_interval = heartbeat_interval
+        self._send_lock = threading.Lock()
+
+    def send(self, conn: Connection, msg: tuple) -> None:
+        # heartbeats are sent from another thread while a job runs
+        with self._send_lock:
+            conn.send(msg)
+
+    def serve(self) -> int:
+        """Run jobs until the server stops or goes away, return how many ran."""
+        n_jobs = 0
+        with Client(self.address, authkey=self.authkey) as conn:
+            try:
+                self.send(conn, ("hello", self.worker_id))
+                while True:
+                    self.send(conn, ("ready",))
+                    msg = conn.recv()
+                    if msg[0] == "stop":
+                        break
+                    if msg[0] == "idle":
+                        continue
+                    spec: JobSpec = msg[1]
+                    result, artifacts = self.run_spec(conn, spec)
+                    self.send(conn, ("done", spec.job_id, result, artifacts))
+                    n_jobs += 1
+            except (EOFError, OSError) as e:
+                log.info(f"Job server went away: {e!r}")
+        log.info(f"Worker {self.worker_id} exiting after {n_jobs} jobs")
+        return n_jobs
+
+    def run_spec(
+        self, conn: Connection, spec: JobSpec
+    ) -> tuple[HLSJobResult, dict[str, bytes]]:
+        wd = self.work_dir / spec.job.name
+        log.info(f"Running job {spec.job.name} in {wd}")
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(conn, spec.job_id, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            try:
+                wd.mkdir(parents=True, exist_ok=True)
+                for name, data in spec.bundle.items():
+                    (wd / name).write_bytes(data)
+            except OSError:
+                result = HLSJobResult(job=spec.job, wd=wd, error=traceback.format_exc())
+            else:
+                result = run_job(spec.job, wd, self.tool_path)
+        finally:
+            stop.set()
+            heartbeat.join()
+        return result, collect_artifacts(wd, spec.artifacts)
+
+    def _heartbeat_loop(
+        self, conn: Connection, job_id: int, stop: threading.Event
+    ) -> None:
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                self.send(conn, ("heartbeat", job_id))
+            except OSError:
+                return
+
+
+def run_worker(
+    address: tuple[str, int],
+    authkey: bytes,
+    work_dir: Path,
+    tool_path: Path | None = None,
+    worker_id: str | None = None,
+    heartbeat_interval: float = 5.0,
+) -> int:
+    worker = JobWorker(
+        address,
+        authkey,
+        work_dir,
+        tool_path=tool_path,
+        worker_id=worker_id,
+        heartbeat_interval=heartbeat_interval,
+    )
+    return worker.serve()
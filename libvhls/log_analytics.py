@@ -0,0 +1,168 @@
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.hls_logs import HLSLogIndex, LogSeverity
+
+log = logging.getLogger(__name__)
+
+SEVERITIES = list(LogSeverity)
+
+
+@dataclass
+class LogSummary:
+    path: str
+    severity_counts: list[int]
+    msg_id_counts: dict[str, int]
+    # phase -> (cpu_user, cpu_sys, elapsed), summed over repeated phases
+    runtimes: dict[str, tuple[float, float, float]]
+
+
+def summarize_log(path: Path) -> LogSummary:
+    """Summarize one log, as an empty row if it cannot be read."""
+    try:
+        return _summarize_log(path)
+    except (OSError, UnicodeDecodeError) as e:
+        # one unreadable log must not fail the whole table
+        log.debug(f"Could not summarize log {path}: {e}")
+        return LogSummary(
+            path=str(path),
+            severity_counts=[0] * len(SEVERITIES),
+            msg_id_counts={},
+            runtimes={},
+        )
+
+
+def _summarize_log(path: Path) -> LogSummary:
+    with HLSLogIndex.from_file(path) as index:
+        severity_counts = index.counts_by_severity()
+        runtimes: dict[str, tuple[float, float, float]] = {}
+        for r in index.runtimes:
+            user, sys, elapsed = runtimes.get(r.phase, (0.0, 0.0, 0.0))
+            runtimes[r.phase] = (
+                user + r.cpu_user,
+                sys + r.cpu_sys,
+                elapsed + r.elapsed,
+            )
+        return LogSummary(
+            path=str(path),
+            severity_counts=[severity_counts[s] for s in SEVERITIES],
+            msg_id_counts=index.counts_by_msg_id(),
+            runtimes=runtimes,
+        )
+
+
+@dataclass
+class LogTable:
+    """Columnar summary of many HLS logs, one row per run.
+
+    ``msg_id_counts[i, j]`` is the number of messages with ID ``msg_ids[j]`` in
+    run ``runs[i]``. The runtime arrays are indexed the same way by phase and
+    hold NaN where a run never reached a phase.
+    """
+
+    runs: np.ndarray
+    severities: np.ndarray
+    severity_counts: np.ndarray
+    msg_ids: np.ndarray
+    msg_id_counts: np.ndarray
+    phases: np.ndarray
+    cpu_user: np.ndarray
+    cpu_sys: np.ndarray
+    elapsed: np.ndarray
+
+    @classmethod
+    def from_summaries(cls, summaries: Iterable[LogSummary]) -> "LogTable":
+        runs: list[str] = []
+        severity_counts: list[list[int]] = []
+        msg_id_codes: dict[str, int] = {}
+        phase_codes: dict[str, int] = {}
+        # sparse (row, column, value) triples, densified once at the end
+        msg_rows, msg_cols, msg_vals = [], [], []
+        rt_rows, rt_cols, rt_vals = [], [], []
+
+        for row, summary in enumerate(summaries):
+            runs.append(summary.path)
+            severity_counts.append(summary.severity_counts)
+            for msg_id, count in summary.msg_id_counts.items():
+                msg_rows.append(row)
+                msg_cols.append(msg_id_codes.setdefault(msg_id, len(msg_id_codes)))
+                msg_vals.append(count)
+            for phase, times in summary.runtimes.items():
+                rt_rows.append(row)
+                rt_cols.append(phase_codes.setdefault(phase, len(phase_codes)))
+                rt_vals.append(times)
+
+        n_runs = len(runs)
+        msg_id_counts = np.zeros((n_runs, len(msg_id_codes)), dtype=np.int32)
+        msg_id_counts[msg_rows, msg_cols] = msg_vals
+
+        runtimes = np.full((3, n_runs, len(phase_codes)), np.nan, dtype=np.float64)
+        if rt_vals:
+            runtimes[:, rt_rows, rt_cols] = np.asarray(rt_vals, dtype=np.float64).T
+
+        return cls(
+            runs=np.array(runs, dtype=str),
+            severities=np.array([s.value for s in SEVERITIES], dtype=str),
+            severity_counts=np.array(severity_counts, dtype=np.int32).reshape(
+                n_runs, len(SEVERITIES)
+            ),
+            msg_ids=np.array(list(msg_id_codes), dtype=str),
+            msg_id_counts=msg_id_counts,
+            phases=np.array(list(phase_codes), dtype=str),
+            cpu_user=runtimes[0],
+            cpu_sys=runtimes[1],
+            elapsed=runtimes[2],
+        )
+
+    def msg_id_column(self, msg_id: str) -> np.ndarray:
+        matches = np.flatnonzero(self.msg_ids == msg_id)
+        if len(matches) == 0:
+            return np.zeros(len(self.runs), dtype=np.int32)
+        return self.msg_id_counts[:, matches[0]]
+
+    def phase_column(self, phase: str, field: str = "elapsed") -> np.ndarray:
+        matches = np.flatnonzero(self.phases == phase)
+        if len(matches) == 0:
+            return np.full(len(self.runs), np.nan)
+        column: np.ndarray = getattr(self, field)[:, matches[0]]
+        return column
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(path, **self.__dict__)
+
+    @classmethod
+    def load(cls, path: Path) -> "LogTable":
+        with np.load(path) as data:
+            return cls(**{k: data[k] for k in data.files})
+
+
+def analyze_logs(
+    paths: Iterable[Path],
+    n_workers: int | None = None,
+    chunksize: int = 16,
+) -> LogTable:
+    paths = list(paths)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    log.info(f"Analyzing {len(paths)} logs with {n_workers} workers")
+    if n_workers == 1:
+        return LogTable.from_summaries(map(summarize_log, paths))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return LogTable.from_summaries(
+            pool.map(summarize_log, paths, chunksize=chunksize)
+        )
+
+
+def analyze_log_tree(
+    root: Path,
+    pattern: str = "vitis_hls.log",
+    n_workers: int | None = None,
+    chunksize: int = 16,
+) -> LogTable:
+    return analyze_logs(sorted(root.rglob(pattern)), n_workers, chunksize)
@@ -0,0 +1,184 @@
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from libvhls.hls_logs import HLSLogStream, LogMessage
+from libvhls.synth_report import SynthesisReport
+
+log = logging.getLogger(__name__)
+
+# A constraint returns the reason to abort the run, or None if it is satisfied.
+LogConstraint = Callable[[LogMessage], str | None]
+ReportConstraint = Callable[[str, SynthesisReport], str | None]
+
+
+@dataclass
+class MaxLatency:
+    """Worst case latency limit in cycles, for ``module`` or for any module."""
+
+    max_cycles: int
+    module: str | None = None
+
+    def __call__(self, module: str, report: SynthesisReport) -> str | None:
+        if self.module is not None and module != self.module:
+            return None
+        latency = report.top_level_latency_data.worst_case_latency_c
+        if latency is None or latency <= self.max_cycles:
+            return None
+        return (
+            f"Module {module} has a worst case latency of {latency} cycles, over"
+            f" the limit of {self.max_cycles}"
+        )
+
+
+@dataclass
+class MaxResource:
+    """Limit on the used count of one resource type, e.g. ``"DSP"``.
+
+    Without ``module`` any module over the limit aborts the run, since the
+    top module uses at least as much as each of its submodules.
+    """
+
+    resource: str
+    limit: int
+    module: str | None = None
+
+    def __call__(self, module: str, report: SynthesisReport) -> str | None:
+        if self.module is not None and module != self.module:
+            return None
+        used = report.top_level_resource_data.used_abs.get(self.resource)
+        if used is None or used <= self.limit:
+            return None
+        return (
+            f"Module {module} uses {used} {self.resource}, over the limit of"
+            f" {self.limit}"
+        )
+
+
+@dataclass
+class LogMatch:
+    """Aborts on a log message with ``msg_id`` whose text matches ``pattern``."""
+
+    pattern: str = ""
+    msg_id: str | None = None
+
+    def __post_init__(self) -> None:
+        self._re = re.compile(self.pattern)
+
+    def __call__(self, message: LogMessage) -> str | None:
+        if self.msg_id is not None and message.msg_id != self.msg_id:
+            return None
+        if self._re.search(message.text) is None:
+            return None
+        msg_id = f" [{message.msg_id}]" if message.msg_id is not None else ""
+        return f"Log message{msg_id}: {message.text}"
+
+
+@dataclass
+class QoRMonitor:
+    """Constraints checked while a run is in progress.
+
+    Log constraints see each new message of the tool log, report constraints
+    each per-module synthesis report (``<module>_csynth.xml``) written during
+    the run, together with the module name. The first violated constraint
+    aborts the run with ``RunnerStatus.ABORTED`` and its reason. Pass monitors
+    to ``Runner`` or ``VitisHLS``::
+
+        monitor = QoRMonitor(
+            report_constraints=[MaxLatency(10_000), MaxResource("DSP", 6840)],
+            log_constraints=[LogMatch("Unable to schedule", msg_id="HLS 200-885")],
+        )
+        VitisHLS(wd=wd, monitors=[monitor]).run(commands)
+
+    Constraints are called in the process running the tool, so they should be
+    picklable to be used with ``HLSExecutor`` or the job server.
+    """
+
+    log_constraints: Sequence[LogConstraint] = field(default_factory=list)
+    report_constraints: Sequence[ReportConstraint] = field(default_factory=list)
+    # relative to the working dir
+    report_glob: str = "*/*/syn/report/*_csynth.xml"
+
+    def watch(self, log_path: Path, wd: Path, log_offset: int = 0) -> "QoRWatch":
+        return QoRWatch(self, log_path, wd, log_offset)
+
+
+def stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class QoRWatch:
+    """The state of a ``QoRMonitor`` for one run, created before the tool starts.
+
+    Logs and reports left over from earlier runs in the same working dir are
+    skipped until the tool rewrites them. A log shared with earlier runs, like
+    the one of a session, is followed from ``log_offset``.
+    """
+
+    def __init__(
+        self, monitor: QoRMonitor, log_path: Path, wd: Path, log_offset: int = 0
+    ) -> None:
+        self.monitor = monitor
+        self.log_path = log_path
+        self.wd = wd
+        self.stream = HLSLogStream(keep_records=False, offset=log_offset)
+        self.reports: dict[str, SynthesisReport] = {}
+        self._old_log = stat_key(log_path)
+        self._seen = {fp: stat_key(fp) for fp in wd.glob(monitor.report_glob)}
+
+    def poll(self) -> str | None:
+        if len(self.monitor.log_constraints) > 0:
+            reason = self.poll_log()
+            if reason is not None:
+                return reason
+        if len(self.monitor.report_constraints) > 0:
+            return self.poll_reports()
+        return None
+
+    def poll_log(self) -> str | None:
+        key = stat_key(self.log_path)
+        if key is None or key == self._old_log:
+            return None
+        self._old_log = None
+        if key[2] < self.stream.offset:
+            # the log was truncated and is being written again
+            self.stream = HLSLogStream(keep_records=False)
+        for message in self.stream.follow(self.log_path):
+            for constraint in self.monitor.log_constraints:
+                reason = constraint(message)
+                if reason is not None:
+                    return reason
+        return None
+
+    def poll_reports(self) -> str | None:
+        for fp in sorted(self.wd.glob(self.monitor.report_glob)):
+            key = stat_key(fp)
+            if key is None or self._seen.get(fp) == key:
+                continue
+            try:
+                report = SynthesisReport.parse_from_disk(fp)
+            except (OSError, ET.ParseError):
+                # most likely still being written, retry on the next poll
+                continue
+            except (ValueError, AttributeError) as e:
+                # well-formed but not parseable, e.g. with an undefined latency
+                self._seen[fp] = key
+                log.warning(f"Not checking report {fp}: {e}")
+                continue
+            self._seen[fp] = key
+            module = fp.name.removesuffix("_csynth.xml")
+            self.reports[module] = report
+            log.debug(f"Checking report of module {module}")
+            for constraint in self.monitor.report_constraints:
+                reason = constraint(module, report)
+                if reason is not None:
+                    return reason
+        return None
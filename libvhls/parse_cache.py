@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+from libvhls.utils import CacheUsage, atomic_write_bytes, default_cache_dir
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ParseCache:
+    """On-disk cache of objects parsed from files, stored as pickles.
+
+    A lookup first tries a key built from the file's path, mtime and size,
+    which needs only a ``stat``. On a miss the file is hashed and the parsed
+    object is looked up by content, so copied or touched files still hit.
+    Objects are namespaced by the parse function, so different parsers of the
+    same file never collide. The least recently used objects are evicted once
+    the cache grows beyond ``max_bytes``, down to 90% of it; like in
+    ``ResultCache`` the size is tracked so only inserts over the budget scan.
+    """
+
+    VERSION = 2
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int = 1024**3) -> None:
+        if cache_dir is None:
+            cache_dir = default_cache_dir() / "parsed"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        self.stat_dir = self.cache_dir / "stat"
+        self.objects_dir = self.cache_dir / "objects"
+        self.usage = CacheUsage(self.cache_dir / "usage")
+        self.stat_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def namespace(parse_fn: Callable) -> str:
+        qualname = getattr(parse_fn, "__qualname__", type(parse_fn).__qualname__)
+        return f"{parse_fn.__module__}.{qualname}"
+
+    def _digest(self, namespace: str, data: bytes) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"libvhls-parse-cache-v{self.VERSION}\n{namespace}\n".encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def stat_key(self, path: Path, namespace: str) -> str:
+        st = os.stat(path)
+        stat_id = f"{os.path.realpath(path)}\n{st.st_mtime_ns}\n{st.st_size}"
+        return self._digest(namespace, stat_id.encode())
+
+    def content_key(self, path: Path, namespace: str) -> str:
+        return self._digest(namespace, path.read_bytes())
+
+    def object_path(self, content_key: str) -> Path:
+        return self.objects_dir / content_key[:2] / f"{content_key}.pkl"
+
+    def _read_object(self, content_key: str) -> object | None:
+        object_fp = self.object_path(content_key)
+        try:
+            obj: object = pickle.loads(object_fp.read_bytes())
+            os.utime(object_fp)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Discarding unreadable parse cache entry {object_fp}: {e}")
+            object_fp.unlink(missing_ok=True)
+            return None
+        return obj
+
+    def load(self, path: Path, parse_fn: Callable[[Path], T]) -> T:
+        namespace = self.namespace(parse_fn)
+        stat_fp = self.stat_dir / self.stat_key(path, namespace)
+        try:
+            content_key = stat_fp.read_text()
+            obj = self._read_object(content_key)
+            if obj is not None:
+                return obj  # type: ignore[return-value]
+        except FileNotFoundError:
+            pass
+
+        content_key = self.content_key(path, namespace)
+        obj = self._read_object(content_key)
+        if obj is None:
+            obj = parse_fn(path)
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            atomic_write_bytes(self.object_path(content_key), data)
+            total = self.usage.add(len(data))
+            if total is None or total > self.max_bytes:
+                self.evict()
+        atomic_write_bytes(stat_fp, content_key.encode())
+        return obj  # type: ignore[return-value]
+
+    def evict(self) -> None:
+        """Scan the cache and drop the least recently used objects over budget."""
+        with self.usage.locked():
+            entries = []
+            total = 0
+            for object_fp in self.objects_dir.glob("*/*.pkl"):
+                try:
+                    st = object_fp.stat()
+                except FileNotFoundError:
+                    continue
+                total += st.st_size
+                entries.append((st.st_mtime, st.st_size, object_fp))
+            if total <= self.max_bytes:
+                self.usage.write(total)
+                return
+
+            entries.sort()
+            for _, size, object_fp in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                object_fp.unlink(missing_ok=True)
+                total -= size
+            self.usage.write(total)
+        # stat keys pointing at evicted objects are cheap misses, but drop
+        # them all so the directory does not grow without bound
+        doomed = self.cache_dir / f"stat.evict.{uuid.uuid4().hex}"
+        try:
+            os.rename(self.stat_dir, doomed)
+        except OSError:
+            return
+        self.stat_dir.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(doomed, ignore_errors=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.stat_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from pathlib import Path
+
+from libvhls.cache import ResultCache, hash_file
+from libvhls.commands.commands import Command, RunnerResult, RunnerStatus
+from libvhls.utils import atomic_write_bytes
+from libvhls.vitis_hls import VitisHLS
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineStep:
+    """One step of a ``Pipeline``, run as a single tool launch.
+
+    ``inputs`` are the files the step reads, ``deps`` the names of upstream
+    steps and ``outputs`` glob patterns, relative to the working dir, for the
+    files the step produces. Downstream steps are invalidated only when these
+    outputs change.
+    """
+
+    name: str
+    commands: Sequence[Command]
+    inputs: Sequence[Path] = field(default_factory=list)
+    deps: Sequence[str] = field(default_factory=list)
+    outputs: Sequence[str] = field(default_factory=list)
+
+
+class StepStatus(Enum):
+    RAN = auto()
+    UP_TO_DATE = auto()
+    FAILED = auto()
+    BLOCKED = auto()
+
+
+@dataclass
+class StepResult:
+    step: PipelineStep
+    status: StepStatus
+    result: RunnerResult | None = None
+
+
+class Pipeline:
+    """Runs a DAG of HLS steps, skipping steps whose inputs are unchanged.
+
+    A step's fingerprint covers the composed Tcl of ``setup`` plus its own
+    commands, the contents of its input files and the output digests of its
+    upstream steps. Files added by the step's own ``add_files`` and the design
+    sources added in ``setup`` are inputs of the step automatically, while
+    testbench files added in ``setup`` only count for steps listing them.
+    Fingerprints and output digests of successful steps are kept in a state
+    file in the working dir, and a step only runs again when its fingerprint
+    changes or its outputs are gone. ``setup`` runs before every step and
+    should open the project and solution without resetting them, for
+    example::
+
+        setup = [OpenProject("prj"), AddFiles(...), OpenSolution("sol"), ...]
+        steps = [
+            PipelineStep("csim", [CsimDesign()], inputs=[src, tb]),
+            PipelineStep(
+                "csynth",
+                [CsynthDesign()],
+                inputs=[src],
+                outputs=["prj/sol/syn/verilog/*", "prj/sol/syn/report/*.xml"],
+            ),
+            PipelineStep("cosim", [CosimDesign()], inputs=[tb], deps=["csynth"]),
+            PipelineStep("export", [UserTCL("export_design ...")], deps=["csynth"]),
+        ]
+    """
+
+    STATE_DIR_NAME = ".libvhls_pipeline"
+    VERSION = 1
+
+    def __init__(
+        self,
+        vhls: VitisHLS,
+        setup: Sequence[Command],
+        steps: Sequence[PipelineStep],
+        name: str = "pipeline",
+    ) -> None:
+        self.vhls = vhls
+        self.setup = setup
+        self.steps = {s.name: s for s in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("Pipeline step names must be unique")
+        for s in steps:
+            for dep in s.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"Step {s.name} depends on unknown step {dep}")
+        self.order = self.topological_order(steps)
+        self.state_path = vhls.wd / self.STATE_DIR_NAME / f"{name}.json"
+
+    @staticmethod
+    def topological_order(steps: Sequence[PipelineStep]) -> list[str]:
+        remaining = {s.name: set(s.deps) for s in steps}
+        order: list[str] = []
+        while remaining:
+            # keep the given order among steps that are ready at the same time
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a cycle among {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def load_state(self) -> dict[str, dict[str, str]]:
+        try:
+            data = json.loads(self.state_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        steps: dict[str, dict[str, str]] = data["steps"]
+        return steps
+
+    def save_state(self, state: dict[str, dict[str, str]]) -> None:
+        data = {"version": self.VERSION, "steps": state}
+        atomic_write_bytes(self.state_path, json.dumps(data, indent=2).encode())
+
+    def output_files(self, step: PipelineStep) -> list[Path]:
+        files: set[Path] = set()
+        for pattern in step.outputs:
+            files.update(p for p in self.vhls.wd.glob(pattern) if p.is_file())
+        return sorted(files)
+
+    def output_digest(self, step: PipelineStep, fingerprint: str) -> str | None:
+        if len(step.outputs) == 0:
+            # without declared outputs, any rerun invalidates downstream steps
+            return fingerprint
+        files = self.output_files(step)
+        if len(files) == 0:
+            return None
+        h = hashlib.sha256()
+        for fp in files:
+            rel_path = fp.relative_to(self.vhls.wd)
+            h.update(f"{rel_path} {hash_file(fp)}\n".encode())
+        return h.hexdigest()
+
+    def input_files(self, step: PipelineStep) -> list[Path]:
+        # only some steps read the testbench, so those must be listed per step
+        design = [c for c in self.setup if not getattr(c, "tb", False)]
+        added = ResultCache.input_files(self.vhls.runner, [*design, *step.commands])
+        files = [fp if fp.is_absolute() else self.vhls.wd / fp for fp in step.inputs]
+        return list(dict.fromkeys([*files, *added]))
+
+    def fingerprint(self, step: PipelineStep, upstream: dict[str, str]) -> str:
+        h = hashlib.sha256()
+        h.update(f"libvhls-pipeline-v{self.VERSION}\n".encode())
+        h.update(f"dist {self.vhls.dist.fingerprint}\n".encode())
+        h.update(self.vhls.runner.build_script([*self.setup, *step.commands]).encode())
+        for fp in self.input_files(step):
+            digest = hash_file(fp) if fp.is_file() else "missing"
+            h.update(f"\ninput {fp} {digest}".encode())
+        for dep in sorted(step.deps):
+            h.update(f"\ndep {dep} {upstream[dep]}".encode())
+        return h.hexdigest()
+
+    def is_up_to_date(
+        self, step: PipelineStep, fingerprint: str, recorded: dict[str, str] | None
+    ) -> bool:
+        if recorded is None or recorded["fingerprint"] != fingerprint:
+            return False
+        return self.output_digest(step, fingerprint) == recorded["outputs"]
+
+    def run(self, force: Iterable[str] = ()) -> list[StepResult]:
+        force = set(force)
+        state = self.load_state()
+        upstream: dict[str, str] = {}
+        results: list[StepResult] = []
+        blocked: set[str] = set()
+
+        for name in self.order:
+            step = self.steps[name]
+            if blocked.intersection(step.deps):
+                blocked.add(name)
+                results.append(StepResult(step, StepStatus.BLOCKED))
+                continue
+
+            fingerprint = self.fingerprint(step, upstream)
+            recorded = state.get(name)
+            if name not in force and self.is_up_to_date(step, fingerprint, recorded):
+                assert recorded is not None
+                log.info(f"Step {name} is up to date")
+                upstream[name] = recorded["outputs"]
+                results.append(StepResult(step, StepStatus.UP_TO_DATE))
+                continue
+
+            log.info(f"Running step {name}")
+            state.pop(name, None)
+            result = self.vhls.run([*self.setup, *step.commands])
+            outputs = None
+            if result.status == RunnerStatus.SUCCESS:
+                outputs = self.output_digest(step, fingerprint)
+                if outputs is None:
+                    log.warning(f"Step {name} produced none of its outputs")
+            if outputs is None:
+                blocked.add(name)
+                results.append(StepResult(step, StepStatus.FAILED, result))
+            else:
+                upstream[name] = outputs
+                state[name] = {"fingerprint": fingerprint, "outputs": outputs}
+                results.append(StepResult(step, StepStatus.RAN, result))
+            self.save_state(state)
+
+        return results
@@ -1,8 +1,43 @@
+import copy
+import fcntl
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from libvhls.utils import unwrap
+from libvhls.parse_cache import ParseCache
+from libvhls.utils import atomic_write_bytes, unwrap
+
+HLS_APP_NAMESPACE = "com.autoesl.autopilot.project"
+SOLUTION_NAMESPACE = "com.autoesl.autopilot.solution"
+
+
+def write_xml(tree: "ET.ElementTree[ET.Element]", path: Path, namespace: str) -> None:
+    # hls.app and the solution files use the AutoPilot prefix for different
+    # namespaces. ET's prefix registry is global to the process and files are
+    # written from several threads, so the prefix is written out by hand on a
+    # copy of the tree instead.
+    root = copy.deepcopy(unwrap(tree.getroot(), f"{path} has no root element"))
+    qualified = f"{{{namespace}}}"
+    for element in root.iter():
+        if element.tag.startswith(qualified):
+            element.tag = "AutoPilot:" + element.tag.removeprefix(qualified)
+        for key in [k for k in element.attrib if k.startswith(qualified)]:
+            value = element.attrib.pop(key)
+            element.attrib["AutoPilot:" + key.removeprefix(qualified)] = value
+    root.attrib = {"xmlns:AutoPilot": namespace, **root.attrib}
+    atomic_write_bytes(path, ET.tostring(root, encoding="UTF-8", xml_declaration=True))
+
+
+@contextmanager
+def project_lock(project_dir: Path) -> Iterator[None]:
+    with open(project_dir / ".libvhls.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
 
 
 @dataclass
@@ -24,7 +59,9 @@ class HLSApp:
     solutions: list
 
     @classmethod
-    def parse_from_disk(cls, path: Path) -> "HLSApp":
+    def parse_from_disk(cls, path: Path, cache: ParseCache | None = None) -> "HLSApp":
+        if cache is not None:
+            return cache.load(path, cls.parse_from_disk)
         root = ET.fromstring(path.read_text())
         project_type = str(root.get("projectType"))
         top = str(root.get("top"))
@@ -62,6 +99,101 @@ class HLSApp:
     def __repr__(self):
         return f"{self.__class__.__name__}({self.__dict__})"
 
+    def write_to_disk(self, path: Path) -> None:
+        """Write this model into the ``hls.app`` at ``path``.
+
+        Attributes and elements the model does not cover are kept as they are.
+        """
+        tree = ET.parse(path)
+        root = tree.getroot()
+        root.set("projectType", self.project_type)
+        root.set("top", self.top)
+        root.set("name", self.name)
+
+        files = root.find("files")
+        if files is None:
+            files = ET.SubElement(root, "files")
+        for file in files.findall("file"):
+            files.remove(file)
+        for f in self.files:
+            ET.SubElement(
+                files,
+                "file",
+                name=f.name,
+                sc=f.sc,
+                tb=f.tb,
+                cflags=f.cflags,
+                csimflags=f.csimflags,
+                blackbox=f.blackbox,
+            )
+
+        solutions = root.find("solutions")
+        if solutions is None:
+            solutions = ET.SubElement(root, "solutions")
+        for solution in solutions.findall("solution"):
+            solutions.remove(solution)
+        for solution in self.solutions:
+            ET.SubElement(
+                solutions,
+                "solution",
+                name=str(solution["name"]),
+                status=str(solution["status"] or ""),
+            )
+        write_xml(tree, path, HLS_APP_NAMESPACE)
+
+
+@dataclass
+class Clock:
+    name: str
+    period: str
+
+
+@dataclass
+class SolutionSettings:
+    """The part and clocks of a solution, from its ``<solution>.aps`` file."""
+
+    part: str | None = None
+    clocks: list[Clock] = field(default_factory=list)
+
+    @classmethod
+    def parse_from_disk(cls, path: Path) -> "SolutionSettings":
+        root = ET.fromstring(path.read_text())
+        target = root.find("targetInfo/TargetInfo")
+        part = target.get("value") if target is not None else None
+        clocks = [
+            Clock(name=str(c.get("name")), period=str(c.get("period")))
+            for c in root.findall("clockList/clock")
+        ]
+        return cls(part=part, clocks=clocks)
+
+    def write_to_disk(self, path: Path) -> None:
+        """Write the part and clocks into the ``.aps`` file at ``path``."""
+        tree = ET.parse(path)
+        root = tree.getroot()
+        if self.part is not None:
+            target_info = root.find("targetInfo")
+            if target_info is None:
+                target_info = ET.SubElement(root, "targetInfo")
+            target = target_info.find("TargetInfo")
+            if target is None:
+                target = ET.SubElement(target_info, "TargetInfo")
+            target.set("value", self.part)
+
+        clock_list = root.find("clockList")
+        if clock_list is None:
+            clock_list = ET.SubElement(root, "clockList")
+        old = {c.get("name"): c for c in clock_list.findall("clock")}
+        for c in old.values():
+            clock_list.remove(c)
+        for clock in self.clocks:
+            element = old.get(clock.name)
+            if element is None:
+                element = ET.Element("clock", default="false")
+            element.set("name", clock.name)
+            element.set("period", clock.period)
+            clock_list.append(element)
+        write_xml(tree, path, SOLUTION_NAMESPACE)
+
 
 @dataclass
 class Project:
@@ -69,9 +201,50 @@ class Project:
     hls_app: HLSApp
 
     @classmethod
-    def parse_from_disk(cls, path: Path) -> "Project":
+    def parse_from_disk(cls, path: Path, cache: ParseCache | None = None) -> "Project":
         hls_app_fp = path / "hls.app"
         if not hls_app_fp.exists():
             raise Exception(f"Could not find hls.app in {path}")
-        hls_app = HLSApp.parse_from_disk(hls_app_fp)
+        hls_app = HLSApp.parse_from_disk(hls_app_fp, cache=cache)
         return cls(dir=path, hls_app=hls_app)
+
+    def solution_dirs(self) -> list[Path]:
+        return sorted(
+            d
+            for d in self.dir.iterdir()
+            if d.is_dir() and (d / f"{d.name}.aps").exists()
+        )
+
+    def solution_settings_path(self, solution: str) -> Path:
+        return self.dir / solution / f"{solution}.aps"
+
+    def solution_settings(self, solution: str) -> SolutionSettings:
+        return SolutionSettings.parse_from_disk(self.solution_settings_path(solution))
+
+    def sync_solutions(self) -> list[str]:
+        """Add solutions found on disk but missing from ``hls.app``.
+
+        When several processes synthesize solutions of the same project at
+        the same time, each one rewrites ``hls.app`` with only the solutions
+        it knows about. This restores the dropped entries under a file lock.
+        """
+        hls_app_fp = self.dir / "hls.app"
+        added: list[str] = []
+        with project_lock(self.dir):
+            tree = ET.parse(hls_app_fp)
+            root = tree.getroot()
+            solutions = root.find("solutions")
+            if solutions is None:
+                solutions = ET.SubElement(root, "solutions")
+            known = {s.get("name") for s in solutions.findall("solution")}
+            for solution_dir in self.solution_dirs():
+                if solution_dir.name not in known:
+                    ET.SubElement(
+                        solutions, "solution", name=solution_dir.name, status=""
+                    )
+                    added.append(solution_dir.name)
+
+            if added:
+                write_xml(tree, hls_app_fp, HLS_APP_NAMESPACE)
+                self.hls_app = HLSApp.parse_from_disk(hls_app_fp)
+        return added
@@ -0,0 +1,200 @@
+import fcntl
+import logging
+import os
+import shutil
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from libvhls.commands.commands import Command, RunnerStatus
+from libvhls.project import Clock, Project, ProjectFiles
+from libvhls.vitis_hls import VitisHLS
+
+log = logging.getLogger(__name__)
+
+# linux/fs.h
+FICLONE = 0x40049409
+
+# Settings files patched per clone and files the tool appends to, which are
+# always copied even when the others are hardlinked.
+PRIVATE_SUFFIXES = {".app", ".aps", ".tcl", ".log", ".directive", ".cfg"}
+SKIPPED_NAMES = {".libvhls.lock"}
+
+
+def reflink(src: Path, dst: Path) -> None:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+def clone_file(src: Path, dst: Path, link: str) -> str:
+    """Clone ``src`` to ``dst`` and return how it was done.
+
+    ``link`` is ``"auto"`` or ``"reflink"``, which reflink the file and fall
+    back to a copy, ``"hardlink"``, which falls back to a copy as well, or
+    ``"copy"``. Hardlinks are never chosen automatically: the tool may rewrite
+    a file in place, which would change it in the template and every clone.
+    """
+    if link in ("auto", "reflink"):
+        try:
+            reflink(src, dst)
+            return "reflink"
+        except OSError:
+            pass
+    if link == "hardlink":
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+@dataclass
+class ProjectVariant:
+    """Settings of a cloned project that differ from its template.
+
+    ``files`` replaces the project's source and testbench files. The part and
+    clock apply to every solution of the project; ``clock_period`` is in ns
+    like ``CreateClock`` and sets the first clock, or ``clock_name``.
+    """
+
+    top: str | None = None
+    files: Sequence[ProjectFiles] | None = None
+    part: str | None = None
+    clock_period: str | None = None
+    clock_name: str | None = None
+
+
+class ProjectTemplate:
+    """A project skeleton created once and cloned per design variant.
+
+    Cloning shares the files of the template through reflinks where the file
+    system supports them and copies them otherwise. The project and solution
+    settings files are always copied and then patched with the variant's top,
+    files, part and clock. A variant's setup is then a file system operation
+    instead of a tool launch::
+
+        template = ProjectTemplate.build(
+            VitisHLS(wd=template_dir),
+            [
+                OpenProject("prj", reset=True),
+                AddFiles([Path("mm.cpp")]),
+                OpenSolution("sol", flow_target="vitis", reset=True),
+                SetPart("xcvu9p-flgb2104-2-i"),
+                CreateClock("clk", "3.33"),
+                SetTop("blockmatmul"),
+            ],
+        )
+        template.clone(job_dir / "prj", ProjectVariant(clock_period="5.0"))
+        VitisHLS(wd=job_dir).run(
+            [OpenProject("prj"), OpenSolution("sol"), CsynthDesign()]
+        )
+
+    File paths in ``hls.app`` are relative to the project dir, so clones
+    should sit at the same depth relative to the sources as the template, or
+    set ``files`` in the variant. ``clone(..., link="hardlink")`` shares files
+    through hardlinks instead, which works without reflink support but is only
+    safe if the tool never writes to the shared files in the clones.
+    """
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project = Project.parse_from_disk(project_dir)
+
+    @property
+    def dir(self) -> Path:
+        return self.project.dir
+
+    @classmethod
+    def build(cls, vhls: VitisHLS, commands: Sequence[Command]) -> "ProjectTemplate":
+        """Create the template by running ``commands``, which open one project."""
+        project_names = [
+            getattr(cmd, "project_name")
+            for cmd in commands
+            if cmd.command_str == "open_project"
+        ]
+        if len(set(project_names)) != 1:
+            raise ValueError("Template commands must open exactly one project")
+        result = vhls.run(commands)
+        if result.status != RunnerStatus.SUCCESS:
+            raise RuntimeError(
+                f"Building the project template failed with status"
+                f" {result.status.name}, see {result.log_path}"
+            )
+        return cls(vhls.wd / project_names[0])
+
+    def clone(
+        self,
+        dest: Path,
+        variant: ProjectVariant | None = None,
+        link: str = "auto",
+    ) -> Project:
+        """Clone the template to the project dir ``dest`` and apply ``variant``.
+
+        The project is named after ``dest``. Existing files in ``dest`` are
+        replaced.
+        """
+        variant = variant if variant is not None else ProjectVariant()
+        if dest.exists():
+            shutil.rmtree(dest)
+        counts = {"reflink": 0, "hardlink": 0, "copy": 0}
+        for root, dirs, files in os.walk(self.dir):
+            rel_root = Path(root).relative_to(self.dir)
+            (dest / rel_root).mkdir(parents=True, exist_ok=True)
+            for name in files:
+                if name in SKIPPED_NAMES:
+                    continue
+                src = Path(root) / name
+                dst = dest / rel_root / name
+                if src.is_symlink():
+                    os.symlink(os.readlink(src), dst)
+                    continue
+                if src.suffix in PRIVATE_SUFFIXES:
+                    shutil.copy2(src, dst)
+                    counts["copy"] += 1
+                else:
+                    counts[clone_file(src, dst, link)] += 1
+        log.info(f"Cloned {self.dir} to {dest}: {counts}")
+
+        project = Project.parse_from_disk(dest)
+        hls_app = replace(project.hls_app, name=dest.name)
+        if variant.top is not None:
+            hls_app.top = variant.top
+        if variant.files is not None:
+            hls_app.files = list(variant.files)
+        hls_app.write_to_disk(dest / "hls.app")
+        project.hls_app = hls_app
+
+        for solution_dir in project.solution_dirs():
+            self.patch_solution(project, solution_dir.name, variant)
+        return project
+
+    @staticmethod
+    def patch_solution(
+        project: Project, solution: str, variant: ProjectVariant
+    ) -> None:
+        if variant.part is None and variant.clock_period is None:
+            return
+        settings = project.solution_settings(solution)
+        if variant.part is not None:
+            settings.part = variant.part
+        if variant.clock_period is not None:
+            clock = next(
+                (
+                    c
+                    for c in settings.clocks
+                    if variant.clock_name is None or c.name == variant.clock_name
+                ),
+                None,
+            )
+            if clock is None:
+                clock = Clock(name=variant.clock_name or "default", period="")
+                settings.clocks.append(clock)
+            clock.period = variant.clock_period
+        settings.write_to_disk(project.solution_settings_path(solution))
@@ -0,0 +1,154 @@
+import json
+import logging
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from libvhls.commands.commands import Command, RunnerResult
+from libvhls.commands.commands_libvhls import QUERY_MARKER, Query
+from libvhls.vitis_hls import VitisHLS
+
+log = logging.getLogger(__name__)
+
+RE_QUERY_MARKER = re.compile(
+    rf"^{QUERY_MARKER} (\S+) (-?\d+) ([0-9a-fA-F]*)[ \t]*\r?$", re.MULTILINE
+)
+
+
+def split_tcl_list(value: str) -> list[str]:
+    items: list[str] = []
+    i = 0
+    n = len(value)
+    while True:
+        while i < n and value[i].isspace():
+            i += 1
+        if i >= n:
+            return items
+        if value[i] == "{":
+            depth = 1
+            start = i + 1
+            i += 1
+            while i < n and depth > 0:
+                if value[i] == "\\":
+                    i += 1
+                elif value[i] == "{":
+                    depth += 1
+                elif value[i] == "}":
+                    depth -= 1
+                i += 1
+            items.append(value[start : i - 1])
+        else:
+            quoted = value[i] == '"'
+            if quoted:
+                i += 1
+            item = []
+            while i < n:
+                ch = value[i]
+                if ch == "\\" and i + 1 < n:
+                    item.append(value[i + 1])
+                    i += 2
+                    continue
+                if (quoted and ch == '"') or (not quoted and ch.isspace()):
+                    break
+                item.append(ch)
+                i += 1
+            if quoted:
+                i += 1
+            items.append("".join(item))
+
+
+def parse_number(command: Command, value: str) -> float | str:
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_list(command: Command, value: str) -> list[str]:
+    return split_tcl_list(value)
+
+
+def parse_project(command: Command, value: str) -> list[str] | str:
+    if getattr(command, "solutions", False):
+        return split_tcl_list(value)
+    return value
+
+
+def parse_solution(command: Command, value: str) -> Any:
+    if getattr(command, "json", False):
+        return json.loads(value)
+    return value
+
+
+# command_str -> converter from the command's Tcl result to a Python value,
+# commands without an entry return the raw string
+QUERY_PARSERS: dict[str, Callable[[Command, str], Any]] = {
+    "get_clock_period": parse_number,
+    "get_clock_uncertainty": parse_number,
+    "get_files": parse_list,
+    "get_project": parse_project,
+    "get_solution": parse_solution,
+}
+
+
+@dataclass
+class QueryResult:
+    command: Command
+    value: Any = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def query_commands(queries: Sequence[Command]) -> list[Query]:
+    return [Query(f"q{i}", cmd) for i, cmd in enumerate(queries)]
+
+
+def parse_query_output(
+    queries: Sequence[Command], result: RunnerResult
+) -> list[QueryResult]:
+    raw: dict[str, tuple[int, str]] = {}
+    # the markers are printed to stdout and copied to the log, read both in
+    # case one of them was not captured
+    for text in (result.log, result.stdout):
+        for m in RE_QUERY_MARKER.finditer(text):
+            key, rc, hex_value = m.groups()
+            raw.setdefault(key, (int(rc), bytes.fromhex(hex_value).decode()))
+
+    query_results = []
+    for q in query_commands(queries):
+        if q.key not in raw:
+            query_results.append(
+                QueryResult(q.command, error="Query did not run, see the tool log")
+            )
+            continue
+        rc, value = raw[q.key]
+        if rc != 0:
+            query_results.append(QueryResult(q.command, error=value))
+            continue
+        parser = QUERY_PARSERS.get(q.command.command_str)
+        try:
+            parsed = parser(q.command, value) if parser is not None else value
+        except ValueError as e:
+            query_results.append(QueryResult(q.command, error=str(e)))
+            continue
+        query_results.append(QueryResult(q.command, value=parsed))
+    return query_results
+
+
+def run_queries(
+    vhls: VitisHLS,
+    queries: Sequence[Command],
+    setup: Sequence[Command] = (),
+) -> list[QueryResult]:
+    """Run any number of query commands in one tool launch.
+
+    ``setup`` runs first, typically to open the project and solution being
+    inspected. Each query gets its own ``QueryResult`` with a typed value, or
+    with the Tcl error message if the query failed.
+    """
+    result = vhls.run([*setup, *query_commands(queries)])
+    return parse_query_output(queries, result)
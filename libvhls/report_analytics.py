@@ -0,0 +1,163 @@
+import logging
+import os
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.synth_report import RESOURCE_TYPES, SynthesisReport
+from libvhls.utils import unwrap
+
+log = logging.getLogger(__name__)
+
+LATENCY_CASES = ["best", "average", "worst"]
+
+# One row per report. Latencies that Vitis HLS could not estimate ("undef")
+# are -1 in the cycle columns and NaN in the time columns.
+REPORT_DTYPE = np.dtype(
+    [("valid", np.bool_), ("clock_period", np.float64)]
+    + [(f"{case}_case_latency_c", np.int64) for case in LATENCY_CASES]
+    + [(f"{case}_case_latency_t", np.float64) for case in LATENCY_CASES]
+    + [(f"used_{r}", np.int64) for r in RESOURCE_TYPES]
+    + [(f"available_{r}", np.int64) for r in RESOURCE_TYPES]
+)
+
+
+def _text(parent: ET.Element, path: str) -> str:
+    return unwrap(unwrap(parent.find(path), path).text, path)
+
+
+def parse_report_row(xml_bytes: bytes) -> tuple:
+    """Parse the fields of ``REPORT_DTYPE`` from a ``csynth.xml`` document.
+
+    Unlike ``parse_report`` this skips the interface summary and builds no
+    intermediate objects.
+    """
+    root = ET.fromstring(xml_bytes)
+    clock_period = float(_text(root, "UserAssignments/TargetClockPeriod")) / 1e9
+
+    latency = unwrap(root.find("PerformanceEstimates/SummaryOfOverallLatency"))
+    cycles = []
+    for case in LATENCY_CASES:
+        latency_str = _text(latency, f"{case.capitalize()}-caseLatency")
+        cycles.append(-1 if latency_str == "undef" else int(latency_str))
+    times = [c * clock_period if c >= 0 else np.nan for c in cycles]
+
+    area = unwrap(root.find("AreaEstimates"))
+    used = [int(_text(area, f"Resources/{r}")) for r in RESOURCE_TYPES]
+    available = [int(_text(area, f"AvailableResources/{r}")) for r in RESOURCE_TYPES]
+
+    return (True, clock_period, *cycles, *times, *used, *available)
+
+
+def report_row(report: SynthesisReport) -> tuple:
+    """The fields of ``REPORT_DTYPE`` from an already parsed report."""
+    latency = report.top_level_latency_data
+    cycles = [getattr(latency, f"{case}_case_latency_c") for case in LATENCY_CASES]
+    times = [getattr(latency, f"{case}_case_latency_t") for case in LATENCY_CASES]
+    resources = report.top_level_resource_data
+    return (
+        True,
+        latency.clock_period,
+        *(-1 if c is None else c for c in cycles),
+        *(np.nan if t is None else t for t in times),
+        *(resources.used_abs[r] for r in RESOURCE_TYPES),
+        *(resources.available_abs[r] for r in RESOURCE_TYPES),
+    )
+
+
+INVALID_ROW = (
+    (False, np.nan)
+    + (-1,) * len(LATENCY_CASES)
+    + (np.nan,) * len(LATENCY_CASES)
+    + (0,) * (2 * len(RESOURCE_TYPES))
+)
+
+
+def load_report_row(path: Path) -> tuple:
+    try:
+        return parse_report_row(Path(path).read_bytes())
+    except (OSError, ET.ParseError, ValueError) as e:
+        log.warning(f"Could not parse report {path}: {e}")
+        return INVALID_ROW
+
+
+def load_reports(
+    paths: Iterable[Path],
+    n_workers: int | None = None,
+    chunksize: int = 64,
+) -> np.ndarray:
+    """Parse many ``csynth.xml`` reports into a ``REPORT_DTYPE`` array.
+
+    Row ``i`` holds the report at ``paths[i]``. Reports that are missing or
+    malformed get a row with ``valid`` set to ``False``.
+    """
+    paths = list(paths)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    log.info(f"Loading {len(paths)} reports with {n_workers} workers")
+    if n_workers == 1:
+        rows = list(map(load_report_row, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rows = list(pool.map(load_report_row, paths, chunksize=chunksize))
+    return np.array(rows, dtype=REPORT_DTYPE)
+
+
+def load_report_tree(
+    root: Path,
+    pattern: str = "csynth.xml",
+    n_workers: int | None = None,
+    chunksize: int = 64,
+) -> tuple[list[Path], np.ndarray]:
+    paths = sorted(root.rglob(pattern))
+    return paths, load_reports(paths, n_workers, chunksize)
+
+
+def used_percent(reports: np.ndarray, resource_type: str) -> np.ndarray:
+    used = reports[f"used_{resource_type}"]
+    available = reports[f"available_{resource_type}"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(available > 0, used / available, np.nan)
+
+
+def pareto_mask(costs: np.ndarray) -> np.ndarray:
+    """Mask of the rows of ``costs`` not dominated by any other row.
+
+    ``costs`` has one column per objective, all minimized. Rows containing
+    NaN are never on the front.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    front = np.flatnonzero(~np.isnan(costs).any(axis=1))
+    points = costs[front]
+    i = 0
+    while i < len(points):
+        # drop every point that the i-th point dominates, keeping duplicates
+        keep = (points < points[i]).any(axis=1) | (points == points[i]).all(axis=1)
+        front = front[keep]
+        points = points[keep]
+        i = int(keep[:i].sum()) + 1
+    mask = np.zeros(len(costs), dtype=bool)
+    mask[front] = True
+    return mask
+
+
+def pareto_ranks(costs: np.ndarray) -> np.ndarray:
+    """Index of the non-dominated front each row of ``costs`` belongs to.
+
+    Rank 0 is the Pareto front, rank 1 the front once rank 0 is removed, and
+    so on. Rows containing NaN get the rank after the last front.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    ranks = np.full(len(costs), -1, dtype=np.int64)
+    remaining = np.flatnonzero(~np.isnan(costs).any(axis=1))
+    rank = 0
+    while len(remaining) > 0:
+        mask = pareto_mask(costs[remaining])
+        ranks[remaining[mask]] = rank
+        remaining = remaining[~mask]
+        rank += 1
+    ranks[ranks == -1] = rank
+    return ranks
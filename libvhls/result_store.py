@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.commands.commands import RunnerResult, SlimRunnerResult
+from libvhls.executor import HLSJobResult
+from libvhls.report_analytics import INVALID_ROW, REPORT_DTYPE, report_row
+from libvhls.synth_report import SynthesisReport
+
+log = logging.getLogger(__name__)
+
+TEXT_FIELDS = ["script", "stdout", "stderr", "log"]
+
+# The report columns followed by the run's status, the ``RunnerStatus`` value
+# or 0 for jobs that never ran, and the location of its compressed texts in
+# the blob file.
+STORE_DTYPE = np.dtype(
+    REPORT_DTYPE.descr
+    + [
+        ("status", np.int8),
+        ("returncode", np.int32),
+        ("blob_offset", np.int64),
+        ("blob_size", np.int64),
+    ]
+)
+
+
+class ResultStore:
+    """Append-only on-disk store of run results, split into columns and text.
+
+    QoR metrics and run status go in a ``STORE_DTYPE`` table written in
+    chunks of ``chunk_rows`` rows as ``.npy`` files, with the run names in a
+    ``.npy`` file next to each chunk. The script, stdout, stderr and log of
+    each run are compressed into one blob appended to ``blobs.bin``; the
+    table holds its offset and size. Queries only touch the table::
+
+        table = store.table()
+        rows = store.select(used_percent(table, "LUT") < 0.5, "worst_case_latency_c")
+        texts = store.texts(rows[0])
+
+    A chunk's rows file is written last, so rows of a partly written chunk
+    are not seen when the store is opened again. Call ``flush`` or use the
+    store as a context manager to write the last partial chunk. A store has a
+    single writer: appends from several processes or threads are not
+    coordinated and would interleave chunks and blobs.
+    """
+
+    BLOB_FILE_NAME = "blobs.bin"
+
+    def __init__(self, root: Path, chunk_rows: int = 4096) -> None:
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.blob_path = root / self.BLOB_FILE_NAME
+        self.n_chunks = 0
+        while self.rows_path(self.n_chunks).exists():
+            self.n_chunks += 1
+        self._rows: list[tuple] = []
+        self._names: list[str] = []
+        self._table: np.ndarray | None = None
+        self._table_names: np.ndarray | None = None
+
+    def rows_path(self, i_chunk: int) -> Path:
+        return self.root / f"rows_{i_chunk:06d}.npy"
+
+    def names_path(self, i_chunk: int) -> Path:
+        return self.root / f"names_{i_chunk:06d}.npy"
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self.sealed_table()) + len(self._rows)
+
+    def write_blob(self, texts: dict[str, str]) -> tuple[int, int]:
+        data = zlib.compress(json.dumps(texts).encode(), 6)
+        with open(self.blob_path, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        return offset, len(data)
+
+    def add(
+        self,
+        name: str,
+        result: RunnerResult | SlimRunnerResult | None,
+        report: SynthesisReport | None = None,
+    ) -> None:
+        row = report_row(report) if report is not None else INVALID_ROW
+        if result is not None:
+            texts = {f: getattr(result, f) for f in TEXT_FIELDS}
+            texts["reason"] = result.reason
+            offset, size = self.write_blob(texts)
+            row += (result.status.value, result.returncode, offset, size)
+        else:
+            row += (0, -1, -1, 0)
+        self._rows.append(row)
+        self._names.append(name)
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def add_job_result(self, job_result: HLSJobResult) -> None:
+        self.add(job_result.job.name, job_result.result, job_result.report)
+
+    def extend(self, job_results: Iterable[HLSJobResult]) -> None:
+        for job_result in job_results:
+            self.add_job_result(job_result)
+
+    def flush(self) -> None:
+        if len(self._rows) == 0:
+            return
+        with open(self.blob_path, "ab") as f:
+            os.fsync(f.fileno())
+        rows = np.array(self._rows, dtype=STORE_DTYPE)
+        names = np.array(self._names, dtype=str)
+        # the rows file marks the chunk as complete, write it last
+        self._save(self.names_path(self.n_chunks), names)
+        self._save(self.rows_path(self.n_chunks), rows)
+        log.debug(f"Wrote chunk {self.n_chunks} with {len(rows)} rows")
+        self.n_chunks += 1
+        self._rows.clear()
+        self._names.clear()
+        self._table = None
+        self._table_names = None
+
+    @staticmethod
+    def _save(path: Path, array: np.ndarray) -> None:
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def sealed_table(self) -> np.ndarray:
+        if self._table is None:
+            chunks = [
+                np.load(self.rows_path(i), mmap_mode="r") for i in range(self.n_chunks)
+            ]
+            if len(chunks) == 0:
+                self._table = np.zeros(0, dtype=STORE_DTYPE)
+            else:
+                self._table = np.concatenate(chunks)
+        return self._table
+
+    def table(self) -> np.ndarray:
+        """All rows in insertion order, including ones not yet flushed."""
+        sealed = self.sealed_table()
+        if len(self._rows) == 0:
+            return sealed
+        return np.concatenate([sealed, np.array(self._rows, dtype=STORE_DTYPE)])
+
+    def names(self) -> np.ndarray:
+        if self._table_names is None:
+            chunks = [np.load(self.names_path(i)) for i in range(self.n_chunks)]
+            self._table_names = (
+                np.concatenate(chunks) if chunks else np.zeros(0, dtype=str)
+            )
+        if len(self._names) == 0:
+            return self._table_names
+        return np.concatenate([self._table_names, np.array(self._names, dtype=str)])
+
+    def select(
+        self,
+        mask: np.ndarray | None = None,
+        sort_by: str | None = None,
+        descending: bool = False,
+    ) -> np.ndarray:
+        """Indices of the rows in ``mask``, optionally sorted by a column.
+
+        Rows without a valid report hold placeholder values, so they are
+        sorted last either way.
+        """
+        table = self.table()
+        rows = np.arange(len(table)) if mask is None else np.flatnonzero(mask)
+        if sort_by is not None:
+            keys = table[sort_by][rows]
+            invalid = ~table["valid"][rows]
+            # lexsort is stable and sorts by its last key first
+            order = np.lexsort((-keys if descending else keys, invalid))
+            rows = rows[order]
+        return rows
+
+    def texts(self, row: int) -> dict[str, str | None]:
+        """The script, stdout, stderr, log and termination reason of a row."""
+        entry = self.table()[row]
+        if entry["blob_offset"] < 0:
+            return {}
+        with open(self.blob_path, "rb") as f:
+            f.seek(int(entry["blob_offset"]))
+            data = f.read(int(entry["blob_size"]))
+        texts: dict[str, str | None] = json.loads(zlib.decompress(data))
+        return texts
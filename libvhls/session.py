@@ -0,0 +1,347 @@
+import logging
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from libvhls.commands.commands import (
+    Command,
+    Runner,
+    RunnerResult,
+    RunnerStatus,
+    kill_process_group,
+)
+from libvhls.dist import VitisHLSDist
+from libvhls.utils import process_tree_rss
+
+log = logging.getLogger(__name__)
+
+SESSION_MARKER = "@@LIBVHLS_SESSION@@"
+
+
+def tcl_brace(value: str | Path) -> str:
+    return "{" + str(value) + "}"
+
+
+class VitisHLSSession:
+    """A long-lived interactive ``vitis_hls -i`` process.
+
+    Command batches are written to a Tcl file and sourced over stdin. Each
+    batch ends by printing a marker line with the batch id and the Tcl return
+    code, which is used to find the boundary between requests in the stdout
+    stream and in the session log.
+
+    Stdout is read by a background thread, so waiting for a marker can give
+    up: a session that does not become ready within ``start_timeout`` seconds
+    is killed, and so is one whose batch exceeds the runner's ``timeout`` or
+    ``max_rss_mb`` or violates one of its monitors. The runner's
+    ``max_memory_mb`` cannot be applied to a session that outlives the batch.
+    """
+
+    def __init__(
+        self,
+        dist: VitisHLSDist,
+        session_dir: Path,
+        start_timeout: float | None = 300.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.dist = dist
+        # the tool runs from the session dir and batches cd elsewhere, so every
+        # path handed to it must be absolute
+        self.session_dir = session_dir.resolve()
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.session_dir / "vitis_hls.log"
+        self.start_timeout = start_timeout
+        self.poll_interval = poll_interval
+        self.n_jobs = 0
+        self.proc: subprocess.Popen | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+
+    def start(self) -> None:
+        log.info(f"Starting Vitis HLS session in {self.session_dir}")
+        self.proc = subprocess.Popen(
+            [str(self.dist.vitis_hls_bin), "-i", "-l", str(self.log_path)],
+            cwd=self.session_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=True,
+        )
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_stdout, args=(self.proc, self._lines), daemon=True
+        ).start()
+
+        ready_id = uuid.uuid4().hex
+        self._send(f'puts "{SESSION_MARKER} {ready_id} 0"; flush stdout')
+        started = time.monotonic()
+        _, rc, termination = self._read_until_marker(
+            ready_id, lambda: self.check_start(started)
+        )
+        if rc is None:
+            self.kill()
+            reason = termination[1] if termination is not None else "exited"
+            raise RuntimeError(
+                f"Vitis HLS session in {self.session_dir} failed to start: {reason}"
+            )
+
+    def check_start(self, started: float) -> tuple[RunnerStatus, str] | None:
+        elapsed = time.monotonic() - started
+        if self.start_timeout is not None and elapsed > self.start_timeout:
+            return RunnerStatus.TIMEOUT, f"Not ready after {elapsed:.1f} s"
+        return self.check_alive()
+
+    def check_alive(self) -> tuple[RunnerStatus, str] | None:
+        # children of a dead session can keep its stdout open
+        if not self.alive:
+            return RunnerStatus.FAIL, "Session exited"
+        return None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    @property
+    def rss(self) -> int:
+        if not self.alive:
+            return 0
+        assert self.proc is not None
+        return process_tree_rss(self.proc.pid)
+
+    def _send(self, line: str) -> None:
+        assert self.proc is not None and self.proc.stdin is not None
+        self.proc.stdin.write(line + "\n")
+        self.proc.stdin.flush()
+
+    @staticmethod
+    def _read_stdout(proc: subprocess.Popen, lines: queue.Queue) -> None:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _read_until_marker(
+        self,
+        batch_id: str,
+        check: Callable[[], tuple[RunnerStatus, str] | None],
+        poll_interval: float | None = None,
+    ) -> tuple[str, int | None, tuple[RunnerStatus, str] | None]:
+        """Collect stdout up to the marker of ``batch_id`` and its return code.
+
+        ``check`` is called every ``poll_interval`` seconds, by default the
+        session's, and returns a termination status and reason to stop
+        waiting. The return code is ``None`` if the session exited or the wait
+        was stopped.
+        """
+        if poll_interval is None:
+            poll_interval = self.poll_interval
+        tag = f"{SESSION_MARKER} {batch_id} "
+        out: list[str] = []
+        next_check = time.monotonic() + poll_interval
+        while True:
+            if time.monotonic() >= next_check:
+                # a chatty batch must not starve the checks
+                next_check = time.monotonic() + poll_interval
+                termination = check()
+                if termination is not None:
+                    return "".join(out), None, termination
+            try:
+                line = self._lines.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+            if line is None:
+                return "".join(out), None, None
+            idx = line.find(tag)
+            if idx != -1:
+                # the interactive prompt can precede the marker on the same line
+                out.append(line[:idx])
+                return "".join(out), int(line[idx + len(tag) :].strip()), None
+            out.append(line)
+
+    def kill(self) -> int | None:
+        if self.proc is None:
+            return None
+        kill_process_group(self.proc)
+        returncode = self.proc.wait()
+        self.proc = None
+        return returncode
+
+    def run(self, runner: Runner, commands: Sequence[Command]) -> RunnerResult:
+        if runner.max_memory_mb is not None:
+            raise ValueError("max_memory_mb is not supported in a session")
+        if not self.alive:
+            self.start()
+        assert self.proc is not None
+
+        script = runner.build_script(commands)
+        batch_id = uuid.uuid4().hex
+        script_fp = self.session_dir / f"batch_{batch_id}.tcl"
+        script_fp.write_text(script)
+
+        log_offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+        wd = runner.wd.resolve()
+        watches = [m.watch(self.log_path, wd, log_offset) for m in runner.monitors]
+
+        self._send(
+            f"cd {tcl_brace(wd)}; "
+            f"set __libvhls_rc [catch {{source {tcl_brace(script_fp)}}} "
+            "__libvhls_err]; "
+            'if {$__libvhls_rc} {puts "ERROR: $__libvhls_err"}; '
+            "catch {close_project}; "
+            f"cd {tcl_brace(self.session_dir)}; "
+            f'puts "{SESSION_MARKER} {batch_id} $__libvhls_rc"; '
+            "flush stdout"
+        )
+        started = time.monotonic()
+        proc = self.proc
+
+        def check() -> tuple[RunnerStatus, str] | None:
+            return self.check_alive() or runner.check_running(
+                proc.pid, started, watches
+            )
+
+        stdout, rc, termination = self._read_until_marker(
+            batch_id, check, runner.poll_interval
+        )
+        script_fp.unlink(missing_ok=True)
+        self.n_jobs += 1
+
+        status, reason = termination if termination is not None else (None, None)
+        if rc is None:
+            returncode = self.kill()
+            if status is None or status == RunnerStatus.FAIL:
+                log.warning(
+                    f"Vitis HLS session exited with code {returncode} during a batch"
+                )
+            else:
+                log.warning(f"Batch {batch_id} stopped, killed its session: {reason}")
+            rc = returncode if returncode else 1
+
+        log_text = ""
+        if self.log_path.exists():
+            with open(self.log_path) as f:
+                f.seek(log_offset)
+                log_text = f.read()
+
+        return RunnerResult(
+            commands=commands,
+            script=script,
+            returncode=rc,
+            stdout=stdout,
+            stderr="",
+            log=log_text,
+            run_id=batch_id,
+            log_path=self.log_path,
+            termination=status,
+            reason=reason,
+        )
+
+    def close(self) -> None:
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            try:
+                self._send("exit")
+                self.proc.wait(timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+        self.proc = None
+
+
+class SessionPool:
+    """A pool of warm Vitis HLS sessions that command batches are dispatched to.
+
+    A session is recycled after ``max_jobs`` batches, or when the resident
+    memory of its process tree grows beyond ``max_rss_mb``.
+    """
+
+    def __init__(
+        self,
+        dist: VitisHLSDist,
+        pool_dir: Path,
+        size: int = 1,
+        max_jobs: int | None = 100,
+        max_rss_mb: float | None = None,
+        start_timeout: float | None = 300.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Session pool size must be at least 1, got {size}")
+        self.dist = dist
+        self.pool_dir = pool_dir.resolve()
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.start_timeout = start_timeout
+
+        self._idle: queue.Queue[VitisHLSSession] = queue.Queue()
+        self._lock = threading.Lock()
+        self._n_sessions = 0
+        self._sessions: list[VitisHLSSession] = []
+
+    def _new_session(self) -> VitisHLSSession:
+        session = VitisHLSSession(
+            self.dist,
+            self.pool_dir / f"session_{uuid.uuid4().hex[:12]}",
+            start_timeout=self.start_timeout,
+        )
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _acquire(self) -> VitisHLSSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_grow = self._n_sessions < self.size
+            if can_grow:
+                self._n_sessions += 1
+        if can_grow:
+            return self._new_session()
+        return self._idle.get()
+
+    def _needs_recycle(self, session: VitisHLSSession) -> bool:
+        if not session.alive:
+            return True
+        if self.max_jobs is not None and session.n_jobs >= self.max_jobs:
+            log.info(f"Recycling session after {session.n_jobs} jobs")
+            return True
+        if self.max_rss_mb is not None:
+            rss_mb = session.rss / 1024 / 1024
+            if rss_mb > self.max_rss_mb:
+                log.info(f"Recycling session using {rss_mb:.1f} MB")
+                return True
+        return False
+
+    def _release(self, session: VitisHLSSession) -> None:
+        if self._needs_recycle(session):
+            session.close()
+            with self._lock:
+                self._sessions.remove(session)
+            session = self._new_session()
+        self._idle.put(session)
+
+    def run(self, runner: Runner, commands: Sequence[Command]) -> RunnerResult:
+        session = self._acquire()
+        try:
+            return session.run(runner, commands)
+        finally:
+            self._release(session)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,127 @@
+import logging
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from libvhls.commands.commands import Command, RunnerResult, RunnerStatus
+from libvhls.commands.commands_libvhls import SOLUTION_MARKER, SolutionBlock
+from libvhls.synth_report import SynthesisReport
+from libvhls.vitis_hls import VitisHLS
+
+log = logging.getLogger(__name__)
+
+RE_SOLUTION_MARKER = re.compile(
+    rf"^{SOLUTION_MARKER} (begin|end) (\S+)(?: (-?\d+))?[ \t]*\r?$", re.MULTILINE
+)
+
+
+@dataclass
+class SolutionVariant:
+    name: str
+    commands: Sequence[Command] = field(default_factory=list)
+    flow_target: str | None = None
+
+
+@dataclass
+class SolutionResult:
+    variant: SolutionVariant
+    result: RunnerResult
+    report: SynthesisReport | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.result.status == RunnerStatus.SUCCESS
+
+
+@dataclass
+class SweepResult:
+    result: RunnerResult
+    solutions: list[SolutionResult]
+
+
+def split_solution_output(text: str) -> dict[str, tuple[str, int | None]]:
+    """Split tool output into the sections between solution markers.
+
+    Maps each solution name to its output and Tcl return code. The return code
+    is ``None`` when the tool exited before the solution's end marker.
+    """
+    sections: dict[str, tuple[str, int | None]] = {}
+    current: str | None = None
+    start = 0
+    for m in RE_SOLUTION_MARKER.finditer(text):
+        kind, name, rc = m.groups()
+        if kind == "begin":
+            current = name
+            start = m.end() + 1
+        elif name == current:
+            sections[name] = (text[start : m.start()], int(rc) if rc else 0)
+            current = None
+    if current is not None:
+        sections[current] = (text[start:], None)
+    return sections
+
+
+def solution_commands(
+    project_commands: Sequence[Command], variants: Sequence[SolutionVariant]
+) -> list[Command]:
+    names = [v.name for v in variants]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Solution names must be unique, got {names}")
+    commands = list(project_commands)
+    for v in variants:
+        commands.append(SolutionBlock(v.name, v.commands, flow_target=v.flow_target))
+    return commands
+
+
+def run_solutions(
+    vhls: VitisHLS,
+    project_commands: Sequence[Command],
+    variants: Sequence[SolutionVariant],
+) -> SweepResult:
+    """Synthesize several solutions of one project in a single tool launch.
+
+    ``project_commands`` open the project and add its sources, and each
+    variant adds the commands for one solution, such as ``SetPart``,
+    ``CreateClock`` and directives. The combined output is split back into
+    one ``RunnerResult`` per solution.
+    """
+    project_names = [
+        getattr(cmd, "project_name")
+        for cmd in project_commands
+        if cmd.command_str == "open_project"
+    ]
+    if len(project_names) != 1:
+        raise ValueError("project_commands must open exactly one project")
+    project_dir = vhls.wd / project_names[0]
+
+    commands = solution_commands(project_commands, variants)
+    result = vhls.run(commands)
+    log_sections = split_solution_output(result.log)
+    stdout_sections = split_solution_output(result.stdout)
+
+    solutions = []
+    for v in variants:
+        log_text, rc = log_sections.get(v.name, (result.log, None))
+        stdout, _ = stdout_sections.get(v.name, ("", None))
+        if rc is None:
+            # the tool died in or before this solution
+            rc = result.returncode if result.returncode != 0 else 1
+            log.warning(f"Solution {v.name} did not finish")
+        solution_result = RunnerResult(
+            commands=commands,
+            script=result.script,
+            returncode=rc,
+            stdout=stdout,
+            stderr=result.stderr,
+            log=log_text,
+            run_id=result.run_id,
+            log_path=result.log_path,
+        )
+
+        report = None
+        report_fp = project_dir / v.name / "syn" / "report" / "csynth.xml"
+        if rc == 0 and report_fp.exists():
+            report = SynthesisReport.parse_from_disk(report_fp)
+        solutions.append(SolutionResult(v, solution_result, report))
+
+    return SweepResult(result=result, solutions=solutions)
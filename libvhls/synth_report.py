@@ -1,11 +1,17 @@
+import os
+import sys
 import xml.etree.ElementTree as ET
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 
+from libvhls.parse_cache import ParseCache
 from libvhls.utils import unwrap
 
 
-@dataclass
+@dataclass(slots=True)
 class RTLPort:
     name: str
     object: str
@@ -19,14 +25,16 @@ class RTLPort:
 
     @classmethod
     def from_xml_element(cls, xml_element: ET.Element) -> "RTLPort":
-        name = unwrap(unwrap(xml_element.find("Name")).text)
-        object = unwrap(unwrap(xml_element.find("Object")).text)
-        type = unwrap(unwrap(xml_element.find("Type")).text)
-        io_protocol = unwrap(unwrap(xml_element.find("IOProtocol")).text)
-        dir = unwrap(unwrap(xml_element.find("Dir")).text)
+        # port fields repeat across every report of a design space, so share
+        # one copy of each string between all ports
+        name = sys.intern(unwrap(unwrap(xml_element.find("Name")).text))
+        object = sys.intern(unwrap(unwrap(xml_element.find("Object")).text))
+        type = sys.intern(unwrap(unwrap(xml_element.find("Type")).text))
+        io_protocol = sys.intern(unwrap(unwrap(xml_element.find("IOProtocol")).text))
+        dir = sys.intern(unwrap(unwrap(xml_element.find("Dir")).text))
         bits = int(unwrap(unwrap(xml_element.find("Bits")).text))
-        attribute = unwrap(unwrap(xml_element.find("Attribute")).text)
-        c_type = unwrap(unwrap(xml_element.find("CType")).text)
+        attribute = sys.intern(unwrap(unwrap(xml_element.find("Attribute")).text))
+        c_type = sys.intern(unwrap(unwrap(xml_element.find("CType")).text))
         has_ctrl = int(unwrap(unwrap(xml_element.find("HasCtrl")).text))
         return cls(
             name=name,
@@ -41,7 +49,7 @@ class RTLPort:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceSummary:
     rtl_ports: list[RTLPort] = field(default_factory=list)
 
@@ -54,7 +62,7 @@ class InterfaceSummary:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TopLevelLatencyData:
     clock_period: float
 
@@ -83,15 +91,17 @@ class TopLevelLatencyData:
         return b
 
 
-@dataclass
+RESOURCE_TYPES = ["BRAM_18K", "DSP", "FF", "LUT", "URAM"]
+
+
+@dataclass(slots=True)
 class TopLevelResourceData:
     used_abs: dict[str, int]
     available_abs: dict[str, int]
     used_percent: dict[str, float]
 
     def __post_init__(self):
-        resource_types = ["BRAM_18K", "DSP", "FF", "LUT", "URAM"]
-        for resource_type in resource_types:
+        for resource_type in RESOURCE_TYPES:
             if resource_type not in self.used_abs:
                 raise ValueError(f"Missing resource type {resource_type} in used_abs")
             if resource_type not in self.available_abs:
@@ -107,6 +117,70 @@ class TopLevelResourceData:
     def resource_types(self):
         return list(self.used_abs.keys())
 
+    def compact(self) -> "CompactResourceData":
+        return CompactResourceData.from_resource_data(self)
+
+
+class CompactResourceData:
+    """``TopLevelResourceData`` packed into two integer arrays.
+
+    Only the ``RESOURCE_TYPES`` columns are kept. ``used_abs``,
+    ``available_abs`` and ``used_percent`` are rebuilt as dicts on access.
+    """
+
+    __slots__ = ("used", "available")
+
+    def __init__(self, used: array, available: array) -> None:
+        self.used = used
+        self.available = available
+
+    @classmethod
+    def from_resource_data(
+        cls, resource_data: TopLevelResourceData
+    ) -> "CompactResourceData":
+        return cls(
+            used=array("q", (resource_data.used_abs[r] for r in RESOURCE_TYPES)),
+            available=array(
+                "q", (resource_data.available_abs[r] for r in RESOURCE_TYPES)
+            ),
+        )
+
+    @property
+    def resource_types(self):
+        return list(RESOURCE_TYPES)
+
+    @property
+    def used_abs(self) -> dict[str, int]:
+        return dict(zip(RESOURCE_TYPES, self.used))
+
+    @property
+    def available_abs(self) -> dict[str, int]:
+        return dict(zip(RESOURCE_TYPES, self.available))
+
+    @property
+    def used_percent(self) -> dict[str, float]:
+        return {
+            r: float(used / available)
+            for r, used, available in zip(RESOURCE_TYPES, self.used, self.available)
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactResourceData):
+            return NotImplemented
+        return self.used == other.used and self.available == other.available
+
+    def __getstate__(self) -> tuple[array, array]:
+        return self.used, self.available
+
+    def __setstate__(self, state: tuple[array, array]) -> None:
+        self.used, self.available = state
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(used_abs={self.used_abs}, "
+            f"available_abs={self.available_abs})"
+        )
+
 
 def parse_latency_str(
     latency_str: str, target_clock_period: float
@@ -199,14 +273,18 @@ def parse_report(xml_str):
     return top_level_latency_data, top_level_resource_data, interface_summary
 
 
-@dataclass
+@dataclass(slots=True)
 class SynthesisReport:
     top_level_latency_data: TopLevelLatencyData
-    top_level_resource_data: TopLevelResourceData
+    top_level_resource_data: TopLevelResourceData | CompactResourceData
     interface_summary: InterfaceSummary
 
     @classmethod
-    def parse_from_disk(cls, path: Path) -> "SynthesisReport":
+    def parse_from_disk(
+        cls, path: Path, cache: ParseCache | None = None
+    ) -> "SynthesisReport":
+        if cache is not None:
+            return cache.load(path, cls.parse_from_disk)
         top_level_latency_data, top_level_resource_data, interface_summary = (
             parse_report(path.read_text())
         )
@@ -215,3 +293,113 @@ class SynthesisReport:
             top_level_resource_data=top_level_resource_data,
             interface_summary=interface_summary,
         )
+
+    def compact(self) -> "SynthesisReport":
+        resource_data = self.top_level_resource_data
+        if isinstance(resource_data, TopLevelResourceData):
+            resource_data = resource_data.compact()
+        return SynthesisReport(
+            top_level_latency_data=self.top_level_latency_data,
+            top_level_resource_data=resource_data,
+            interface_summary=self.interface_summary,
+        )
+
+
+@dataclass
+class ModuleInstance:
+    module_name: str
+    instance_name: str | None = None
+    children: list["ModuleInstance"] = field(default_factory=list)
+
+    @classmethod
+    def from_xml_element(cls, xml_element: ET.Element) -> "ModuleInstance":
+        inst_name = xml_element.find("InstName")
+        return cls(
+            module_name=unwrap(unwrap(xml_element.find("ModuleName")).text),
+            instance_name=inst_name.text if inst_name is not None else None,
+            children=[
+                cls.from_xml_element(x)
+                for x in xml_element.findall("InstancesList/Instance")
+            ],
+        )
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "ModuleInstance"]]:
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+class HierarchicalSynthesisReport:
+    """All synthesis reports of a solution, with the module call tree.
+
+    Only the report directory listing is read up front. The call tree is built
+    from the top-level ``csynth.xml`` and each ``<module>_csynth.xml`` is
+    parsed the first time that module is accessed.
+    """
+
+    TOP_REPORT_NAME = "csynth.xml"
+    MODULE_REPORT_SUFFIX = "_csynth.xml"
+
+    def __init__(self, report_dir: Path, cache: ParseCache | None = None) -> None:
+        self.report_dir = report_dir
+        self.cache = cache
+        self.module_report_paths: dict[str, Path] = {}
+        with os.scandir(report_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.MODULE_REPORT_SUFFIX):
+                    module_name = entry.name[: -len(self.MODULE_REPORT_SUFFIX)]
+                    self.module_report_paths[module_name] = Path(entry.path)
+        self._reports: dict[str, SynthesisReport] = {}
+
+    @classmethod
+    def from_solution_dir(
+        cls, solution_dir: Path, cache: ParseCache | None = None
+    ) -> "HierarchicalSynthesisReport":
+        return cls(solution_dir / "syn" / "report", cache=cache)
+
+    @property
+    def module_names(self) -> list[str]:
+        return sorted(self.module_report_paths)
+
+    @cached_property
+    def top(self) -> SynthesisReport:
+        return SynthesisReport.parse_from_disk(
+            self.report_dir / self.TOP_REPORT_NAME, cache=self.cache
+        )
+
+    @cached_property
+    def hierarchy(self) -> ModuleInstance:
+        root = ET.parse(self.report_dir / self.TOP_REPORT_NAME).getroot()
+        top_module = unwrap(root.find("RTLDesignHierarchy/TopModule"))
+        return ModuleInstance.from_xml_element(top_module)
+
+    @property
+    def top_module_name(self) -> str:
+        return self.hierarchy.module_name
+
+    def walk(self) -> Iterator[tuple[int, ModuleInstance]]:
+        return self.hierarchy.walk()
+
+    def module(self, module_name: str) -> SynthesisReport:
+        if module_name not in self._reports:
+            if module_name not in self.module_report_paths:
+                raise KeyError(
+                    f"No synthesis report for module {module_name} in {self.report_dir}"
+                )
+            self._reports[module_name] = SynthesisReport.parse_from_disk(
+                self.module_report_paths[module_name], cache=self.cache
+            )
+        return self._reports[module_name]
+
+    def __getitem__(self, module_name: str) -> SynthesisReport:
+        return self.module(module_name)
+
+    def __contains__(self, module_name: object) -> bool:
+        return module_name in self.module_report_paths
+
+    def __len__(self) -> int:
+        return len(self.module_report_paths)
+
+    @property
+    def n_parsed(self) -> int:
+        return len(self._reports)
@@ -1,3 +1,9 @@
+import fcntl
+import os
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 from typing import TypeVar
 
 T_unwrap = TypeVar("T_unwrap")
@@ -10,3 +16,101 @@ def unwrap[T_unwrap](value: T_unwrap | None, message: str | None = None) -> T_un
         else:
             raise ValueError(f"Unwrapped a None value:\n{message}")
     return value
+
+
+def default_cache_dir() -> Path:
+    if "LIBVHLS_CACHE_DIR" in os.environ:
+        return Path(os.environ["LIBVHLS_CACHE_DIR"])
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "libvhls"
+    return Path.home() / ".cache" / "libvhls"
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class CacheUsage:
+    """Running total of the bytes in a cache directory shared by processes.
+
+    The total is kept in a small file updated under ``flock``, so recording an
+    insert does not need a scan of the cache. It is unknown until the first
+    scan, and only drifts up when entries are removed by other means, so a
+    cache scans when the total is unknown or over its budget and stores the
+    scanned total with ``write``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read(self) -> int | None:
+        try:
+            return int(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, total: int) -> None:
+        self.path.write_text(str(total))
+
+    def add(self, size: int) -> int | None:
+        """Add ``size`` bytes and return the new total, if it is known."""
+        with self.locked():
+            total = self.read()
+            if total is None:
+                return None
+            self.write(total + size)
+            return total + size
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory in bytes of a process and all of its descendants.
+
+    Only supported on Linux via ``/proc``; returns 0 elsewhere.
+    """
+    proc = Path("/proc")
+    if not proc.exists():
+        return 0
+
+    children: dict[int, list[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # the command name can contain spaces, fields after it are fixed
+        fields = stat[stat.rfind(")") + 2 :].split()
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            statm = Path(f"/proc/{p}/statm").read_text().split()
+        except OSError:
+            continue
+        total += int(statm[1]) * page_size
+        stack.extend(children.get(p, []))
+    return total
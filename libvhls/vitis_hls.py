@@ -1,19 +1,25 @@
 import logging
-import shutil
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from libvhls.commands.commands import Command, Runner, RunnerResult
-from libvhls.dist import VitisHLSDist
+from libvhls.commands.commands import AsyncRun, Command, Runner, RunnerResult
+from libvhls.dist import VitisHLSDist, find_vitis_hls_bin
 from libvhls.logging_config import configure_logging
 
+if TYPE_CHECKING:
+    from libvhls.cache import ResultCache
+    from libvhls.monitor import QoRMonitor
+    from libvhls.session import SessionPool
+
 log = logging.getLogger(__name__)
 
 
 def auto_find_vitis_hls() -> Path | None:
-    result = shutil.which("vitis_hls")
+    result = find_vitis_hls_bin()
     if result is not None:
-        return Path(result).parent.parent
+        return result.parent.parent
     else:
         return None
 
@@ -24,6 +30,14 @@ class VitisHLS:
         tool_path: Path | None = None,
         wd: Path | None = None,
         enable_logging: bool = False,
+        session_pool: "SessionPool | None" = None,
+        isolate: bool = False,
+        shared_project: bool = False,
+        cache: "ResultCache | None" = None,
+        timeout: float | None = None,
+        max_memory_mb: float | None = None,
+        max_rss_mb: float | None = None,
+        monitors: Sequence["QoRMonitor"] = (),
     ) -> None:
         if enable_logging:
             configure_logging(enable_logging)
@@ -47,7 +61,58 @@ class VitisHLS:
             self.wd = wd
         log.info(f"Using working dir: {str(self.wd)}")
 
-        self.runner = Runner(self.dist, self.wd)
+        self.runner = Runner(
+            self.dist,
+            self.wd,
+            isolate=isolate,
+            shared_project=shared_project,
+            timeout=timeout,
+            max_memory_mb=max_memory_mb,
+            max_rss_mb=max_rss_mb,
+            monitors=monitors,
+        )
+        self.session_pool = session_pool
+        if self.session_pool is not None and max_memory_mb is not None:
+            raise ValueError(
+                "max_memory_mb cannot be used with a session pool, use max_rss_mb"
+            )
+        if self.session_pool is not None:
+            log.info(f"Using session pool of size {self.session_pool.size}")
+        self.cache = cache
+        if self.cache is not None:
+            log.info(f"Using result cache: {str(self.cache.cache_dir)}")
 
     def run(self, cmd: Sequence[Command]) -> RunnerResult:
-        return self.runner.run(cmd)
+        run_fn: Callable[[Sequence[Command]], RunnerResult]
+        if self.session_pool is not None:
+            run_fn = partial(self.session_pool.run, self.runner)
+        else:
+            run_fn = self.runner.run
+        if self.cache is not None:
+            return self.cache.run(self.runner, cmd, run_fn)
+        return run_fn(cmd)
+
+    async def start_async(self, cmd: Sequence[Command]) -> AsyncRun:
+        """Start a run in its own process and stream its output.
+
+        A started run can neither come from the result cache nor go to a
+        session, so this raises ``ValueError`` if either is configured.
+        """
+        if self.session_pool is not None or self.cache is not None:
+            raise ValueError(
+                "start_async cannot use a session pool or a result cache, "
+                "use run_async or run"
+            )
+        return await self.runner.start_async(cmd)
+
+    async def run_async(self, cmd: Sequence[Command]) -> RunnerResult:
+        """Run in its own process without blocking the event loop.
+
+        Results go through the result cache like ``run``. Sessions are driven
+        synchronously, so this raises ``ValueError`` with a session pool.
+        """
+        if self.session_pool is not None:
+            raise ValueError("run_async cannot use a session pool, use run")
+        if self.cache is not None:
+            return await self.cache.run_async(self.runner, cmd)
+        return await self.runner.run_async(cmd)
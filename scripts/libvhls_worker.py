@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from libvhls.job_server import run_worker
+from libvhls.logging_config import configure_logging
+
+
+def main(args: argparse.Namespace) -> None:
+    authkey = os.environ.get("LIBVHLS_AUTHKEY")
+    if authkey is None:
+        sys.exit("Set LIBVHLS_AUTHKEY to the key the job server was started with.")
+    configure_logging(True)
+    n_jobs = run_worker(
+        (args.host, args.port),
+        authkey.encode(),
+        args.work_dir,
+        tool_path=args.tool_path,
+        worker_id=args.worker_id,
+    )
+    print(f"Ran {n_jobs} jobs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "A CLI program that runs HLS jobs handed out by a libvhls job server"
+        )
+    )
+
+    parser.add_argument("host", help="The address of the job server")
+    parser.add_argument("port", type=int, help="The port of the job server")
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=Path.cwd() / "libvhls_worker",
+        help="The directory the jobs run in",
+    )
+    parser.add_argument(
+        "--tool-path",
+        type=Path,
+        default=None,
+        help="The path to the vitis_hls binary, found automatically if not given",
+    )
+    parser.add_argument("--worker-id", default=None, help="The name of this worker")
+
+    args = parser.parse_args()
+    main(args)
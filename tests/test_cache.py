@@ -0,0 +1,134 @@
+import asyncio
+from pathlib import Path
+
+from libvhls.cache import ResultCache, dir_size
+from libvhls.commands import AddFiles, CsynthDesign, OpenProject
+from libvhls.commands.commands import Runner, RunnerResult
+from libvhls.dist import VitisHLSDist
+from tests.utils import make_stub_dist
+
+
+def make_job(wd: Path, source: str) -> tuple[Runner, list]:
+    wd.mkdir(parents=True, exist_ok=True)
+    (wd / "top.cpp").write_text(source)
+    runner = Runner(VitisHLSDist(Path("/opt/Vitis_HLS/2024.1")), wd)
+    commands = [
+        OpenProject("prj", reset=True),
+        AddFiles([wd / "top.cpp"]),
+        CsynthDesign(),
+    ]
+    return runner, commands
+
+
+def fake_run(runner: Runner, commands, marker: str) -> RunnerResult:
+    report = runner.wd / "prj" / "solution1" / "syn" / "report" / "csynth.xml"
+    report.parent.mkdir(parents=True, exist_ok=True)
+    report.write_text(f"<profile>{marker}</profile>")
+    return RunnerResult(
+        commands=commands,
+        script=runner.build_script(commands),
+        returncode=0,
+        stdout="out",
+        stderr="",
+        log=f"log {marker}",
+        run_id=marker,
+    )
+
+
+def test_result_cache_hit_restores_artifacts(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    calls = []
+
+    runner, commands = make_job(tmp_path / "job_a", "int top() { return 1; }")
+    r = cache.run(
+        runner, commands, lambda c: calls.append(1) or fake_run(runner, c, "a")
+    )
+    assert r.log == "log a"
+    assert len(calls) == 1
+
+    # same sources and commands in a different working dir hit the cache
+    runner_b, commands_b = make_job(tmp_path / "job_b", "int top() { return 1; }")
+    r = cache.run(
+        runner_b, commands_b, lambda c: calls.append(1) or fake_run(runner_b, c, "b")
+    )
+    assert len(calls) == 1
+    assert r.log == "log a"
+    assert r.commands is commands_b
+    report = runner_b.wd / "prj" / "solution1" / "syn" / "report" / "csynth.xml"
+    assert report.read_text() == "<profile>a</profile>"
+
+
+def test_result_cache_run_async(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    calls_fp = tmp_path / "calls"
+    dist = make_stub_dist(tmp_path, f'echo run >> "{calls_fp}"\necho hello')
+    _, commands = make_job(tmp_path / "job", "int top() { return 1; }")
+    runner = Runner(dist, tmp_path / "job", poll_interval=0.05)
+
+    for _ in range(2):
+        r = asyncio.run(cache.run_async(runner, commands))
+        assert r.stdout == "hello\n"
+    assert calls_fp.read_text() == "run\n"
+
+
+def test_result_cache_key_tracks_inputs(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    runner, commands = make_job(tmp_path / "job", "int top() { return 1; }")
+    key = cache.key(runner, commands)
+
+    (runner.wd / "top.cpp").write_text("int top() { return 2; }")
+    assert cache.key(runner, commands) != key
+
+    runner_other_dist = Runner(VitisHLSDist(Path("/opt/Vitis_HLS/2023.2")), runner.wd)
+    assert cache.key(runner_other_dist, commands) != cache.key(runner, commands)
+
+    assert cache.key(runner, commands + [CsynthDesign(dump_cfg=True)]) != cache.key(
+        runner, commands
+    )
+
+
+def test_result_cache_failed_runs_not_stored(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    runner, commands = make_job(tmp_path / "job", "int top();")
+
+    def failing_run(c):
+        r = fake_run(runner, c, "a")
+        return RunnerResult(c, r.script, 1, r.stdout, r.stderr, r.log)
+
+    cache.run(runner, commands, failing_run)
+    assert cache.get(runner, commands) is None
+
+
+def test_result_cache_eviction(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1)
+    runner, commands = make_job(tmp_path / "job_a", "int a();")
+    cache.run(runner, commands, lambda c: fake_run(runner, c, "a"))
+    # a single entry larger than the budget is evicted right away
+    assert cache.get(runner, commands) is None
+    assert list(cache.entries_dir.glob("*/*")) == []
+
+
+def test_result_cache_tracks_usage(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache")
+    runner, commands = make_job(tmp_path / "job_a", "int a();")
+    cache.run(runner, commands, lambda c: fake_run(runner, c, "a"))
+    # the first insert scans to learn the size of the cache
+    size_a = dir_size(cache.cache_dir / "entries")
+    assert cache.usage.read() == size_a
+
+    def no_scan():
+        raise AssertionError("evict scanned a cache under budget")
+
+    monkeypatch.setattr(cache, "evict", no_scan)
+    runner, commands = make_job(tmp_path / "job_b", "int b();")
+    cache.run(runner, commands, lambda c: fake_run(runner, c, "b"))
+    assert cache.usage.read() == dir_size(cache.cache_dir / "entries")
+    monkeypatch.undo()
+
+    # going over the budget evicts the least recently used entry
+    cache.max_bytes = cache.usage.read() - 1
+    runner, commands = make_job(tmp_path / "job_c", "int c();")
+    cache.run(runner, commands, lambda c: fake_run(runner, c, "c"))
+    assert len(list(cache.entries_dir.glob("*/*"))) < 3
+    assert cache.usage.read() == dir_size(cache.cache_dir / "entries")
+    assert cache.usage.read() <= cache.max_bytes
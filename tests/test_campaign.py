@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from libvhls.campaign import Campaign, JobState, job_fingerprint
+from libvhls.commands import (
+    CloseProject,
+    CloseSolution,
+    CsynthDesign,
+    OpenProject,
+    SetTop,
+)
+from libvhls.commands.commands import RunnerResult
+from libvhls.executor import HLSJob, HLSJobResult
+from libvhls.synth_report import SynthesisReport
+
+REPORT_FP = Path(__file__).parent / "resources" / "reports" / "simple_mm" / "csynth.xml"
+
+
+class Crash(Exception):
+    pass
+
+
+class FakeExecutor:
+    """Runs jobs one at a time, failing the ones in ``fail``.
+
+    Raises ``Crash`` once ``crash_after`` jobs finished, with the next job
+    already taken from the iterable, like a driver dying mid-campaign.
+    """
+
+    def __init__(self, fail=(), crash_after: int | None = None) -> None:
+        self.fail = set(fail)
+        self.crash_after = crash_after
+        self.ran: list[str] = []
+
+    def run(self, jobs):
+        for job in jobs:
+            if self.crash_after is not None and len(self.ran) == self.crash_after:
+                raise Crash()
+            self.ran.append(job.name)
+            ok = job.name not in self.fail
+            result = RunnerResult(job.commands, "", 0 if ok else 1, "", "", "")
+            report = SynthesisReport.parse_from_disk(REPORT_FP) if ok else None
+            yield HLSJobResult(job, Path(job.name), result=result, report=report)
+
+
+def make_jobs(tmp_path: Path, n: int) -> list[HLSJob]:
+    jobs = []
+    for i in range(n):
+        src = tmp_path / "src" / f"top_{i}.cpp"
+        src.parent.mkdir(exist_ok=True)
+        if not src.exists():
+            src.write_text(f"int top() {{ return {i}; }}\n")
+        commands = [OpenProject("prj", reset=True), CsynthDesign()]
+        jobs.append(HLSJob(f"job_{i}", commands, files=[src]))
+    return jobs
+
+
+def test_campaign_resumes_after_crash(tmp_path):
+    journal = tmp_path / "campaign.jsonl"
+    jobs = make_jobs(tmp_path, 5)
+
+    executor = FakeExecutor(fail={"job_1"}, crash_after=2)
+    with pytest.raises(Crash):
+        list(Campaign(journal, executor).run(jobs))  # type: ignore[arg-type]
+    assert executor.ran == ["job_0", "job_1"]
+
+    campaign = Campaign(journal, FakeExecutor())  # type: ignore[arg-type]
+    assert campaign.records["job_0"].state == JobState.DONE
+    assert campaign.records["job_1"].state == JobState.FAILED
+    assert campaign.records["job_2"].state == JobState.RUNNING
+
+    # a crash while writing leaves a torn record behind
+    with open(journal, "a") as f:
+        f.write('{"name": "job_3", "fing')
+
+    executor = FakeExecutor()
+    campaign = Campaign(journal, executor)  # type: ignore[arg-type]
+    records = {r.name: r for r in campaign.run(jobs)}
+    assert executor.ran == ["job_2", "job_3", "job_4"]
+    assert sorted(records) == [job.name for job in jobs]
+    assert records["job_1"].state == JobState.FAILED
+    assert records["job_4"].result == {
+        "status": "SUCCESS",
+        "returncode": 0,
+        "reason": None,
+        "run_id": None,
+        "log_path": None,
+    }
+    assert records["job_4"].report["worst_case_latency_c"] == 8260
+
+    # failed jobs are retried on request, changed sources invalidate records
+    (tmp_path / "src" / "top_0.cpp").write_text("int top() { return 42; }\n")
+    executor = FakeExecutor()
+    campaign = Campaign(journal, executor, retry_failed=True)  # type: ignore[arg-type]
+    campaign.run_all(jobs)
+    assert executor.ran == ["job_0", "job_1"]
+
+
+def test_campaign_compact_and_report_table(tmp_path):
+    journal = tmp_path / "campaign.jsonl"
+    jobs = make_jobs(tmp_path, 3)
+    campaign = Campaign(journal, FakeExecutor(fail={"job_2"}))  # type: ignore[arg-type]
+    campaign.run_all(jobs)
+    assert len(journal.read_text().splitlines()) == 6
+
+    campaign.compact()
+    assert len(journal.read_text().splitlines()) == 3
+    reloaded = Campaign(journal, FakeExecutor())  # type: ignore[arg-type]
+    assert reloaded.records == campaign.records
+
+    table = reloaded.report_table(["job_0", "job_2", "missing"])
+    assert table["valid"].tolist() == [True, False, False]
+    assert table["worst_case_latency_c"][0] == 8260
+    assert table["used_DSP"][0] == 96
+    assert np.isnan(table["clock_period"][1])
+
+    with pytest.raises(ValueError):
+        reloaded.run_all([jobs[0], jobs[0]])
+
+
+def test_job_fingerprint_is_stable(tmp_path):
+    (src,) = [job.files[0] for job in make_jobs(tmp_path, 1)]
+
+    def make_job(top: str) -> HLSJob:
+        commands = [OpenProject("prj"), SetTop(top), CloseSolution(), CloseProject()]
+        return HLSJob("job", commands, files=[src])
+
+    # close commands are not dataclasses, their repr differs between objects
+    assert job_fingerprint(make_job("top")) == job_fingerprint(make_job("top"))
+    assert job_fingerprint(make_job("top")) != job_fingerprint(make_job("other"))
+    fingerprint = job_fingerprint(make_job("top"))
+    src.write_text("int top() { return 42; }\n")
+    assert job_fingerprint(make_job("top")) != fingerprint
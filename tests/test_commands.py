@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from libvhls.commands import ListPart, OpenProject, UserTCL
@@ -57,3 +58,19 @@ def test_multi_command(tmp_path):
     check_command_otuput_generic(tmp_path, r)
     assert Path(tmp_path, "test_project").exists()
     assert "Hello World" in r.log
+
+
+def test_command_run_async(tmp_path):
+    vhls = VitisHLS(wd=tmp_path, enable_logging=True)
+    commands = [UserTCL('puts "Hello World"')]
+
+    async def run():
+        run = await vhls.start_async(commands)
+        lines = [event.line async for event in run.events()]
+        return lines, await run.wait()
+
+    lines, r = asyncio.run(run())
+
+    check_command_otuput_generic(tmp_path, r)
+    assert "Hello World" in lines
+    assert "Hello World" in r.log
@@ -0,0 +1,131 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import libvhls.dist as dist_module
+from libvhls.dist import IncludeIndex, VitisHLSDist
+
+
+def make_dist(tmp_path: Path) -> VitisHLSDist:
+    dist_dir = tmp_path / "Vitis_HLS" / "2024.1"
+    include_dir = dist_dir / "include"
+    for rel_path in [
+        "ap_int.h",
+        "hls_stream.h",
+        "etc/ap_int_base.h",
+        "etc/hls_stream.h",
+        "hls/utils/x_hls_utils.h",
+        "hls/utils/README",
+    ]:
+        (include_dir / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (include_dir / rel_path).write_text("")
+    return VitisHLSDist(dist_dir, index_cache_dir=tmp_path / "index")
+
+
+def test_dist_include_lookup(tmp_path):
+    dist = make_dist(tmp_path)
+    include_dir = dist.include_dir
+
+    assert set(dist.all_include_dirs) == {"include", "etc", "hls", "utils"}
+    assert dist.all_include_dirs["utils"] == include_dir / "hls" / "utils"
+    assert set(dist.includes) == {
+        "ap_int.h",
+        "ap_int_base.h",
+        "hls_stream.h",
+        "x_hls_utils.h",
+    }
+
+    assert dist.find_includes("hls_stream.h") == [
+        include_dir / "hls_stream.h",
+        include_dir / "etc" / "hls_stream.h",
+    ]
+    assert dist.find_includes("README") == []
+    assert dist.resolve_include("hls_stream.h") == include_dir / "hls_stream.h"
+    assert dist.resolve_include("etc/hls_stream.h") == (
+        include_dir / "etc" / "hls_stream.h"
+    )
+    assert dist.resolve_include("utils/x_hls_utils.h") == (
+        include_dir / "hls" / "utils" / "x_hls_utils.h"
+    )
+    assert dist.resolve_include("missing.h") is None
+
+
+def test_dist_include_index_persistence(tmp_path, monkeypatch):
+    dist = make_dist(tmp_path)
+    dist.includes
+    assert dist.include_index_path().exists()
+
+    n_builds = 0
+    build = IncludeIndex.build
+
+    def counting_build(*args):
+        nonlocal n_builds
+        n_builds += 1
+        return build(*args)
+
+    monkeypatch.setattr(IncludeIndex, "build", counting_build)
+
+    # a fresh dist object loads the saved index instead of walking the tree
+    dist = VitisHLSDist(dist.dist_dir, index_cache_dir=tmp_path / "index")
+    assert len(dist.find_includes("hls_stream.h")) == 2
+    assert n_builds == 0
+
+    # adding a header changes the include dir mtime and rebuilds the index
+    (dist.include_dir / "ap_fixed.h").write_text("")
+    st = dist.include_dir.stat()
+    os.utime(dist.include_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert dist.find_includes("ap_fixed.h") == [dist.include_dir / "ap_fixed.h"]
+    assert n_builds == 1
+
+
+def test_dist_auto_find_cache(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "Vitis_HLS" / "2024.1" / "bin"
+    bin_dir.mkdir(parents=True)
+    vitis_hls_bin = bin_dir / "vitis_hls"
+    vitis_hls_bin.write_text("#!/bin/sh\n")
+    vitis_hls_bin.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv("LIBVHLS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(dist_module, "_auto_find_cache", {})
+
+    n_which = 0
+    which = shutil.which
+
+    def counting_which(*args, **kwargs):
+        nonlocal n_which
+        n_which += 1
+        return which(*args, **kwargs)
+
+    monkeypatch.setattr(shutil, "which", counting_which)
+
+    assert VitisHLSDist.auto_find().dist_dir == bin_dir.parent
+    assert VitisHLSDist.auto_find().dist_dir == bin_dir.parent
+    assert n_which == 1
+
+    # a new process only has the on-disk cache
+    monkeypatch.setattr(dist_module, "_auto_find_cache", {})
+    assert VitisHLSDist.auto_find().vitis_hls_bin == vitis_hls_bin
+    assert n_which == 1
+
+    # a binary installed in a PATH dir ahead of the cached one is found
+    first_dir = tmp_path / "first" / "bin"
+    first_dir.mkdir(parents=True)
+    monkeypatch.setenv("PATH", f"{first_dir}{os.pathsep}{bin_dir}")
+    assert VitisHLSDist.auto_find().vitis_hls_bin == vitis_hls_bin
+    assert n_which == 2
+    first_bin = first_dir / "vitis_hls"
+    first_bin.write_text("#!/bin/sh\n")
+    first_bin.chmod(0o755)
+    st = first_dir.stat()
+    os.utime(first_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert VitisHLSDist.auto_find().vitis_hls_bin == first_bin
+    assert n_which == 3
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    # stale entries fall back to searching PATH
+    vitis_hls_bin.unlink()
+    with pytest.raises(RuntimeError):
+        VitisHLSDist.auto_find()
+    assert n_which == 4
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import (
+    AddFiles,
+    CreateClock,
+    CsynthDesign,
+    OpenProject,
+    OpenSolution,
+    SetPart,
+    SetTop,
+)
+from libvhls.commands.commands import SlimRunnerResult
+from libvhls.executor import HLSExecutor, HLSJob
+from tests.utils import make_stub_dist
+
+MM_DESIGN_DIR = Path(__file__).parent / "resources" / "simple_mm_design"
+
+
+def test_executor_isolates_jobs_and_reports_errors(tmp_path):
+    executor = HLSExecutor(
+        tmp_path / "runs",
+        n_workers=2,
+        tool_path=tmp_path / "missing" / "bin" / "vitis_hls",
+    )
+    jobs = [
+        HLSJob(f"job_{i}", [OpenProject("prj")], files=[MM_DESIGN_DIR / "mm.cpp"])
+        for i in range(5)
+    ]
+
+    results = list(executor.run(jobs))
+
+    assert sorted(r.job.name for r in results) == [f"job_{i}" for i in range(5)]
+    for r in results:
+        assert r.wd == tmp_path / "runs" / r.job.name
+        assert (r.wd / "mm.cpp").exists()
+        assert not r.ok
+        assert r.error is not None
+
+
+def test_executor_rejects_duplicate_job_names(tmp_path):
+    executor = HLSExecutor(
+        tmp_path / "runs",
+        n_workers=1,
+        tool_path=tmp_path / "missing" / "bin" / "vitis_hls",
+    )
+    jobs = (HLSJob(name, [OpenProject("prj")]) for name in ("a", "b", "a"))
+    with pytest.raises(ValueError, match="unique"):
+        list(executor.run(jobs))
+
+
+def test_executor_csynth(tmp_path):
+    files = [MM_DESIGN_DIR / "mm.cpp", MM_DESIGN_DIR / "mm.h"]
+    jobs = [
+        HLSJob(
+            f"mm_{period}",
+            [
+                OpenProject("prj", reset=True),
+                AddFiles([Path("mm.cpp"), Path("mm.h")]),
+                OpenSolution("sol", flow_target="vitis", reset=True),
+                SetPart("xcvu9p-flgb2104-2-i"),
+                CreateClock("clk", period),
+                SetTop("blockmatmul"),
+                CsynthDesign(),
+            ],
+            files=files,
+        )
+        for period in ["3.33", "5.0"]
+    ]
+
+    executor = HLSExecutor(tmp_path / "runs", n_workers=2)
+    for r in executor.run(jobs):
+        assert r.ok, r.error
+        assert r.report is not None
+        assert r.report.top_level_latency_data.clock_period > 0
+
+
+def test_executor_slim_results(tmp_path):
+    dist = make_stub_dist(tmp_path, "echo synthesized\nexit 0")
+    executor = HLSExecutor(
+        tmp_path / "runs",
+        n_workers=2,
+        tool_path=dist.vitis_hls_bin,
+        slim_results=True,
+    )
+    jobs = [HLSJob(f"job_{i}", [OpenProject("prj")]) for i in range(3)]
+
+    for r in executor.run(jobs):
+        assert r.ok, r.error
+        assert isinstance(r.result, SlimRunnerResult)
+        assert r.result.stdout == "synthesized\n"
+        assert r.result.log == "stub tool started\n"
+        assert r.result.script.startswith("open_project prj")
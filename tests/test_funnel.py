@@ -0,0 +1,133 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import (
+    AddFiles,
+    CosimDesign,
+    CsynthDesign,
+    OpenProject,
+    OpenSolution,
+    SetTop,
+    UserTCL,
+)
+from libvhls.commands.commands import RunnerResult
+from libvhls.executor import HLSJob, HLSJobResult
+from libvhls.funnel import DesignPoint, Funnel, FunnelStage
+from libvhls.synth_report import (
+    RESOURCE_TYPES,
+    SynthesisReport,
+    TopLevelResourceData,
+)
+
+REPORT_FP = Path(__file__).parent / "resources" / "reports" / "simple_mm" / "csynth.xml"
+
+# name -> (worst case latency, DSPs), p7 fails to synthesize
+DESIGNS = {
+    "p0": (10.0, 800),
+    "p1": (20.0, 400),
+    "p2": (40.0, 200),
+    "p3": (80.0, 100),
+    "p4": (25.0, 800),
+    "p5": (45.0, 400),
+    "p6": (90.0, 300),
+    "p7": None,
+}
+
+
+def make_report(latency: float, dsp: int) -> SynthesisReport:
+    report = SynthesisReport.parse_from_disk(REPORT_FP)
+    resources = report.top_level_resource_data
+    used = {r: 0 for r in RESOURCE_TYPES}
+    used["DSP"] = dsp
+    return replace(
+        report,
+        top_level_latency_data=replace(
+            report.top_level_latency_data, worst_case_latency_t=latency
+        ),
+        top_level_resource_data=TopLevelResourceData(
+            used, resources.available_abs, resources.used_percent
+        ),
+    )
+
+
+class FakeExecutor:
+    """Runs each job instantly, failing the designs in ``fail`` per stage."""
+
+    def __init__(self, fail: dict[str, set[str]]) -> None:
+        self.fail = fail
+        self.jobs: list[HLSJob] = []
+
+    def run(self, jobs):
+        for job in jobs:
+            self.jobs.append(job)
+            stage = job.commands[-1].command_str
+            ok = job.name not in self.fail.get(stage, set())
+            report = None
+            if stage == "csynth_design" and ok:
+                report = make_report(*DESIGNS[job.name])
+            result = RunnerResult(job.commands, "", 0 if ok else 1, "", "", "")
+            yield HLSJobResult(job, Path(job.name), result=result, report=report)
+
+
+def make_points() -> list[DesignPoint]:
+    return [
+        DesignPoint(
+            name,
+            [OpenProject("prj"), OpenSolution("sol")],
+            [AddFiles([Path("top.cpp")]), SetTop("top")],
+            files=[Path("src") / name / "top.cpp"],
+        )
+        for name in DESIGNS
+    ]
+
+
+def test_funnel_promotes_pareto_front():
+    executor = FakeExecutor({"csynth_design": {"p7"}, "cosim_design": {"p1"}})
+    funnel = Funnel(
+        executor,  # type: ignore[arg-type]
+        [
+            FunnelStage("csynth", [CsynthDesign()], promote=0.5),
+            FunnelStage("cosim", [CosimDesign()], max_promoted=2),
+            FunnelStage("export", [UserTCL("export_design -format ip_catalog")]),
+        ],
+    )
+    result = funnel.run(make_points())
+
+    assert result.promoted == {
+        "csynth": ["p0", "p1", "p2", "p3"],
+        "cosim": ["p0", "p2"],
+    }
+    assert [len(r) for r in result.stages.values()] == [8, 4, 2]
+    assert result.survivors == ["p0", "p2"]
+    assert sorted(result.reports) == [f"p{i}" for i in range(7)]
+
+    # later stages reuse the job dir and project of the first one
+    first, _, last = [job for job in executor.jobs if job.name == "p0"]
+    assert [c.command_str for c in first.commands] == [
+        "open_project",
+        "open_solution",
+        "add_files",
+        "set_top",
+        "csynth_design",
+    ]
+    assert [type(c) for c in last.commands] == [OpenProject, OpenSolution, UserTCL]
+    assert first.files == last.files
+
+
+def test_funnel_rank_and_validation():
+    stages = [FunnelStage("csynth", [CsynthDesign()])]
+    funnel = Funnel(FakeExecutor({}), stages)  # type: ignore[arg-type]
+    reports = {name: make_report(*DESIGNS[name]) for name in ["p4", "p3", "p5"]}
+    reports["p0"] = make_report(*DESIGNS["p0"])
+    # p4 is dominated by p0, the rest of the front is ordered by latency
+    ranked = funnel.rank(["p7", "p4", "p5", "p3", "p0"], reports)
+    assert ranked == ["p0", "p5", "p3", "p4", "p7"]
+
+    assert FunnelStage("s", [], promote=0.3).n_promoted(10) == 3
+    assert FunnelStage("s", [], promote=0.3, max_promoted=2).n_promoted(10) == 2
+    with pytest.raises(ValueError):
+        Funnel(FakeExecutor({}), [])  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        funnel.run([DesignPoint("a", []), DesignPoint("a", [])])
@@ -0,0 +1,87 @@
+import subprocess
+import sys
+
+# generous enough for slow CI machines, but catches eager heavy imports
+IMPORT_BUDGET_S = 0.5
+# on top of the runner it wraps, the facade must not load the cache, monitors
+# or sessions, which took over ten times this
+VITIS_HLS_IMPORT_BUDGET_S = 0.005
+
+LAZY_MODULES = ("asyncio", "libvhls.commands.commands_libvhls")
+VITIS_HLS_LAZY_MODULES = (
+    "asyncio",
+    "libvhls.cache",
+    "libvhls.monitor",
+    "libvhls.session",
+)
+
+PROBE = """
+import sys, time
+{setup}
+t = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - t
+loaded = [m for m in {lazy_modules!r} if m in sys.modules]
+print(elapsed, *loaded)
+"""
+
+
+def run_probe(
+    imports: str = "import libvhls.commands\nfrom libvhls.commands import OpenProject",
+    lazy_modules: tuple[str, ...] = LAZY_MODULES,
+    setup: str = "",
+) -> tuple[float, list[str]]:
+    probe = PROBE.format(setup=setup, imports=imports, lazy_modules=lazy_modules)
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), out[1:]
+
+
+def run_vitis_hls_probe() -> tuple[float, list[str]]:
+    return run_probe(
+        "import libvhls.vitis_hls",
+        VITIS_HLS_LAZY_MODULES,
+        setup="import libvhls.commands.commands",
+    )
+
+
+def test_commands_import_is_lazy():
+    _, loaded = run_probe()
+    assert loaded == []
+
+
+def test_commands_import_time():
+    # best of a few runs to smooth out noise from the rest of the machine
+    elapsed = min(run_probe()[0] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_S
+
+
+def test_vitis_hls_import_is_lazy():
+    _, loaded = run_vitis_hls_probe()
+    assert loaded == []
+
+
+def test_vitis_hls_import_time():
+    elapsed = min(run_vitis_hls_probe()[0] for _ in range(3))
+    assert elapsed < VITIS_HLS_IMPORT_BUDGET_S
+
+
+def test_commands_exports():
+    import libvhls.commands
+    from libvhls.commands import (
+        COMMANDS_LIBVHLS,
+        COMMANDS_VITIS_HLS_PROJECT,
+        SlimRunnerResult,
+        TextRef,
+    )
+    from libvhls.commands.commands import SlimRunnerResult as SlimRunnerResult_
+    from libvhls.commands.commands_libvhls import UserTCL
+    from libvhls.commands.commands_vitis_hls_project import OpenProject
+
+    assert UserTCL in COMMANDS_LIBVHLS
+    assert OpenProject in COMMANDS_VITIS_HLS_PROJECT
+    assert SlimRunnerResult is SlimRunnerResult_
+    assert TextRef.__module__ == "libvhls.commands.commands"
+    for name in libvhls.commands.__all__:
+        assert getattr(libvhls.commands, name) is not None
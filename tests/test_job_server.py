@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import OpenProject
+from libvhls.executor import HLSJob
+from libvhls.job_server import (
+    JobServer,
+    JobSpec,
+    collect_artifacts,
+    run_worker,
+    write_artifacts,
+)
+from tests.utils import make_stub_dist
+
+REPORT_FP = Path(__file__).parent / "resources" / "reports" / "simple_mm" / "csynth.xml"
+AUTHKEY = b"libvhls-test"
+
+
+def make_jobs(tmp_path: Path, n: int) -> list[HLSJob]:
+    jobs = []
+    for i in range(n):
+        src = tmp_path / "src" / f"job_{i}" / "top.cpp"
+        src.parent.mkdir(parents=True)
+        src.write_text(f"int top() {{ return {i}; }}\n")
+        jobs.append(HLSJob(f"job_{i}", [OpenProject("prj")], files=[src]))
+    return jobs
+
+
+def test_job_spec_and_artifacts(tmp_path):
+    (job,) = make_jobs(tmp_path, 1)
+    spec = JobSpec.from_job(7, job)
+    assert spec.job.files == []
+    assert spec.bundle == {"top.cpp": b"int top() { return 0; }\n"}
+
+    wd = tmp_path / "wd"
+    (wd / "prj" / "sol" / "syn" / "report").mkdir(parents=True)
+    (wd / "prj" / "sol" / "syn" / "report" / "csynth.xml").write_text("<xml/>")
+    (wd / "vitis_hls.log").write_text("log")
+    (wd / "prj" / "big.bin").write_bytes(b"\0" * 1024)
+    artifacts = collect_artifacts(wd, spec.artifacts)
+    assert sorted(artifacts) == ["prj/sol/syn/report/csynth.xml", "vitis_hls.log"]
+
+    out = tmp_path / "out"
+    write_artifacts(out, {**artifacts, "../escape.txt": b"x"})
+    assert (out / "prj" / "sol" / "syn" / "report" / "csynth.xml").read_text() == (
+        "<xml/>"
+    )
+    assert not (tmp_path / "escape.txt").exists()
+
+
+@pytest.mark.parametrize(
+    "sig", [signal.SIGSTOP, signal.SIGKILL], ids=["stopped", "killed"]
+)
+def test_job_server_requeues_jobs_of_lost_workers(tmp_path, sig):
+    # the first attempt at job_0 hangs, the retry on another worker is fast
+    claim_dir = tmp_path / "claim"
+    dist = make_stub_dist(
+        tmp_path,
+        f'cat top.cpp >> "$2"\n'
+        f'if [ "$(basename "$PWD")" = job_0 ] && mkdir "{claim_dir}" 2>/dev/null;'
+        f' then echo $$ > "{claim_dir}/pid"; exec sleep 60; fi\n'
+        "mkdir -p prj/sol/syn/report\n"
+        f'cp "{REPORT_FP}" prj/sol/syn/report/csynth.xml',
+    )
+    jobs = make_jobs(tmp_path, 4)
+
+    ctx = multiprocessing.get_context("spawn")
+    with JobServer(
+        tmp_path / "runs", AUTHKEY, heartbeat_timeout=1.0, poll_interval=0.05
+    ) as server:
+        workers = {
+            f"w{i}": ctx.Process(
+                target=run_worker,
+                args=(server.address, AUTHKEY, tmp_path / f"worker_{i}"),
+                kwargs={
+                    "tool_path": dist.vitis_hls_bin,
+                    "worker_id": f"w{i}",
+                    "heartbeat_interval": 0.1,
+                },
+            )
+            for i in range(3)
+        }
+        for p in workers.values():
+            p.start()
+        try:
+            for job in jobs:
+                server.submit(job)
+            deadline = time.monotonic() + 30
+            while "job_0" not in server.running or not claim_dir.exists():
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+            stalled = server.running["job_0"]
+            os.kill(workers[stalled].pid, sig)
+
+            results = {r.job.name: r for r in server.results()}
+        finally:
+            tool_pid = int((claim_dir / "pid").read_text())
+            os.kill(tool_pid, signal.SIGKILL)
+            workers[stalled].kill()
+
+    for p in workers.values():
+        p.join(timeout=10)
+        assert not p.is_alive()
+
+    assert sorted(results) == [job.name for job in jobs]
+    for i, job in enumerate(jobs):
+        r = results[job.name]
+        assert r.ok, r.error
+        assert r.job is job
+        assert r.wd == tmp_path / "runs" / job.name
+        assert r.report is not None
+        assert (r.wd / "prj" / "sol" / "syn" / "report" / "csynth.xml").exists()
+        assert f"return {i};" in (r.wd / "vitis_hls.log").read_text()
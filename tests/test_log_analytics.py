@@ -0,0 +1,66 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from libvhls.hls_logs import HLSLog  # noqa: E402
+from libvhls.log_analytics import (  # noqa: E402
+    LogTable,
+    analyze_log_tree,
+    summarize_log,
+)
+
+LOG_GOOD_PATH = Path(__file__).parent / "resources" / "logs" / "log_good.txt"
+
+
+@pytest.fixture
+def log_tree(tmp_path):
+    for i in range(4):
+        run_dir = tmp_path / "runs" / f"run_{i}"
+        run_dir.mkdir(parents=True)
+        shutil.copy(LOG_GOOD_PATH, run_dir / "vitis_hls.log")
+    (tmp_path / "runs" / "run_empty").mkdir()
+    (tmp_path / "runs" / "run_empty" / "vitis_hls.log").write_text(
+        "ERROR: [HLS 200-70] Compilation errors found\n"
+    )
+    return tmp_path / "runs"
+
+
+def test_analyze_log_tree(log_tree):
+    table = analyze_log_tree(log_tree, n_workers=2)
+    hls_log = HLSLog(LOG_GOOD_PATH.read_text())
+
+    assert len(table.runs) == 5
+    assert table.msg_id_counts.shape == (5, len(table.msg_ids))
+    assert table.msg_id_counts.dtype == np.int32
+
+    good = np.array(["run_empty" not in r for r in table.runs])
+    assert (table.msg_id_column("HLS 214-111")[good] == 1).all()
+    assert (table.msg_id_column("HLS 200-70") == ~good).all()
+    assert (table.msg_id_column("not an id") == 0).all()
+
+    errors = table.severity_counts[:, list(table.severities).index("ERROR")]
+    assert errors.tolist() == [0 if g else 1 for g in good]
+
+    binding = sum(r.elapsed for r in hls_log.runtimes() if r.phase == "Binding")
+    elapsed = table.phase_column("Binding")
+    assert np.allclose(elapsed[good], binding)
+    assert np.isnan(elapsed[~good]).all()
+
+
+def test_log_table_save_load(log_tree, tmp_path):
+    table = analyze_log_tree(log_tree, n_workers=1)
+    table.save(tmp_path / "table.npz")
+    loaded = LogTable.load(tmp_path / "table.npz")
+    assert (loaded.runs == table.runs).all()
+    assert (loaded.msg_id_counts == table.msg_id_counts).all()
+    assert np.array_equal(loaded.elapsed, table.elapsed, equal_nan=True)
+
+
+def test_summarize_unreadable_log(tmp_path):
+    summary = summarize_log(tmp_path / "missing.log")
+    assert summary.severity_counts == [0] * len(summary.severity_counts)
+    assert summary.msg_id_counts == {}
+    assert summary.runtimes == {}
@@ -2,7 +2,13 @@ from pathlib import Path
 
 import pytest
 
-from libvhls.hls_logs import HLSLog, RuntimeInfo
+from libvhls.hls_logs import (
+    HLSLog,
+    HLSLogIndex,
+    HLSLogStream,
+    LogSeverity,
+    RuntimeInfo,
+)
 
 LOG_GOOD_PATH = Path(__file__).parent / "resources" / "logs" / "log_good.txt"
 
@@ -164,3 +170,112 @@ def test_hls_log_regex_pattern():
     assert runtimes[0].cpu_user == 1.23
     assert runtimes[0].cpu_sys == 0.45
     assert runtimes[0].elapsed == 1.68
+
+
+def test_hls_log_parse_message():
+    """Test parsing a single log line into a structured message."""
+    line = "WARNING: [HLS 214-111] Static scalars and arrays (mm_design/mm.cpp:10:16)"
+    message = HLSLog.parse_message(line)
+    assert message is not None
+    assert message.severity == LogSeverity.WARNING
+    assert message.msg_id == "HLS 214-111"
+    assert message.text.startswith("Static scalars")
+
+    assert HLSLog.parse_message("Sourcing Tcl script 'run.tcl'") is None
+
+
+def test_hls_log_parse_runtime():
+    """Test parsing a single runtime line."""
+    line = (
+        "INFO: [HLS 200-111] Finished Binding: CPU user time: 0.02 seconds."
+        " CPU system time: 0 seconds. Elapsed time: 0.02 seconds;"
+        " current allocated memory: 0.000 MB."
+    )
+    runtime = HLSLog.parse_runtime(line)
+    assert runtime == RuntimeInfo(
+        phase="Binding", cpu_user=0.02, cpu_sys=0.0, elapsed=0.02
+    )
+    assert HLSLog.parse_runtime("INFO: [HLS 200-10] Checking synthesizability") is None
+
+
+def test_hls_log_stream_chunks_match_full_parse(log_good, hls_log):
+    """Test feeding the log in small chunks gives the same results as HLSLog."""
+    stream = HLSLogStream()
+    for i in range(0, len(log_good), 97):
+        stream.feed(log_good[i : i + 97])
+    stream.close()
+
+    assert stream.n_warnings == len(hls_log.warnings())
+    assert stream.n_errors == len(hls_log.errors())
+    assert stream.n_infos == len(hls_log.infos())
+    assert stream.runtimes == hls_log.runtimes()
+    assert stream.msg_id_counts["HLS 214-111"] == 1
+    assert stream.records[0].line_no == 10
+
+
+def test_hls_log_stream_follow(tmp_path, log_good):
+    """Test following a growing log file from a saved byte offset."""
+    log_path = tmp_path / "vitis_hls.log"
+    split = log_good.index("Finished Binding") + 20
+
+    log_path.write_text(log_good[:split])
+    stream = HLSLogStream()
+    first = stream.follow(log_path)
+    assert len(first) > 0
+    saved_offset, saved_line_no = stream.offset, stream.line_no
+    # the partial last line is left for the next poll
+    assert saved_offset < split
+
+    with open(log_path, "a") as f:
+        f.write(log_good[split:])
+
+    resumed = HLSLogStream(offset=saved_offset, line_no=saved_line_no)
+    second = resumed.follow(log_path)
+    assert len(first) + len(second) == len(HLSLogStream().follow(log_path))
+    assert stream.follow(log_path) == second
+    assert stream.follow(log_path) == []
+
+
+def test_hls_log_index_matches_hls_log(hls_log):
+    """Test the single-pass index agrees with the line-based accessors."""
+    index = hls_log.index()
+    counts = index.counts_by_severity()
+    assert counts[LogSeverity.WARNING] == len(hls_log.warnings())
+    assert counts[LogSeverity.ERROR] == len(hls_log.errors())
+    assert counts[LogSeverity.INFO] == len(hls_log.infos())
+    assert index.runtimes == hls_log.runtimes()
+    assert [
+        index.line(i) for i in index.records_with_severity(LogSeverity.WARNING)
+    ] == [line for line in hls_log.warnings()]
+
+
+def test_hls_log_index_catalogs():
+    """Test message-ID, source and phase lookups on the index."""
+    index = HLSLogIndex.from_file(LOG_GOOD_PATH)
+
+    assert index.counts_by_msg_id()["HLS 214-111"] == 1
+    msg_214 = index.messages(index.records_with_prefix("HLS 214-"))
+    assert len(msg_214) > 5
+    assert all(
+        m.msg_id is not None and m.msg_id.startswith("HLS 214-") for m in msg_214
+    )
+    assert {m.severity for m in msg_214} == {LogSeverity.INFO, LogSeverity.WARNING}
+
+    at_line_10 = index.messages(index.records_at_source("mm_design/mm.cpp", 10))
+    assert [m.msg_id for m in at_line_10] == ["HLS 214-111"]
+    assert len(index.records_at_source("mm_design/mm.cpp")) > 10
+
+    first_warning = index.records_with_msg_id("HLS 200-2053")[0]
+    assert index.phase_of(first_warning) == "File checks and directory preparation"
+    i = index.records_with_msg_id("HLS 214-111")[0]
+    assert index.phase_of(i) == "Source Code Analysis and Preprocessing"
+    index.close()
+
+
+def test_hls_log_index_empty(tmp_path):
+    """Test indexing an empty log file."""
+    empty = tmp_path / "empty.log"
+    empty.write_text("")
+    with HLSLogIndex.from_file(empty) as index:
+        assert len(index) == 0
+        assert index.counts_by_msg_id() == {}
@@ -0,0 +1,111 @@
+import shutil
+import time
+from pathlib import Path
+
+from libvhls.commands import UserTCL
+from libvhls.commands.commands import Runner, RunnerStatus
+from libvhls.hls_logs import LogMessage, LogSeverity
+from libvhls.monitor import LogMatch, MaxLatency, MaxResource, QoRMonitor
+from libvhls.synth_report import SynthesisReport
+from tests.utils import make_stub_dist
+
+REPORTS_DIR = Path(__file__).parent / "resources" / "reports" / "simple_mm"
+REPORT_DIR = Path("prj") / "sol" / "syn" / "report"
+
+
+def test_constraints():
+    report = SynthesisReport.parse_from_disk(REPORTS_DIR / "Loop_2_proc2_csynth.xml")
+    assert MaxLatency(10_000)("Loop_2_proc2", report) is None
+    assert "8194 cycles" in MaxLatency(8000)("Loop_2_proc2", report)
+    assert MaxLatency(8000, module="blockmatmul")("Loop_2_proc2", report) is None
+    assert MaxResource("DSP", 96)("Loop_2_proc2", report) is None
+    assert "uses 96 DSP" in MaxResource("DSP", 64)("Loop_2_proc2", report)
+
+    match = LogMatch("II = [0-9]+", msg_id="HLS 200-1470")
+    message = LogMessage(LogSeverity.INFO, "HLS 200-1470", "Pipelining result: II = 4")
+    assert match(message) == "Log message [HLS 200-1470]: Pipelining result: II = 4"
+    assert match(LogMessage(LogSeverity.INFO, "HLS 200-10", "II = 4")) is None
+
+
+def test_watch_skips_old_reports_and_logs(tmp_path):
+    report_dir = tmp_path / REPORT_DIR
+    report_dir.mkdir(parents=True)
+    shutil.copy(REPORTS_DIR / "Loop_2_proc2_csynth.xml", report_dir)
+    log_path = tmp_path / "vitis_hls.log"
+    log_path.write_text("ERROR: [HLS 200-999] left over from the last run\n")
+    monitor = QoRMonitor(
+        log_constraints=[LogMatch(msg_id="HLS 200-999")],
+        report_constraints=[MaxResource("DSP", 64)],
+    )
+
+    watch = monitor.watch(log_path, tmp_path)
+    assert watch.poll() is None
+
+    # module reports are checked as they appear, the top one is skipped
+    shutil.copy(REPORTS_DIR / "entry_proc_csynth.xml", report_dir)
+    shutil.copy(REPORTS_DIR / "csynth.xml", report_dir)
+    (report_dir / "blockmatmul_csynth.xml").write_text("<profile><Res")
+    assert watch.poll() is None
+    assert list(watch.reports) == ["entry_proc"]
+
+    shutil.copy(REPORTS_DIR / "blockmatmul_csynth.xml", report_dir)
+    assert "Module blockmatmul uses 96 DSP" in watch.poll()
+
+    watch = monitor.watch(log_path, tmp_path)
+    log_path.write_text("INFO: [HLS 200-10] Starting\n")
+    assert watch.poll() is None
+    with open(log_path, "a") as f:
+        f.write("ERROR: [HLS 200-999] something broke\n")
+    assert watch.poll() == "Log message [HLS 200-999]: something broke"
+
+
+def test_watch_skips_unparseable_reports(tmp_path, monkeypatch):
+    report_dir = tmp_path / REPORT_DIR
+    report_dir.mkdir(parents=True)
+    monitor = QoRMonitor(report_constraints=[MaxLatency(10)])
+    watch = monitor.watch(tmp_path / "vitis_hls.log", tmp_path)
+
+    parsed = []
+    parse = SynthesisReport.parse_from_disk
+    monkeypatch.setattr(
+        SynthesisReport,
+        "parse_from_disk",
+        lambda fp: parsed.append(fp.name) or parse(fp),
+    )
+    report = (REPORTS_DIR / "Loop_2_proc2_csynth.xml").read_text()
+    undef = report.replace(
+        "<Worst-caseLatency>8194</Worst-caseLatency>",
+        "<Worst-caseLatency>undef</Worst-caseLatency>",
+    )
+    (report_dir / "undef_csynth.xml").write_text(undef)
+    # an unparseable report is only tried once, a partial one until it is done
+    (report_dir / "partial_csynth.xml").write_text(report[: len(report) // 2])
+    assert watch.poll() is None
+    assert watch.poll() is None
+    assert sorted(parsed) == [
+        "partial_csynth.xml",
+        "partial_csynth.xml",
+        "undef_csynth.xml",
+    ]
+
+    (report_dir / "partial_csynth.xml").write_text(report)
+    assert "Module partial has a worst case latency of 8194" in watch.poll()
+
+
+def test_runner_aborts_on_violated_constraint(tmp_path):
+    dist = make_stub_dist(
+        tmp_path,
+        f"mkdir -p {REPORT_DIR}\n"
+        f'cp "{REPORTS_DIR / "entry_proc_csynth.xml"}" {REPORT_DIR}\n'
+        f'cp "{REPORTS_DIR / "Loop_2_proc2_csynth.xml"}" {REPORT_DIR}\n'
+        "sleep 60",
+    )
+    monitor = QoRMonitor(report_constraints=[MaxLatency(5000)])
+    runner = Runner(dist, tmp_path, poll_interval=0.05, monitors=[monitor])
+
+    start = time.monotonic()
+    result = runner.run([UserTCL("csynth_design")])
+    assert time.monotonic() - start < 10
+    assert result.status == RunnerStatus.ABORTED
+    assert result.reason is not None
+    assert result.reason.startswith("Module Loop_2_proc2 has a worst case latency")
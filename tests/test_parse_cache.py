@@ -0,0 +1,97 @@
+import os
+import shutil
+from pathlib import Path
+
+from libvhls.parse_cache import ParseCache
+from libvhls.project import HLSApp
+from libvhls.synth_report import SynthesisReport
+from tests.test_project import HLS_APP_ONE_SOLUTION
+
+REPORT_PATH = (
+    Path(__file__).parent / "resources" / "reports" / "simple_mm" / "csynth.xml"
+)
+
+
+class CountingParser:
+    def __init__(self):
+        self.n_calls = 0
+
+    def __call__(self, path: Path) -> SynthesisReport:
+        self.n_calls += 1
+        return SynthesisReport.parse_from_disk(path)
+
+
+def test_parse_cache_hits(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    report_fp = tmp_path / "csynth.xml"
+    shutil.copy(REPORT_PATH, report_fp)
+
+    parse = CountingParser()
+    first = cache.load(report_fp, parse)
+    second = cache.load(report_fp, parse)
+    assert parse.n_calls == 1
+    assert second == first == SynthesisReport.parse_from_disk(REPORT_PATH)
+
+    # touched but unchanged files hit on content
+    st = report_fp.stat()
+    os.utime(report_fp, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    cache.load(report_fp, parse)
+    assert parse.n_calls == 1
+
+    # changed files are parsed again
+    report_fp.write_text(
+        REPORT_PATH.read_text().replace("<DSP>96</DSP>", "<DSP>48</DSP>", 1)
+    )
+    changed = cache.load(report_fp, parse)
+    assert parse.n_calls == 2
+    assert changed.top_level_resource_data.used_abs["DSP"] == 48
+
+
+def test_parse_cache_parse_from_disk(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    hls_app_fp = tmp_path / "hls.app"
+    hls_app_fp.write_text(HLS_APP_ONE_SOLUTION)
+
+    assert HLSApp.parse_from_disk(hls_app_fp, cache=cache) == HLSApp.parse_from_disk(
+        hls_app_fp
+    )
+    assert SynthesisReport.parse_from_disk(
+        REPORT_PATH, cache=cache
+    ) == SynthesisReport.parse_from_disk(REPORT_PATH)
+    # cached again from disk by a fresh cache object
+    cache = ParseCache(tmp_path / "cache")
+    hls_app = HLSApp.parse_from_disk(hls_app_fp, cache=cache)
+    assert [s["name"] for s in hls_app.solutions] == ["solution1"]
+    assert len(list(cache.objects_dir.glob("*/*.pkl"))) == 2
+
+
+def test_parse_cache_eviction(tmp_path):
+    cache = ParseCache(tmp_path / "cache", max_bytes=0)
+    cache.load(REPORT_PATH, SynthesisReport.parse_from_disk)
+    assert list(cache.objects_dir.glob("*/*.pkl")) == []
+
+    # corrupt entries are treated as misses
+    cache = ParseCache(tmp_path / "cache")
+    report = cache.load(REPORT_PATH, SynthesisReport.parse_from_disk)
+    (object_fp,) = cache.objects_dir.glob("*/*.pkl")
+    object_fp.write_bytes(b"not a pickle")
+    assert cache.load(REPORT_PATH, SynthesisReport.parse_from_disk) == report
+
+
+def test_parse_cache_tracks_usage(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path / "cache")
+    hls_app_fp = tmp_path / "hls.app"
+    hls_app_fp.write_text(HLS_APP_ONE_SOLUTION)
+    cache.load(hls_app_fp, HLSApp.parse_from_disk)
+
+    def object_bytes() -> int:
+        return sum(fp.stat().st_size for fp in cache.objects_dir.glob("*/*.pkl"))
+
+    assert cache.usage.read() == object_bytes()
+
+    def no_scan():
+        raise AssertionError("evict scanned a cache under budget")
+
+    monkeypatch.setattr(cache, "evict", no_scan)
+    cache.load(REPORT_PATH, SynthesisReport.parse_from_disk)
+    assert cache.usage.read() == object_bytes()
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import (
+    AddFiles,
+    CosimDesign,
+    CsimDesign,
+    CsynthDesign,
+    OpenProject,
+    OpenSolution,
+    UserTCL,
+)
+from libvhls.commands.commands import Runner, RunnerResult
+from libvhls.dist import VitisHLSDist
+from libvhls.pipeline import Pipeline, PipelineStep, StepStatus
+
+SYN_OUTPUTS = ["prj/sol/syn/verilog/*"]
+
+
+class FakeVitisHLS:
+    """Records the steps it runs and writes outputs derived from the sources."""
+
+    def __init__(self, wd: Path) -> None:
+        self.wd = wd
+        self.dist = VitisHLSDist(Path("/opt/Vitis_HLS/2024.1"))
+        self.runner = Runner(self.dist, wd)
+        self.ran: list[str] = []
+        self.fail: set[str] = set()
+
+    def run(self, commands) -> RunnerResult:
+        step = commands[-1].compose(self.dist, self.wd).split()[0]
+        self.ran.append(step)
+        if step == "csynth_design":
+            out = self.wd / "prj" / "sol" / "syn" / "verilog" / "top.v"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(f"// rtl for {(self.wd / 'top.cpp').read_text()}")
+        returncode = 1 if step in self.fail else 0
+        script = self.runner.build_script(commands)
+        return RunnerResult(commands, script, returncode, "", "", "")
+
+
+def make_pipeline(wd: Path) -> tuple[FakeVitisHLS, Pipeline]:
+    (wd / "top.cpp").write_text("int top() { return 1; }")
+    (wd / "tb.cpp").write_text("int main() { return top() != 1; }")
+    vhls = FakeVitisHLS(wd)
+    setup = [
+        OpenProject("prj"),
+        AddFiles([Path("top.cpp")]),
+        AddFiles([Path("tb.cpp")], tb=True),
+        OpenSolution("sol"),
+    ]
+    steps = [
+        PipelineStep("csim", [CsimDesign()], inputs=[Path("top.cpp"), Path("tb.cpp")]),
+        PipelineStep(
+            "csynth", [CsynthDesign()], inputs=[Path("top.cpp")], outputs=SYN_OUTPUTS
+        ),
+        PipelineStep(
+            "cosim", [CosimDesign()], inputs=[Path("tb.cpp")], deps=["csynth"]
+        ),
+        PipelineStep(
+            "export", [UserTCL("export_design -format ip_catalog")], deps=["csynth"]
+        ),
+    ]
+    return vhls, Pipeline(vhls, setup, steps)  # type: ignore[arg-type]
+
+
+def test_pipeline_skips_unchanged_steps(tmp_path):
+    vhls, pipeline = make_pipeline(tmp_path)
+    all_steps = ["csim_design", "csynth_design", "cosim_design", "export_design"]
+
+    results = pipeline.run()
+    assert [r.status for r in results] == [StepStatus.RAN] * 4
+    assert vhls.ran == all_steps
+
+    vhls.ran.clear()
+    results = pipeline.run()
+    assert [r.status for r in results] == [StepStatus.UP_TO_DATE] * 4
+    assert vhls.ran == []
+
+    # testbench edits rerun csim and cosim only
+    (tmp_path / "tb.cpp").write_text("int main() { return top() != 2; }")
+    pipeline.run()
+    assert vhls.ran == ["csim_design", "cosim_design"]
+
+    # source edits rerun everything downstream of csynth
+    vhls.ran.clear()
+    (tmp_path / "top.cpp").write_text("int top() { return 2; }")
+    pipeline.run()
+    assert vhls.ran == all_steps
+
+    # lost outputs rerun the step that made them
+    vhls.ran.clear()
+    (tmp_path / "prj" / "sol" / "syn" / "verilog" / "top.v").unlink()
+    pipeline.run()
+    assert vhls.ran == ["csynth_design"]
+
+
+def test_pipeline_hashes_added_files(tmp_path):
+    vhls, pipeline = make_pipeline(tmp_path)
+    (tmp_path / "extra.tcl").write_text("set x 1")
+    pipeline.steps["csynth"].inputs = []
+    pipeline.steps["export"].commands = [
+        AddFiles([Path("extra.tcl")]),
+        UserTCL("export_design -format ip_catalog"),
+    ]
+    pipeline.run()
+
+    # design sources added in setup are inputs of every step
+    vhls.ran.clear()
+    (tmp_path / "top.cpp").write_text("int top() { return 2; }")
+    pipeline.run()
+    assert "csynth_design" in vhls.ran
+
+    # files added by a step are its inputs, testbenches in setup are not
+    vhls.ran.clear()
+    (tmp_path / "extra.tcl").write_text("set x 2")
+    (tmp_path / "tb.cpp").write_text("int main() { return top() != 2; }")
+    pipeline.run()
+    assert vhls.ran == ["csim_design", "cosim_design", "export_design"]
+
+
+def test_pipeline_failures_block_downstream(tmp_path):
+    vhls, pipeline = make_pipeline(tmp_path)
+    vhls.fail.add("csynth_design")
+
+    results = {r.step.name: r.status for r in pipeline.run()}
+    assert results == {
+        "csim": StepStatus.RAN,
+        "csynth": StepStatus.FAILED,
+        "cosim": StepStatus.BLOCKED,
+        "export": StepStatus.BLOCKED,
+    }
+
+    vhls.fail.clear()
+    vhls.ran.clear()
+    pipeline.run()
+    assert vhls.ran == ["csynth_design", "cosim_design", "export_design"]
+
+
+def test_pipeline_order_and_validation(tmp_path):
+    steps = [
+        PipelineStep("b", [], deps=["a"]),
+        PipelineStep("c", []),
+        PipelineStep("a", []),
+    ]
+    assert Pipeline.topological_order(steps) == ["c", "a", "b"]
+    vhls = FakeVitisHLS(tmp_path)
+    with pytest.raises(ValueError):
+        Pipeline(vhls, [], [PipelineStep("a", [], deps=["b"])])  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        Pipeline.topological_order(
+            [PipelineStep("a", [], deps=["b"]), PipelineStep("b", [], deps=["a"])]
+        )
@@ -1,4 +1,5 @@
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from rich.pretty import pprint as pp
@@ -15,7 +16,7 @@ from libvhls.commands import (
     UserTCL,
 )
 from libvhls.logging_config import configure_logging
-from libvhls.project import Project
+from libvhls.project import HLSApp, Project, SolutionSettings
 from libvhls.vitis_hls import VitisHLS
 from tests.utils import check_command_otuput_generic
 
@@ -84,3 +85,127 @@ def test_project_csynth(tmp_path):
     r = vhls.run(commands)
     pp(r)
     check_command_otuput_generic(tmp_path, r)
+
+
+HLS_APP_ONE_SOLUTION = """<?xml version="1.0" encoding="UTF-8"?>
+<AutoPilot:project xmlns:AutoPilot="com.autoesl.autopilot.project"
+    projectType="C/C++" top="blockmatmul" name="test_project">
+    <files>
+        <file name="../mm_design/mm.cpp" sc="0" tb="false" cflags="" csimflags=""
+            blackbox="false"/>
+    </files>
+    <solutions>
+        <solution name="solution1" status="active"/>
+    </solutions>
+</AutoPilot:project>
+"""
+
+SOLUTION_APS = """<?xml version="1.0" encoding="UTF-8"?>
+<AutoPilot:solution xmlns:AutoPilot="com.autoesl.autopilot.solution">
+    <solutionInfo>
+        <option name="flow_target" value="vitis"/>
+    </solutionInfo>
+    <config/>
+    <targetInfo>
+        <TargetInfo value="xcvu9p-flgb2104-2-i"/>
+    </targetInfo>
+    <clockList>
+        <clock name="clk" period="3.33" default="false"/>
+    </clockList>
+    <directives/>
+</AutoPilot:solution>
+"""
+
+
+def test_project_sync_solutions(tmp_path):
+    project_dir = tmp_path / "test_project"
+    project_dir.mkdir()
+    (project_dir / "hls.app").write_text(HLS_APP_ONE_SOLUTION)
+    for name in ["solution1", "solution2"]:
+        (project_dir / name).mkdir()
+        (project_dir / name / f"{name}.aps").write_text("")
+    (project_dir / "not_a_solution").mkdir()
+
+    p = Project.parse_from_disk(project_dir)
+    assert [s["name"] for s in p.hls_app.solutions] == ["solution1"]
+
+    added = p.sync_solutions()
+    assert added == ["solution2"]
+    assert [s["name"] for s in p.hls_app.solutions] == ["solution1", "solution2"]
+    assert p.hls_app.top == "blockmatmul"
+    assert p.hls_app.files[0].name == "../mm_design/mm.cpp"
+    assert "AutoPilot:project" in (project_dir / "hls.app").read_text()
+
+    assert p.sync_solutions() == []
+
+
+def test_project_concurrent_solutions(tmp_path):
+    mm_design_dir = tmp_path / "mm_design"
+    mm_design_dir.mkdir()
+    for f in MM_DESIGN_DIR.iterdir():
+        shutil.copy(f, mm_design_dir / f.name)
+
+    vhls = VitisHLS(wd=tmp_path, enable_logging=True)
+    r = vhls.run(
+        [
+            OpenProject("test_project", reset=True),
+            AddFiles([mm_design_dir / "mm.cpp", mm_design_dir / "mm.h"]),
+            SetTop("blockmatmul"),
+        ]
+    )
+    check_command_otuput_generic(tmp_path, r)
+
+    vhls = VitisHLS(wd=tmp_path, enable_logging=True, isolate=True, shared_project=True)
+
+    def run_solution(period: str):
+        return vhls.run(
+            [
+                OpenProject("test_project"),
+                OpenSolution(f"solution_{period}", flow_target="vitis", reset=True),
+                CreateClock("clk", period),
+                SetPart("xcvu9p-flgb2104-2-i"),
+                CsynthDesign(),
+            ]
+        )
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(run_solution, ["3.33", "5.0"]))
+
+    assert results[0].run_id != results[1].run_id
+    for r in results:
+        assert r.returncode == 0
+        assert r.log_path is not None and r.log_path.exists()
+        assert r.log_path.parent != tmp_path
+
+    p = Project.parse_from_disk(tmp_path / "test_project")
+    names = {s["name"] for s in p.hls_app.solutions}
+    assert {"solution_3.33", "solution_5.0"} <= names
+
+
+def test_project_files_written_from_threads(tmp_path):
+    hls_app_fp = tmp_path / "hls.app"
+    hls_app_fp.write_text(HLS_APP_ONE_SOLUTION)
+    aps_fp = tmp_path / "solution1.aps"
+    aps_fp.write_text(SOLUTION_APS)
+    hls_app = HLSApp.parse_from_disk(hls_app_fp)
+    settings = SolutionSettings.parse_from_disk(aps_fp)
+
+    # both file types use the AutoPilot prefix for different namespaces
+    def write(i: int) -> None:
+        if i % 2 == 0:
+            hls_app.write_to_disk(hls_app_fp)
+        else:
+            settings.write_to_disk(aps_fp)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(write, range(400)))
+
+    hls_app_text = hls_app_fp.read_text()
+    assert "<AutoPilot:project" in hls_app_text
+    assert 'xmlns:AutoPilot="com.autoesl.autopilot.project"' in hls_app_text
+    aps_text = aps_fp.read_text()
+    assert "<AutoPilot:solution" in aps_text
+    assert 'xmlns:AutoPilot="com.autoesl.autopilot.solution"' in aps_text
+    assert "ns0" not in hls_app_text + aps_text
+    assert HLSApp.parse_from_disk(hls_app_fp) == hls_app
+    assert SolutionSettings.parse_from_disk(aps_fp) == settings
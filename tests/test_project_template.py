@@ -0,0 +1,114 @@
+import shutil
+from pathlib import Path
+
+from libvhls.commands import (
+    AddFiles,
+    CreateClock,
+    CsynthDesign,
+    OpenProject,
+    OpenSolution,
+    SetPart,
+    SetTop,
+)
+from libvhls.project import Clock, Project, ProjectFiles, SolutionSettings
+from libvhls.project_template import ProjectTemplate, ProjectVariant, clone_file
+from libvhls.synth_report import SynthesisReport
+from libvhls.vitis_hls import VitisHLS
+from tests.test_project import HLS_APP_ONE_SOLUTION, MM_DESIGN_DIR, SOLUTION_APS
+
+
+def make_template(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "template" / "test_project"
+    solution_dir = project_dir / "solution1"
+    (solution_dir / ".autopilot" / "db").mkdir(parents=True)
+    (project_dir / "hls.app").write_text(HLS_APP_ONE_SOLUTION)
+    (project_dir / ".libvhls.lock").write_text("")
+    (solution_dir / "solution1.aps").write_text(SOLUTION_APS)
+    (solution_dir / "directives.tcl").write_text("")
+    (solution_dir / ".autopilot" / "db" / "mm.bc").write_bytes(b"\0" * 4096)
+    return project_dir
+
+
+def test_clone_shares_files_and_patches_settings(tmp_path):
+    template = ProjectTemplate(make_template(tmp_path))
+    variant = ProjectVariant(
+        top="blockmatmul_v2",
+        files=[ProjectFiles("../src/mm_v2.cpp", "0", "false", "", "", "false")],
+        part="xcu50-fsvh2104-2-e",
+        clock_period="5.0",
+    )
+    clone = template.clone(tmp_path / "variant_a" / "prj", variant, link="hardlink")
+
+    shared = Path("solution1") / ".autopilot" / "db" / "mm.bc"
+    assert (clone.dir / shared).stat().st_ino == (template.dir / shared).stat().st_ino
+    aps = Path("solution1") / "solution1.aps"
+    assert (clone.dir / aps).stat().st_ino != (template.dir / aps).stat().st_ino
+    assert not (clone.dir / ".libvhls.lock").exists()
+
+    reparsed = Project.parse_from_disk(clone.dir)
+    assert reparsed.hls_app == clone.hls_app
+    assert reparsed.hls_app.name == "prj"
+    assert reparsed.hls_app.top == "blockmatmul_v2"
+    assert [f.name for f in reparsed.hls_app.files] == ["../src/mm_v2.cpp"]
+    assert [s["name"] for s in reparsed.hls_app.solutions] == ["solution1"]
+    assert reparsed.solution_settings("solution1") == SolutionSettings(
+        "xcu50-fsvh2104-2-e", [Clock("clk", "5.0")]
+    )
+    assert "AutoPilot:project" in (clone.dir / "hls.app").read_text()
+    aps_text = (clone.dir / aps).read_text()
+    assert 'xmlns:AutoPilot="com.autoesl.autopilot.solution"' in aps_text
+    assert 'name="flow_target"' in aps_text
+
+    # the template is left alone
+    assert template.project.hls_app.top == "blockmatmul"
+    assert (template.dir / aps).read_text() == SOLUTION_APS
+
+    # cloning again replaces the old clone, copies share nothing
+    clone = template.clone(tmp_path / "variant_a" / "prj", link="copy")
+    assert clone.hls_app.top == "blockmatmul"
+    assert (clone.dir / shared).stat().st_ino != (template.dir / shared).stat().st_ino
+    assert clone.solution_settings("solution1").clocks == [Clock("clk", "3.33")]
+
+
+def test_clone_file_never_hardlinks_by_default(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"\0" * 4096)
+    mode = clone_file(src, tmp_path / "auto.bin", "auto")
+    assert mode in ("reflink", "copy")
+    assert (tmp_path / "auto.bin").stat().st_ino != src.stat().st_ino
+    assert (tmp_path / "auto.bin").read_bytes() == src.read_bytes()
+
+    assert clone_file(src, tmp_path / "hard.bin", "hardlink") == "hardlink"
+    assert (tmp_path / "hard.bin").stat().st_ino == src.stat().st_ino
+
+
+def test_template_clock_sweep(tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for f in MM_DESIGN_DIR.iterdir():
+        shutil.copy(f, src_dir / f.name)
+
+    template = ProjectTemplate.build(
+        VitisHLS(wd=tmp_path / "template", enable_logging=True),
+        [
+            OpenProject("prj", reset=True),
+            AddFiles([src_dir / "mm.cpp", src_dir / "mm.h"]),
+            OpenSolution("sol", flow_target="vitis", reset=True),
+            SetPart("xcvu9p-flgb2104-2-i"),
+            CreateClock("clk", "3.33"),
+            SetTop("blockmatmul"),
+        ],
+    )
+    periods = []
+    for period in ["3.33", "5.0"]:
+        wd = tmp_path / f"clk_{period}"
+        template.clone(wd / "prj", ProjectVariant(clock_period=period))
+        r = VitisHLS(wd=wd).run(
+            [OpenProject("prj"), OpenSolution("sol"), CsynthDesign()]
+        )
+        assert r.returncode == 0
+        report = SynthesisReport.parse_from_disk(
+            wd / "prj" / "sol" / "syn" / "report" / "csynth.xml"
+        )
+        periods.append(report.top_level_latency_data.clock_period)
+    assert periods[0] < periods[1]
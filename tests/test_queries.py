@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from libvhls.commands import (
+    GetClockPeriod,
+    GetFiles,
+    GetPart,
+    GetProject,
+    GetSolution,
+    GetTop,
+    OpenProject,
+    OpenSolution,
+    Query,
+)
+from libvhls.commands.commands import Runner, RunnerResult
+from libvhls.dist import VitisHLSDist
+from libvhls.queries import (
+    parse_query_output,
+    query_commands,
+    run_queries,
+    split_tcl_list,
+)
+from libvhls.vitis_hls import VitisHLS
+
+
+def marker(key: str, rc: int, value: str) -> str:
+    return f"@@LIBVHLS_QUERY@@ {key} {rc} {value.encode().hex()}\n"
+
+
+def test_split_tcl_list():
+    assert split_tcl_list("") == []
+    assert split_tcl_list("a b  c") == ["a", "b", "c"]
+    assert split_tcl_list("{a b} c {} {x {y z}}") == ["a b", "c", "", "x {y z}"]
+    assert split_tcl_list('"a b" c\\ d') == ["a b", "c d"]
+
+
+def test_parse_query_output():
+    queries = [
+        GetPart(),
+        GetClockPeriod(),
+        GetFiles(),
+        GetProject(solutions=True),
+        GetSolution(json=True),
+        GetTop(),
+        GetTop(),
+    ]
+    log = (
+        "INFO: [HLS 200-10] Opening project 'prj'\n"
+        + marker("q0", 0, "xcvu9p-flgb2104-2-i")
+        + marker("q1", 0, "3.33")
+        + marker("q2", 0, "mm.cpp {dir with space/mm.h}")
+        + marker("q3", 0, "solution1 solution2")
+        + marker("q4", 0, '{"name": "solution1", "flow": "vitis"}')
+        + marker("q5", 1, "no top function set\nmulti-line error")
+    )
+    result = RunnerResult(queries, "", 0, "", "", log)
+
+    results = parse_query_output(queries, result)
+    assert [r.value for r in results[:5]] == [
+        "xcvu9p-flgb2104-2-i",
+        3.33,
+        ["mm.cpp", "dir with space/mm.h"],
+        ["solution1", "solution2"],
+        {"name": "solution1", "flow": "vitis"},
+    ]
+    assert all(r.ok for r in results[:5])
+    assert results[5].error == "no top function set\nmulti-line error"
+    assert not results[6].ok
+
+
+def test_query_compose():
+    runner = Runner(VitisHLSDist(Path("/opt/Vitis_HLS/2024.1")), Path("/tmp/wd"))
+    script = runner.build_script(query_commands([GetPart(), GetFiles(fullpath=True)]))
+    assert "catch {get_part} __libvhls_val" in script
+    assert "catch {get_files -fullpath} __libvhls_val" in script
+    assert '"@@LIBVHLS_QUERY@@ q1 $__libvhls_rc $__libvhls_hex"' in script
+    assert isinstance(query_commands([GetTop()])[0], Query)
+
+
+def test_run_queries(tmp_path):
+    vhls = VitisHLS(wd=tmp_path, enable_logging=True)
+    results = run_queries(
+        vhls,
+        [GetProject(name=True), GetSolution(name=True), GetClockPeriod()],
+        setup=[OpenProject("prj", reset=True), OpenSolution("sol", reset=True)],
+    )
+    assert [r.value for r in results[:2]] == ["prj", "sol"]
+    assert isinstance(results[2].value, float)
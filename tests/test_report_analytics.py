@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from libvhls.report_analytics import (  # noqa: E402
+    REPORT_DTYPE,
+    load_report_tree,
+    load_reports,
+    pareto_mask,
+    pareto_ranks,
+    used_percent,
+)
+from libvhls.synth_report import SynthesisReport  # noqa: E402
+
+REPORT_DIR = Path(__file__).parent / "resources" / "reports" / "simple_mm"
+
+
+def test_load_reports_matches_parse_from_disk(tmp_path):
+    paths = sorted(REPORT_DIR.glob("*.xml")) + [tmp_path / "missing.xml"]
+    reports = load_reports(paths, n_workers=2, chunksize=2)
+
+    assert reports.dtype == REPORT_DTYPE
+    assert len(reports) == len(paths)
+    assert reports["valid"].tolist() == [True] * (len(paths) - 1) + [False]
+
+    for row, path in zip(reports[:-1], paths[:-1]):
+        report = SynthesisReport.parse_from_disk(path)
+        latency = report.top_level_latency_data
+        resources = report.top_level_resource_data
+        assert row["clock_period"] == latency.clock_period
+        assert row["average_case_latency_c"] == latency.average_case_latency_c
+        assert row["worst_case_latency_t"] == pytest.approx(
+            latency.worst_case_latency_t
+        )
+        for r in resources.resource_types:
+            assert row[f"used_{r}"] == resources.used_abs[r]
+            assert row[f"available_{r}"] == resources.available_abs[r]
+
+    dsp = used_percent(reports, "DSP")
+    assert dsp[paths.index(REPORT_DIR / "csynth.xml")] == pytest.approx(96 / 6840)
+    assert np.isnan(dsp[-1])
+
+
+def test_load_report_tree(tmp_path):
+    for i in range(3):
+        report_dir = tmp_path / f"run_{i}" / "solution1" / "syn" / "report"
+        report_dir.mkdir(parents=True)
+        shutil.copy(REPORT_DIR / "csynth.xml", report_dir / "csynth.xml")
+    (tmp_path / "run_bad").mkdir()
+    (tmp_path / "run_bad" / "csynth.xml").write_text("<profile>")
+
+    paths, reports = load_report_tree(tmp_path, n_workers=1)
+    assert [p.parts[-5] for p in paths[:3]] == ["run_0", "run_1", "run_2"]
+    assert reports["valid"].tolist() == [True, True, True, False]
+    assert (reports["average_case_latency_c"][:3] == 8260).all()
+
+
+def test_pareto_mask():
+    costs = np.array(
+        [
+            [1.0, 5.0],
+            [2.0, 2.0],
+            [3.0, 3.0],
+            [5.0, 1.0],
+            [2.0, 2.0],
+            [np.nan, 0.0],
+        ]
+    )
+    assert pareto_mask(costs).tolist() == [True, True, False, True, True, False]
+    assert pareto_ranks(costs).tolist() == [0, 0, 1, 0, 0, 2]
@@ -0,0 +1,101 @@
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from libvhls.commands.commands import RunnerResult, RunnerStatus
+from libvhls.executor import HLSJob, HLSJobResult
+from libvhls.report_analytics import used_percent
+from libvhls.result_store import ResultStore
+from libvhls.synth_report import SynthesisReport, TopLevelLatencyData
+
+REPORT_FP = Path(__file__).parent / "resources" / "reports" / "simple_mm" / "csynth.xml"
+
+
+def make_job_result(name: str, latency: int, lut: int, ok: bool = True):
+    report = SynthesisReport.parse_from_disk(REPORT_FP)
+    resources = report.top_level_resource_data
+    resources.used_abs["LUT"] = lut
+    report = replace(
+        report,
+        top_level_latency_data=TopLevelLatencyData(
+            report.top_level_latency_data.clock_period,
+            latency,
+            latency,
+            latency,
+            None,
+            None,
+            None,
+        ),
+    )
+    result = RunnerResult(
+        [],
+        f"# script of {name}",
+        0 if ok else 1,
+        f"stdout of {name}",
+        "",
+        f"INFO: [HLS 200-10] log of {name}\n" * 100,
+    )
+    return HLSJobResult(
+        HLSJob(name, []), Path(name), result=result, report=report if ok else None
+    )
+
+
+def test_result_store_append_and_query(tmp_path):
+    available = SynthesisReport.parse_from_disk(
+        REPORT_FP
+    ).top_level_resource_data.available_abs["LUT"]
+    designs = [
+        ("a", 300, available // 4),
+        ("b", 100, available // 3),
+        ("c", 200, available - 1),
+        ("d", 400, available // 10),
+        ("e", 50, available // 5),
+    ]
+    with ResultStore(tmp_path / "store", chunk_rows=2) as store:
+        for name, latency, lut in designs:
+            store.add_job_result(make_job_result(name, latency, lut))
+        # two chunks on disk, the last row still buffered
+        assert store.n_chunks == 2
+        assert len(store) == 5
+        store.add_job_result(make_job_result("f", 10, 0, ok=False))
+        store.add("g", None)
+
+    store = ResultStore(tmp_path / "store")
+    table = store.table()
+    assert len(table) == 7
+    assert store.names().tolist() == list("abcdefg")
+    assert table["valid"].tolist() == [True] * 5 + [False] * 2
+    assert table["status"][5] == RunnerStatus.FAIL.value
+    assert table["status"][6] == 0
+
+    rows = store.select(
+        table["valid"] & (used_percent(table, "LUT") < 0.5), "worst_case_latency_c"
+    )
+    assert store.names()[rows].tolist() == ["e", "b", "a", "d"]
+    rows = store.select(table["valid"], "worst_case_latency_c", descending=True)
+    assert store.names()[rows].tolist() == ["d", "a", "c", "b", "e"]
+    # invalid rows hold a latency of -1 but still come last
+    rows = store.select(sort_by="worst_case_latency_c")
+    assert store.names()[rows].tolist() == list("ebcadfg")
+
+    texts = store.texts(4)
+    assert texts["stdout"] == "stdout of e"
+    assert texts["log"].count("log of e") == 100
+    assert texts["reason"] is None
+    assert store.texts(6) == {}
+    # logs are stored compressed
+    assert (tmp_path / "store" / "blobs.bin").stat().st_size < 7 * 3000
+
+
+def test_result_store_ignores_incomplete_chunks(tmp_path):
+    store = ResultStore(tmp_path / "store", chunk_rows=1)
+    store.add_job_result(make_job_result("a", 1, 1))
+    # a crash after writing the names of the next chunk but not its rows
+    np.save(store.names_path(1), np.array(["b"]))
+
+    store = ResultStore(tmp_path / "store", chunk_rows=1)
+    assert store.names().tolist() == ["a"]
+    store.add_job_result(make_job_result("c", 1, 1))
+    assert store.names().tolist() == ["a", "c"]
+    assert store.texts(1)["stdout"] == "stdout of c"
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import UserTCL
+from libvhls.commands.commands import Runner, RunnerResult, RunnerStatus
+from tests.utils import make_stub_dist
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # reaped zombies of other parents still answer signals
+    stat = Path(f"/proc/{pid}/stat")
+    return not (stat.exists() and stat.read_text().split(") ")[1].startswith("Z"))
+
+
+def test_runner_success_and_check(tmp_path):
+    dist = make_stub_dist(tmp_path, "echo hello\nexit 0")
+    runner = Runner(dist, tmp_path, poll_interval=0.05)
+    result = runner.run([UserTCL("puts hi")], check=True)
+    assert result.status == RunnerStatus.SUCCESS
+    assert result.stdout == "hello\n"
+    assert result.log == "stub tool started\n"
+
+    dist = make_stub_dist(tmp_path / "failing", "exit 3")
+    runner = Runner(dist, tmp_path, poll_interval=0.05)
+    assert runner.run([UserTCL("puts hi")]).status == RunnerStatus.FAIL
+    with pytest.raises(RuntimeError):
+        runner.run([UserTCL("puts hi")], check=True)
+
+
+def test_runner_timeout_kills_process_group(tmp_path):
+    child_pid_fp = tmp_path / "child.pid"
+    dist = make_stub_dist(
+        tmp_path,
+        f'sleep 60 &\necho $! > "{child_pid_fp}"\nwait',
+    )
+    runner = Runner(dist, tmp_path, timeout=0.5, poll_interval=0.05)
+
+    start = time.monotonic()
+    result = runner.run([UserTCL("puts hi")])
+    assert time.monotonic() - start < 10
+
+    assert result.status == RunnerStatus.TIMEOUT
+    assert result.reason is not None and "Timed out" in result.reason
+    assert result.returncode != 0
+    child_pid = int(child_pid_fp.read_text())
+    assert not pid_alive(child_pid)
+
+
+@pytest.mark.skipif(not Path("/proc").exists(), reason="needs /proc")
+def test_runner_rss_limit(tmp_path):
+    dist = make_stub_dist(
+        tmp_path,
+        f'"{sys.executable}" -c "import time; x = bytearray(200 << 20); '
+        'x[::4096] = b\\"x\\" * len(x[::4096]); time.sleep(60)"',
+    )
+    runner = Runner(dist, tmp_path, max_rss_mb=100, poll_interval=0.05)
+    result = runner.run([UserTCL("puts hi")])
+    assert result.status == RunnerStatus.OOM
+
+
+def test_runner_memory_rlimit(tmp_path):
+    dist = make_stub_dist(
+        tmp_path,
+        f'"{sys.executable}" -c "bytearray(2 << 30)"',
+    )
+    runner = Runner(dist, tmp_path, max_memory_mb=512, poll_interval=0.05)
+    result = runner.run([UserTCL("puts hi")])
+    assert result.status == RunnerStatus.OOM
+    assert "MemoryError" in result.stderr
+
+
+def test_runner_sigkill_is_not_oom(tmp_path):
+    dist = make_stub_dist(tmp_path, "kill -KILL $$")
+    runner = Runner(dist, tmp_path, poll_interval=0.05)
+    result = runner.run([UserTCL("puts hi")])
+    assert result.returncode == -9
+    assert result.termination is None
+    assert result.status == RunnerStatus.FAIL
+
+
+def test_runner_async_timeout(tmp_path):
+    dist = make_stub_dist(tmp_path, "echo started\nsleep 60")
+    runner = Runner(dist, tmp_path, timeout=0.5, poll_interval=0.05)
+    result = asyncio.run(runner.run_async([UserTCL("puts hi")]))
+    assert result.status == RunnerStatus.TIMEOUT
+    assert result.stdout == "started\n"
+
+
+def test_runner_async_cancel(tmp_path):
+    child_pid_fp = tmp_path / "child.pid"
+    dist = make_stub_dist(
+        tmp_path,
+        f'sleep 60 &\necho $! > "{child_pid_fp}"\necho started\nwait',
+    )
+    runner = Runner(dist, tmp_path, poll_interval=0.05)
+
+    async def run():
+        run = await runner.start_async([UserTCL("puts hi")])
+        task = asyncio.create_task(run.wait())
+        async for _ in run.events():
+            break
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return run
+
+    run = asyncio.run(run())
+    assert run.proc.returncode is not None
+    assert not pid_alive(int(child_pid_fp.read_text()))
+    assert not run.script_fp.exists()
+
+
+def test_slim_runner_result(tmp_path):
+    log_text = "INFO: [HLS 200-10] résumé\n" * 10_000
+    result = RunnerResult(
+        [UserTCL("puts hi")],
+        "puts hi\n",
+        1,
+        "hello\n",
+        "oops\n",
+        log_text,
+        run_id="run",
+        termination=RunnerStatus.TIMEOUT,
+        reason="Timed out",
+    )
+    slim = result.slim(tmp_path / "run" / "result.txt")
+    assert slim.status == RunnerStatus.TIMEOUT
+
+    data = pickle.dumps(slim)
+    assert len(data) < 1000
+    assert len(pickle.dumps(result)) > len(log_text)
+    slim.log  # cached texts are not pickled
+    assert len(pickle.dumps(slim)) == len(data)
+
+    copy = pickle.loads(data)
+    assert copy.log == log_text
+    assert copy.stdout == "hello\n"
+    assert copy.load() == result
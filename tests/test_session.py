@@ -0,0 +1,112 @@
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import OpenProject, UserTCL
+from libvhls.commands.commands import Runner, RunnerStatus
+from libvhls.dist import VitisHLSDist
+from libvhls.logging_config import configure_logging
+from libvhls.monitor import LogMatch, QoRMonitor
+from libvhls.session import SessionPool
+from libvhls.vitis_hls import VitisHLS
+from tests.utils import make_stub_dist
+
+configure_logging(True)
+
+
+def test_session_pool_batches(tmp_path):
+    dist = VitisHLSDist.auto_find()
+    with SessionPool(dist, tmp_path / "pool", size=1, max_jobs=2) as pool:
+        vhls = VitisHLS(wd=tmp_path, enable_logging=True, session_pool=pool)
+
+        results = [vhls.run([UserTCL(f'puts "Hello {i}"')]) for i in range(3)]
+
+        for i, r in enumerate(results):
+            assert r.returncode == 0
+            assert f"Hello {i}" in r.stdout
+            # each batch only sees its own output
+            for j in range(3):
+                if j != i:
+                    assert f"Hello {j}" not in r.stdout
+
+
+def test_session_pool_project(tmp_path):
+    dist = VitisHLSDist.auto_find()
+    with SessionPool(dist, tmp_path / "pool") as pool:
+        vhls = VitisHLS(wd=tmp_path, enable_logging=True, session_pool=pool)
+        r = vhls.run([OpenProject("test_project", reset=True)])
+        assert r.returncode == 0
+        assert (tmp_path / "test_project").exists()
+
+        r = vhls.run([UserTCL("error boom")])
+        assert r.returncode != 0
+
+
+requires_tclsh = pytest.mark.skipif(shutil.which("tclsh") is None, reason="needs tclsh")
+
+
+@requires_tclsh
+def test_session_relative_paths(tmp_path, monkeypatch):
+    # tclsh stands in for the interactive tool
+    dist = make_stub_dist(tmp_path, "exec tclsh")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "work").mkdir()
+    runner = Runner(dist, Path("work"))
+    with SessionPool(dist, Path("pool"), start_timeout=30) as pool:
+        for _ in range(2):
+            r = pool.run(runner, [UserTCL("puts [pwd]")])
+            assert r.returncode == 0
+            assert str((tmp_path / "work").resolve()) in r.stdout
+
+        r = pool.run(runner, [UserTCL("exit 3")])
+        assert r.returncode == 3
+        r = pool.run(runner, [UserTCL('puts "restarted"')])
+        assert r.returncode == 0
+        assert "restarted" in r.stdout
+
+
+def test_session_start_timeout(tmp_path):
+    dist = make_stub_dist(tmp_path, "sleep 60")
+    runner = Runner(dist, tmp_path)
+    with SessionPool(dist, tmp_path / "pool", start_timeout=0.5) as pool:
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="failed to start"):
+            pool.run(runner, [UserTCL("puts hi")])
+        assert time.monotonic() - start < 10
+
+
+@requires_tclsh
+def test_session_limits(tmp_path):
+    # the stub session exposes its log path to the batches
+    dist = make_stub_dist(tmp_path, 'export STUB_LOG="$3"\nexec tclsh')
+    write_log = "set f [open $env(STUB_LOG) a]; puts $f {{{}}}; close $f"
+    with SessionPool(dist, tmp_path / "pool", start_timeout=30) as pool:
+        runner = Runner(dist, tmp_path, timeout=0.5, poll_interval=0.05)
+        start = time.monotonic()
+        r = pool.run(runner, [UserTCL("after 60000")])
+        assert time.monotonic() - start < 10
+        assert r.status == RunnerStatus.TIMEOUT
+
+        # the killed session is replaced
+        r = pool.run(
+            runner, [UserTCL(write_log.format("ERROR: [HLS 200-999] earlier batch"))]
+        )
+        assert r.status == RunnerStatus.SUCCESS
+
+        monitor = QoRMonitor(log_constraints=[LogMatch(msg_id="HLS 200-999")])
+        runner = Runner(dist, tmp_path, poll_interval=0.05, monitors=[monitor])
+        r = pool.run(
+            runner,
+            [
+                UserTCL(write_log.format("ERROR: [HLS 200-999] this batch")),
+                UserTCL("after 60000"),
+            ],
+        )
+        assert r.status == RunnerStatus.ABORTED
+        assert r.reason == "Log message [HLS 200-999]: this batch"
+
+        runner = Runner(dist, tmp_path, max_memory_mb=1024)
+        with pytest.raises(ValueError):
+            pool.run(runner, [UserTCL("puts hi")])
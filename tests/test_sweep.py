@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from libvhls.commands import (
+    AddFiles,
+    CreateClock,
+    OpenProject,
+    SetPart,
+    SetTop,
+    SolutionBlock,
+)
+from libvhls.commands.commands import Runner
+from libvhls.dist import VitisHLSDist
+from libvhls.sweep import (
+    SolutionVariant,
+    run_solutions,
+    solution_commands,
+    split_solution_output,
+)
+from libvhls.vitis_hls import VitisHLS
+
+MM_DESIGN_DIR = Path(__file__).parent / "resources" / "simple_mm_design"
+
+COMBINED_LOG = """\
+INFO: [HLS 200-10] Opening project 'prj'
+@@LIBVHLS_SOLUTION@@ begin sol_a
+INFO: [HLS 200-10] Creating and opening solution 'prj/sol_a'.
+INFO: [HLS 200-111] Finished Command csynth_design
+@@LIBVHLS_SOLUTION@@ end sol_a 0
+@@LIBVHLS_SOLUTION@@ begin sol_b
+ERROR: [HLS 207-3776] use of undeclared identifier 'x'
+ERROR: csynth failed
+@@LIBVHLS_SOLUTION@@ end sol_b 1
+@@LIBVHLS_SOLUTION@@ begin sol_c
+INFO: [HLS 200-10] Creating and opening solution 'prj/sol_c'.
+"""
+
+
+def test_split_solution_output():
+    sections = split_solution_output(COMBINED_LOG)
+    assert list(sections) == ["sol_a", "sol_b", "sol_c"]
+
+    text, rc = sections["sol_a"]
+    assert rc == 0
+    assert text.startswith("INFO: [HLS 200-10] Creating and opening solution")
+    assert text.endswith("csynth_design\n")
+    assert "@@LIBVHLS_SOLUTION@@" not in text
+
+    text, rc = sections["sol_b"]
+    assert rc == 1
+    assert text.count("ERROR") == 2
+
+    # the tool exited before the end marker
+    assert sections["sol_c"][1] is None
+
+
+def test_solution_commands_compose():
+    runner = Runner(VitisHLSDist(Path("/opt/Vitis_HLS/2024.1")), Path("/tmp/wd"))
+    variants = [
+        SolutionVariant("sol_a", [SetPart("xcvu9p-flgb2104-2-i")]),
+        SolutionVariant("sol_b", [CreateClock("clk", "5.0")], flow_target="vitis"),
+    ]
+    commands = solution_commands([OpenProject("prj", reset=True)], variants)
+    assert [type(c) for c in commands] == [OpenProject, SolutionBlock, SolutionBlock]
+
+    script = runner.build_script(commands)
+    assert script.index("open_solution -reset sol_a") < script.index(
+        "open_solution -flow_target vitis -reset sol_b"
+    )
+    assert script.count("csynth_design") == 2
+    assert script.count("close_solution") == 2
+
+    with pytest.raises(ValueError):
+        solution_commands([], [SolutionVariant("sol"), SolutionVariant("sol")])
+    with pytest.raises(ValueError):
+        SolutionBlock("bad name")
+
+
+def test_run_solutions_clock_sweep(tmp_path):
+    (tmp_path / "mm.cpp").write_text((MM_DESIGN_DIR / "mm.cpp").read_text())
+    (tmp_path / "mm.h").write_text((MM_DESIGN_DIR / "mm.h").read_text())
+    vhls = VitisHLS(wd=tmp_path, enable_logging=True)
+
+    project_commands = [
+        OpenProject("prj", reset=True),
+        AddFiles([Path("mm.cpp"), Path("mm.h")]),
+        SetTop("blockmatmul"),
+    ]
+    variants = [
+        SolutionVariant(
+            f"sol_{period.replace('.', '_')}",
+            [SetPart("xcvu9p-flgb2104-2-i"), CreateClock("clk", period)],
+            flow_target="vitis",
+        )
+        for period in ["3.33", "5.0"]
+    ]
+    sweep = run_solutions(vhls, project_commands, variants)
+
+    assert sweep.result.returncode == 0
+    for solution in sweep.solutions:
+        assert solution.ok
+        assert solution.report is not None
+        assert f"prj/{solution.variant.name}" in solution.result.log
+    periods = [s.report.top_level_latency_data.clock_period for s in sweep.solutions]
+    assert periods[0] < periods[1]
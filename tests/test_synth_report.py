@@ -0,0 +1,78 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from libvhls.synth_report import (
+    CompactResourceData,
+    HierarchicalSynthesisReport,
+    SynthesisReport,
+)
+
+REPORT_DIR = Path(__file__).parent / "resources" / "reports" / "simple_mm"
+
+
+def test_synthesis_report_parse():
+    report = SynthesisReport.parse_from_disk(REPORT_DIR / "csynth.xml")
+    assert report.top_level_latency_data.latency_c == 8260
+    assert report.top_level_resource_data.used_abs["DSP"] == 96
+    assert len(report.interface_summary.rtl_ports) == 5
+
+
+def test_hierarchical_report_lazy():
+    reports = HierarchicalSynthesisReport(REPORT_DIR)
+    assert len(reports) == 5
+    assert "Loop_2_proc2_Pipeline_1" in reports
+    assert reports.n_parsed == 0
+
+    assert reports.top_module_name == "blockmatmul"
+    walked = [(depth, m.module_name) for depth, m in reports.walk()]
+    assert walked == [
+        (0, "blockmatmul"),
+        (1, "entry_proc"),
+        (1, "Loop_2_proc2"),
+        (2, "Loop_2_proc2_Pipeline_1"),
+        (1, "Loop_writeoutput_proc"),
+    ]
+    assert reports.n_parsed == 0
+
+    module = reports["Loop_2_proc2"]
+    assert module.top_level_latency_data.latency_c == 8194
+    assert module.top_level_resource_data.used_abs["DSP"] == 96
+    assert reports.n_parsed == 1
+    assert reports["Loop_2_proc2"] is module
+
+    with pytest.raises(KeyError):
+        reports["missing_module"]
+
+
+def test_hierarchical_report_from_solution_dir(tmp_path: Path):
+    report_dir = tmp_path / "solution1" / "syn" / "report"
+    report_dir.mkdir(parents=True)
+    for fp in REPORT_DIR.iterdir():
+        (report_dir / fp.name).write_bytes(fp.read_bytes())
+
+    reports = HierarchicalSynthesisReport.from_solution_dir(tmp_path / "solution1")
+    assert reports.module_names == sorted(
+        p.name[:-11] for p in REPORT_DIR.glob("*_csynth.xml")
+    )
+    assert reports.top.top_level_latency_data.latency_c == 8260
+
+
+def test_synthesis_report_compact():
+    report = SynthesisReport.parse_from_disk(REPORT_DIR / "csynth.xml")
+    compact = report.compact()
+    resources = report.top_level_resource_data
+    compact_resources = compact.top_level_resource_data
+
+    assert isinstance(compact_resources, CompactResourceData)
+    assert compact_resources.resource_types == resources.resource_types
+    assert compact_resources.used_abs == resources.used_abs
+    assert compact_resources.available_abs == resources.available_abs
+    assert compact_resources.used_percent == resources.used_percent
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+    assert not hasattr(report.interface_summary.rtl_ports[0], "__dict__")
+    protocols = [p.io_protocol for p in report.interface_summary.rtl_ports]
+    other = SynthesisReport.parse_from_disk(REPORT_DIR / "csynth.xml")
+    assert protocols[0] is other.interface_summary.rtl_ports[0].io_protocol
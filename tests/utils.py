@@ -1,6 +1,21 @@
 from pathlib import Path
 
+from libvhls.dist import VitisHLSDist
+
 
 def check_command_otuput_generic(wd, result):
     assert Path(wd, "vitis_hls.log").exists()
     assert result.returncode == 0
+
+
+def make_stub_dist(tmp_path: Path, body: str) -> VitisHLSDist:
+    """A fake tool that writes its log and then runs ``body`` as a shell script.
+
+    Called as ``vitis_hls -l <log> <script>``.
+    """
+    bin_dir = tmp_path / "dist" / "bin"
+    bin_dir.mkdir(parents=True)
+    tool = bin_dir / "vitis_hls"
+    tool.write_text(f'#!/bin/sh\necho "stub tool started" > "$2"\n{body}\n')
+    tool.chmod(0o755)
+    return VitisHLSDist(tmp_path / "dist")